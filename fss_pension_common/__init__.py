@@ -0,0 +1,5 @@
+"""
+FSS 연금 MCP 서버와 웹 앱이 함께 사용하는 모듈
+
+저장소 루트에서 `pip install -e .`로 설치하면 두 앱이 같은 코드를 사용합니다.
+"""
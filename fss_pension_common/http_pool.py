@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+프로세스 전역 HTTP 연결 풀
+
+업스트림(FSS, OpenAI)별로 하나의 httpx.AsyncClient를 만들어 모든 호출자가 공유합니다.
+연결 풀 크기, keep-alive 유지 시간, 연결/읽기 타임아웃은 환경변수로 조정하며
+h2 패키지가 설치되어 있으면 HTTP/2를 사용합니다 (서버가 지원하지 않으면 HTTP/1.1).
+"""
+
+import importlib.util
+import logging
+import os
+from typing import TYPE_CHECKING, Dict
+
+import httpx
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1").lower() in ("1", "true", "yes")
+
+# 업스트림별 읽기 타임아웃 (초)
+READ_TIMEOUTS = {
+    "fss": float(os.getenv("FSS_READ_TIMEOUT", "15")),
+    "openai": float(os.getenv("OPENAI_READ_TIMEOUT", "60")),
+}
+DEFAULT_READ_TIMEOUT = 30.0
+
+
+def _http2_available() -> bool:
+    """HTTP/2 사용 가능 여부 (h2 패키지 필요)"""
+    return HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(upstream: str = "fss") -> httpx.AsyncClient:
+    """업스트림별 공유 HTTP 클라이언트 반환 (닫혀 있으면 새로 생성)"""
+    client = _clients.get(upstream)
+    if client is None or client.is_closed:
+        read_timeout = READ_TIMEOUTS.get(upstream, DEFAULT_READ_TIMEOUT)
+        client = httpx.AsyncClient(
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(
+                connect=HTTP_CONNECT_TIMEOUT,
+                read=read_timeout,
+                write=read_timeout,
+                pool=HTTP_POOL_TIMEOUT
+            )
+        )
+        _clients[upstream] = client
+        logger.info(f"공유 HTTP 클라이언트 생성: {upstream} (http2={_http2_available()})")
+    return client
+
+
+_openai_clients: Dict[str, "AsyncOpenAI"] = {}
+
+
+def get_openai_client(api_key: str) -> "AsyncOpenAI":
+    """API 키별 공유 AsyncOpenAI 클라이언트 반환 (공유 HTTP 연결 풀 사용)"""
+    from openai import AsyncOpenAI
+
+    client = _openai_clients.get(api_key)
+    if client is None:
+        client = AsyncOpenAI(api_key=api_key, http_client=get_http_client("openai"))
+        _openai_clients[api_key] = client
+    return client
+
+
+async def close_http_clients():
+    """공유 HTTP 클라이언트 모두 종료 (프로세스 종료 시 호출)"""
+    for client in list(_clients.values()):
+        if not client.is_closed:
+            await client.aclose()
+    _clients.clear()
+    _openai_clients.clear()
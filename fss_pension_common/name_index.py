@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+한글 자모 기반 이름 검색 인덱스 (회사명/상품명)
+
+이름을 정규화한 뒤 한글 음절을 초성·중성·종성 자모로 분해하고, 자모 3-gram 역색인을 만듭니다.
+사용자나 LLM이 입력한 이름이 FSS 표기와 정확히 일치하지 않아도 (오타, 띄어쓰기, 일부 입력)
+유사도 순으로 후보를 찾을 수 있습니다.
+"""
+
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# n-gram 길이 (자모 단위)
+NGRAM_SIZE = 3
+# 기본 최소 유사도
+DEFAULT_MIN_SCORE = 0.4
+# 최고 점수와의 차이가 이 값 이내인 후보는 같은 대상을 가리키는 것으로 간주
+MATCH_MARGIN = 0.05
+# 조회 결과 캐시 크기
+LOOKUP_CACHE_SIZE = 512
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_NOISE = re.compile(r"\(주\)|㈜|주식회사|[\s\W_]+")
+
+
+def normalize_name(name: str) -> str:
+    """비교용 이름 정규화 (전각/반각 통일, 소문자, 법인 표기·공백·기호 제거)"""
+    if not name:
+        return ""
+    name = unicodedata.normalize("NFKC", name).lower()
+    return _NOISE.sub("", name)
+
+
+def decompose_hangul(text: str) -> str:
+    """한글 음절을 자모로 분해 (한글 외 문자는 그대로)"""
+    result = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            result.append(chr(0x1100 + offset // 588))
+            result.append(chr(0x1161 + (offset % 588) // 28))
+            if offset % 28:
+                result.append(chr(0x11A7 + offset % 28))
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def name_ngrams(normalized: str) -> List[str]:
+    """정규화된 이름의 자모 n-gram 목록 (중복 제거)"""
+    jamo = f"^{decompose_hangul(normalized)}$"
+    if len(jamo) <= NGRAM_SIZE:
+        return [jamo]
+    return list(dict.fromkeys(jamo[i:i + NGRAM_SIZE] for i in range(len(jamo) - NGRAM_SIZE + 1)))
+
+
+def _is_short(normalized: str) -> bool:
+    """n-gram으로 포함 관계를 거를 수 없는 짧은 이름인지 (자모 NGRAM_SIZE개 이하)"""
+    return len(decompose_hangul(normalized)) <= NGRAM_SIZE
+
+
+class NameIndex:
+    """이름 유사도 검색 인덱스
+
+    점수: 정규화 이름 일치 1.0, 포함 관계 0.8~1.0 (길이 비율 반영), 그 외 자모 n-gram Dice 계수.
+    부분 문자열 확인도 공유 n-gram 수로 후보를 거른 뒤 배열 단위로 수행합니다.
+    자모 NGRAM_SIZE개 이하의 짧은 이름은 n-gram 대부분에 시작/끝 경계가 붙어 다른 이름의 중간과
+    공유하는 n-gram이 거의 없으므로, 포함 관계를 n-gram으로 거르지 않고 직접 확인합니다.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = list(dict.fromkeys(name for name in names if name))
+        self.normalized = [normalize_name(name) for name in self.names]
+        self.normalized_array = np.array(self.normalized, dtype=str)
+        self.lengths = np.array([len(name) for name in self.normalized], dtype=np.float64)
+
+        postings: Dict[str, List[int]] = {}
+        gram_counts = np.zeros(len(self.names), dtype=np.float64)
+        for i, normalized in enumerate(self.normalized):
+            grams = name_ngrams(normalized)
+            gram_counts[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self.gram_counts = gram_counts
+        self.short = np.array([_is_short(name) for name in self.normalized], dtype=bool)
+        self._cache: "OrderedDict[Tuple[str, int, float], List[Tuple[str, float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 10, min_score: float = DEFAULT_MIN_SCORE) -> List[Tuple[str, float]]:
+        """유사도 순 (이름, 점수) 목록"""
+        key = (query, limit, min_score)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        result = self._search(query, limit, min_score)
+        self._cache[key] = result
+        if len(self._cache) > LOOKUP_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    def _search(self, query: str, limit: int, min_score: float) -> List[Tuple[str, float]]:
+        normalized = normalize_name(query)
+        if not normalized or not self.names:
+            return []
+
+        grams = name_ngrams(normalized)
+        hits = [self.postings[gram] for gram in grams if gram in self.postings]
+        if hits:
+            shared = np.bincount(np.concatenate(hits), minlength=len(self.names))
+        else:
+            shared = np.zeros(len(self.names), dtype=np.int64)
+        scores = 2.0 * shared / (len(grams) + self.gram_counts)
+
+        # 포함 관계면 짧은 쪽의 n-gram은 시작/끝 경계 2개를 제외하고 모두 공유되므로 해당 후보만 확인
+        # (입력이 짧으면 Dice 점수가 낮게 나오므로 길이 비율을 반영한 포함 점수로 보정, 일치는 1.0)
+        size = len(normalized)
+        if _is_short(normalized):
+            contains_query = np.flatnonzero(self.lengths >= size)
+        else:
+            contains_query = np.flatnonzero((shared > 0) & (shared >= len(grams) - 2) & (self.lengths >= size))
+        if len(contains_query):
+            found = contains_query[np.char.find(self.normalized_array[contains_query], normalized) >= 0]
+            scores[found] = np.maximum(scores[found], 0.8 + 0.2 * size / self.lengths[found])
+        candidates = ((shared > 0) & (shared >= self.gram_counts - 2)) | self.short
+        contained = np.flatnonzero(candidates & (self.lengths < size))
+        for i in contained:
+            if self.normalized[i] in normalized:
+                scores[i] = max(scores[i], 0.8 + 0.2 * self.lengths[i] / size)
+
+        matched = np.flatnonzero(scores >= min_score)
+        order = matched[np.argsort(-scores[matched], kind="stable")][:limit]
+        return [(self.names[i], round(float(scores[i]), 3)) for i in order]
+
+    def resolve(self, query: str, limit: int = 10, min_score: float = DEFAULT_MIN_SCORE,
+                margin: float = MATCH_MARGIN) -> List[str]:
+        """입력이 가리키는 것으로 보이는 이름들 (최고 점수와 margin 이내인 후보)"""
+        matches = self.search(query, limit, min_score)
+        if not matches:
+            return []
+        best = matches[0][1]
+        return [name for name, score in matches if score >= best - margin]
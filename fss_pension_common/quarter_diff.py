@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+분기 간 변화 계산
+
+같은 회사·상품끼리 짝지은 두 기간의 행 {식별자: (이전 행, 이후 행)}을 받아
+신규/판매중지 상품, 수수료율·수익률 변화, 권역별 회사 순위 변동을 한 번에 계산합니다.
+식별자 매칭은 호출하는 쪽(이력 저장소의 엔티티 ID, 정규화 이름 등)이 담당합니다.
+"""
+
+import math
+import os
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+# 변화 항목별 최대 반환 건수 (변동폭 큰 순)
+DIFF_TOP_N = int(os.getenv("FSS_DIFF_TOP_N", "20"))
+
+# 비교할 상품 지표: 결과 키 → 필드
+PRODUCT_CHANGE_FIELDS: Dict[str, str] = {
+    "fee_changes": "avgFeeRate3",
+    "return_changes": "avgEarnRate3",
+}
+
+# 회사 순위 기준: 이름 → (정렬 필드, 내림차순 여부)
+COMPANY_RANK_CRITERIA: Dict[str, Tuple[str, bool]] = {
+    "low_fee": ("avgFeeRate3", False),
+    "earn3": ("avgEarnRate3", True),
+}
+
+Row = Dict[str, Any]
+Pairs = Mapping[Hashable, Tuple[Optional[Row], Optional[Row]]]
+
+
+def previous_quarter(year: Any, quarter: Any) -> Tuple[str, str]:
+    """직전 분기 (연도, 분기)"""
+    year, quarter = int(year), int(quarter)
+    if quarter <= 1:
+        return str(year - 1), "4"
+    return str(year), str(quarter - 1)
+
+
+def next_quarter(year: Any, quarter: Any) -> Tuple[str, str]:
+    """다음 분기 (연도, 분기)"""
+    year, quarter = int(year), int(quarter)
+    if quarter >= 4:
+        return str(year + 1), "1"
+    return str(year), str(quarter + 1)
+
+
+def pair_rows(before: List[Row], after: List[Row], key) -> Dict[Hashable, Tuple[Optional[Row], Optional[Row]]]:
+    """두 기간의 행을 key(row) 기준 해시 조인 (같은 키가 여러 번 나오면 첫 행 사용)"""
+    old: Dict[Hashable, Row] = {}
+    for row in before:
+        old.setdefault(key(row), row)
+    new: Dict[Hashable, Row] = {}
+    for row in after:
+        new.setdefault(key(row), row)
+    return {k: (old.get(k), new.get(k)) for k in old.keys() | new.keys()}
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def _selling(row: Optional[Row]) -> bool:
+    return row is not None and row.get("sells", "Y") == "Y"
+
+
+def _product_ref(row: Row) -> Dict[str, Any]:
+    return {
+        "company": row.get("company"),
+        "product": row.get("product"),
+        "productType": row.get("productType"),
+    }
+
+
+def _name_key(item: Dict[str, Any], *fields: str) -> Tuple[str, ...]:
+    """이름 기준 정렬 키 (입력 순서와 관계없이 같은 결과를 내기 위한 보조 정렬)"""
+    return tuple(str(item.get(field) or "") for field in fields)
+
+
+def product_diff(pairs: Pairs, top_n: int = DIFF_TOP_N) -> Dict[str, Any]:
+    """상품 변화: 신규·판매중지(sells 플래그 포함), 수수료율·수익률 변화 (변동폭 큰 순)"""
+    new_products, discontinued = [], []
+    changes: Dict[str, List[Dict[str, Any]]] = {name: [] for name in PRODUCT_CHANGE_FIELDS}
+
+    for old, new in pairs.values():
+        was_selling, is_selling = _selling(old), _selling(new)
+        if is_selling and not was_selling:
+            new_products.append(_product_ref(new))
+        elif was_selling and not is_selling:
+            discontinued.append(_product_ref(new or old))
+        if old is None or new is None:
+            continue
+        for name, field in PRODUCT_CHANGE_FIELDS.items():
+            before, after = _number(old.get(field)), _number(new.get(field))
+            if before is None or after is None or before == after:
+                continue
+            changes[name].append({
+                **_product_ref(new),
+                "before": before,
+                "after": after,
+                "change": round(after - before, 4)
+            })
+
+    new_products.sort(key=lambda item: _name_key(item, "company", "product", "productType"))
+    discontinued.sort(key=lambda item: _name_key(item, "company", "product", "productType"))
+    result: Dict[str, Any] = {
+        "new_products": new_products[:top_n],
+        "discontinued_products": discontinued[:top_n],
+        "counts": {
+            "new_products": len(new_products),
+            "discontinued_products": len(discontinued),
+        }
+    }
+    for name, items in changes.items():
+        items.sort(key=lambda item: (-abs(item["change"]), _name_key(item, "company", "product", "productType")))
+        result[name] = items[:top_n]
+        result["counts"][name] = {
+            "increased": sum(1 for item in items if item["change"] > 0),
+            "decreased": sum(1 for item in items if item["change"] < 0),
+        }
+    return result
+
+
+def _ranks(rows: List[Tuple[Hashable, Row]], field: str, descending: bool) -> Dict[Hashable, int]:
+    """권역별 순위 (공동 순위는 같은 값, 값이 없는 회사는 제외)"""
+    frame = pd.DataFrame({
+        "key": [key for key, _ in rows],
+        "area": [row.get("area") or "" for _, row in rows],
+        "value": pd.to_numeric(pd.Series([row.get(field) for _, row in rows], dtype=object), errors="coerce"),
+    }).dropna(subset=["value"])
+    if frame.empty:
+        return {}
+    ranks = frame.groupby("area")["value"].rank(method="min", ascending=not descending)
+    return dict(zip(frame["key"], ranks.astype(int)))
+
+
+def company_rank_moves(pairs: Pairs, top_n: int = DIFF_TOP_N) -> Dict[str, Any]:
+    """권역별 회사 순위 변동 (기준별, 변동폭 큰 순)
+
+    새로 순위에 든(entered)·빠진(left) 회사는 (권역, 회사명) 순으로 top_n개까지 반환하고 전체 수는 *_count로 제공합니다.
+    """
+    before_rows = [(key, old) for key, (old, _) in pairs.items() if old is not None]
+    after_rows = [(key, new) for key, (_, new) in pairs.items() if new is not None]
+
+    result: Dict[str, Any] = {}
+    for criterion, (field, descending) in COMPANY_RANK_CRITERIA.items():
+        before, after = _ranks(before_rows, field, descending), _ranks(after_rows, field, descending)
+        moves = []
+        for key in before.keys() & after.keys():
+            move = before[key] - after[key]
+            if move:
+                row = pairs[key][1]
+                moves.append({
+                    "area": row.get("area"),
+                    "company": row.get("company"),
+                    "before_rank": before[key],
+                    "after_rank": after[key],
+                    "move": move
+                })
+        moves.sort(key=lambda item: (-abs(item["move"]), item["after_rank"], _name_key(item, "area", "company")))
+        entered = sorted((pairs[key][1] for key in after.keys() - before.keys()),
+                         key=lambda row: _name_key(row, "area", "company"))
+        left = sorted((pairs[key][0] for key in before.keys() - after.keys()),
+                      key=lambda row: _name_key(row, "area", "company"))
+        result[criterion] = {
+            "moves": moves[:top_n],
+            "up": sum(1 for item in moves if item["move"] > 0),
+            "down": sum(1 for item in moves if item["move"] < 0),
+            "entered": [row.get("company") for row in entered[:top_n]],
+            "entered_count": len(entered),
+            "left": [row.get("company") for row in left[:top_n]],
+            "left_count": len(left),
+        }
+    return result
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+FSS 데이터 사전 갱신 스케줄러
+
+FSS 공시 데이터를 주기적으로 미리 갱신하여 사용자 요청이 업스트림 지연을 겪지 않도록 합니다.
+분기 공시가 나오는 기간(분기 종료 후 일정 기간)에는 더 자주 갱신합니다.
+"""
+
+import asyncio
+import calendar
+import logging
+import os
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 기본 갱신 주기 (초)
+DEFAULT_REFRESH_INTERVAL = int(os.getenv("FSS_REFRESH_INTERVAL", str(6 * 60 * 60)))
+# 분기 공시 기간의 갱신 주기 (초)
+RELEASE_WINDOW_INTERVAL = int(os.getenv("FSS_REFRESH_RELEASE_INTERVAL", str(30 * 60)))
+# 분기 공시 기간: 분기 종료일로부터 경과 일수 범위
+RELEASE_WINDOW_START_DAYS = int(os.getenv("FSS_RELEASE_WINDOW_START_DAYS", "30"))
+RELEASE_WINDOW_END_DAYS = int(os.getenv("FSS_RELEASE_WINDOW_END_DAYS", "75"))
+# 동시에 갱신하는 엔드포인트 수
+REFRESH_CONCURRENCY = int(os.getenv("FSS_REFRESH_CONCURRENCY", "2"))
+# 강제 갱신 대상에 포함하는 캐시 항목의 최근 조회 기간 (초)
+# 이 기간 안에 조회되지 않은 항목은 강제 갱신하지 않고 다음 조회 시 stale-while-revalidate로 갱신
+REFRESH_RECENT_WINDOW = int(os.getenv("FSS_REFRESH_RECENT_WINDOW", str(24 * 60 * 60)))
+# 사전 갱신 사용 여부
+REFRESH_ENABLED = os.getenv("FSS_REFRESH_ENABLED", "1").lower() in ("1", "true", "yes")
+
+
+def last_quarter_end(today: date) -> date:
+    """가장 최근에 끝난 분기의 마지막 날"""
+    end_month = ((today.month - 1) // 3) * 3
+    if end_month == 0:
+        return date(today.year - 1, 12, 31)
+    return date(today.year, end_month, calendar.monthrange(today.year, end_month)[1])
+
+
+def in_release_window(today: Optional[date] = None) -> bool:
+    """분기 공시 기간 여부"""
+    today = today or date.today()
+    days = (today - last_quarter_end(today)).days
+    return RELEASE_WINDOW_START_DAYS <= days <= RELEASE_WINDOW_END_DAYS
+
+
+class RefreshScheduler:
+    """FSS 데이터 사전 갱신 스케줄러
+
+    client는 refresh_requests()와 refresh_dataset(endpoint, params, force)를 제공해야 합니다.
+    시작 시 스냅샷/캐시로 데이터를 미리 적재하고, 이후 주기마다 업스트림에서 강제로 갱신합니다.
+    on_refresh는 매 갱신 후 실행되어 갱신된 데이터로 사전 계산 결과를 다시 만듭니다.
+    """
+
+    def __init__(self, client: Any,
+                 interval: float = DEFAULT_REFRESH_INTERVAL,
+                 release_interval: float = RELEASE_WINDOW_INTERVAL,
+                 concurrency: int = REFRESH_CONCURRENCY,
+                 on_refresh: Optional[Callable[[], Awaitable[Any]]] = None):
+        self.client = client
+        self.on_refresh = on_refresh
+        self.interval = interval
+        self.release_interval = release_interval
+        self.concurrency = concurrency
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Dict[str, Any] = {}
+
+    def next_delay(self, today: Optional[date] = None) -> float:
+        """다음 갱신까지 대기 시간"""
+        if in_release_window(today):
+            return min(self.interval, self.release_interval)
+        return self.interval
+
+    async def refresh_all(self, force: bool = True) -> Dict[str, Any]:
+        """모든 대상 데이터 갱신"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        requests = self.client.refresh_requests()
+
+        async def run(endpoint: str, params: Dict[str, Any]) -> bool:
+            async with semaphore:
+                try:
+                    return await self.client.refresh_dataset(endpoint, params, force=force)
+                except Exception as e:
+                    logger.warning(f"사전 갱신 실패 ({endpoint}): {e}")
+                    return False
+
+        results = await asyncio.gather(*(run(endpoint, params) for endpoint, params in requests))
+        self.last_run = {
+            "total": len(results),
+            "succeeded": sum(1 for ok in results if ok),
+            "failed": sum(1 for ok in results if not ok),
+            "force": force
+        }
+        logger.info(f"FSS 데이터 사전 갱신 완료: {self.last_run}")
+        if self.on_refresh is not None:
+            try:
+                await self.on_refresh()
+            except Exception as e:
+                logger.warning(f"사전 계산 갱신 실패: {e}")
+        return self.last_run
+
+    async def run(self):
+        """스케줄러 루프"""
+        # 시작 시 스냅샷/캐시 기반으로 미리 적재 (신선한 스냅샷이 있으면 네트워크 호출 없음)
+        try:
+            await self.refresh_all(force=False)
+        except Exception as e:
+            logger.error(f"FSS 데이터 초기 적재 오류: {e}")
+        while True:
+            await asyncio.sleep(self.next_delay())
+            try:
+                await self.refresh_all(force=True)
+            except Exception as e:
+                logger.error(f"FSS 데이터 사전 갱신 오류: {e}")
+
+    def start(self):
+        """백그라운드에서 스케줄러 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+            logger.info("FSS 데이터 사전 갱신 스케줄러 시작")
+
+    async def stop(self):
+        """스케줄러 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("FSS 데이터 사전 갱신 스케줄러 종료")
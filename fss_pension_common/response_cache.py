@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+FSS API 응답 캐시
+
+엔드포인트 + 정규화된 파라미터를 키로 사용하는 TTL 캐시입니다.
+TTL이 지난 응답은 stale 구간 동안 그대로 반환하면서 백그라운드에서 갱신하고,
+LRU 방식으로 메모리 사용량을 제한합니다.
+동일한 키에 대한 동시 요청은 single-flight로 합쳐 업스트림 호출을 한 번만 수행합니다.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HOUR = 60 * 60
+
+# 엔드포인트별 캐시 유지 시간 (초) - FSS 공시 데이터는 분기 단위로 갱신됨
+DEFAULT_TTL = HOUR
+ENDPOINT_TTLS = {
+    "psCorpList.json": 6 * HOUR,
+    "psProdList.json": 6 * HOUR,
+    "psGuaranteedProdList.json": 6 * HOUR,
+    "rpCorpResultList.json": 6 * HOUR,
+    "rpCorpBurdenRatioList.json": 12 * HOUR,
+    "rpCorpCustomFeeList.json": 12 * HOUR,
+    "rpGuaranteedProdSupplyList.json": 6 * HOUR,
+    "rpGuaranteedProdList.json": 6 * HOUR,
+    "pensionStat.json": 24 * HOUR,
+    "publicPensionStat.json": 24 * HOUR,
+    "personalPensionStat.json": 24 * HOUR,
+    "retirementPensionStat.json": 24 * HOUR,
+}
+
+# TTL 만료 후에도 이 시간 동안은 기존 응답을 반환하고 백그라운드에서 갱신
+DEFAULT_STALE_TTL = int(os.getenv("FSS_CACHE_STALE_TTL", str(7 * 24 * HOUR)))
+DEFAULT_MAX_ENTRIES = int(os.getenv("FSS_CACHE_MAX_ENTRIES", "256"))
+
+FetchFunc = Callable[[], Awaitable[Dict[str, Any]]]
+# 응답 변경 리스너: (항목, 변경 종류)
+Listener = Callable[["CacheEntry", str], None]
+# 리스너에 전달되는 변경 종류
+ADDED = "added"      # 새 키 저장
+UPDATED = "updated"  # 기존 키의 응답 내용 변경
+REMOVED = "removed"  # LRU 제거 또는 무효화 (전달되는 항목은 제거된 항목)
+
+
+def make_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """엔드포인트와 정규화된 파라미터로 캐시 키 생성 (서비스키는 제외)"""
+    normalized = {
+        k: str(v).strip()
+        for k, v in params.items()
+        if k != "key" and v is not None and str(v).strip() != ""
+    }
+    query = "&".join(f"{k}={normalized[k]}" for k in sorted(normalized))
+    return f"{endpoint}?{query}"
+
+
+def is_cacheable(data: Any) -> bool:
+    """정상 응답만 캐시 (오류 응답은 캐시하지 않음)"""
+    if not isinstance(data, dict) or "error" in data or "raw_response" in data:
+        return False
+    code = data.get("code")
+    return code is None or str(code) == "000"
+
+
+class SingleFlight:
+    """동일 키의 동시 요청을 하나의 실행으로 합치는 in-flight 레지스트리"""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: FetchFunc) -> Dict[str, Any]:
+        """key에 대해 진행 중인 실행이 있으면 그 결과를 공유, 없으면 fn 실행
+
+        실행은 별도 태스크로 수행되므로 호출자 하나가 취소되어도
+        같은 결과를 기다리는 다른 호출자에게는 영향이 없습니다.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 호출자가 취소된 경우에도 예외가 미회수 경고로 남지 않도록 회수
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+@dataclass
+class CacheEntry:
+    """캐시 항목"""
+    value: Dict[str, Any]
+    fetched_at: float
+    ttl: float
+    stale_ttl: float
+    endpoint: str = ""
+    params: Optional[Dict[str, Any]] = None
+    last_used: float = 0.0  # 마지막 조회 시각 (사전 갱신으로 교체되어도 유지)
+
+    def is_fresh(self, now: float) -> bool:
+        return now - self.fetched_at < self.ttl
+
+    def is_usable(self, now: float) -> bool:
+        return now - self.fetched_at < self.ttl + self.stale_ttl
+
+
+class ResponseCache:
+    """TTL + stale-while-revalidate + LRU 응답 캐시
+
+    반환되는 응답 dict는 모든 호출자가 공유하므로 수정하지 않아야 합니다.
+    """
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 default_ttl: float = DEFAULT_TTL,
+                 stale_ttl: float = DEFAULT_STALE_TTL,
+                 endpoint_ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.endpoint_ttls = dict(ENDPOINT_TTLS)
+        if endpoint_ttls:
+            self.endpoint_ttls.update(endpoint_ttls)
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._listeners: List[Listener] = []
+
+    def add_listener(self, listener: Listener):
+        """항목이 새로 저장되거나(ADDED) 내용이 바뀌거나(UPDATED) 제거될 때(REMOVED) 호출할 리스너 등록
+
+        같은 내용으로 갱신되면 호출하지 않습니다.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener):
+        """등록한 리스너 해제 (등록되어 있지 않으면 무시)"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def ttl_for(self, endpoint: str) -> float:
+        """엔드포인트별 TTL"""
+        return self.endpoint_ttls.get(endpoint, self.default_ttl)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """캐시 항목 조회 (LRU 순서와 마지막 조회 시각 갱신)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            entry.last_used = time.monotonic()
+        return entry
+
+    def set(self, key: str, endpoint: str, value: Dict[str, Any], params: Optional[Dict[str, Any]] = None):
+        """캐시 항목 저장 (최대 개수 초과 시 가장 오래 사용되지 않은 항목 제거)
+
+        항목 교체는 단일 할당이므로 읽는 쪽은 항상 이전 응답 또는 새 응답 중 하나만 봅니다.
+        """
+        previous = self._entries.get(key)
+        now = time.monotonic()
+        entry = self._entries[key] = CacheEntry(
+            value=value,
+            fetched_at=now,
+            ttl=self.ttl_for(endpoint),
+            stale_ttl=self.stale_ttl,
+            endpoint=endpoint,
+            params=dict(params) if params is not None else None,
+            last_used=previous.last_used if previous is not None else now
+        )
+        self._entries.move_to_end(key)
+        evicted = []
+        while len(self._entries) > self.max_entries:
+            evicted_key, evicted_entry = self._entries.popitem(last=False)
+            evicted.append(evicted_entry)
+            logger.debug(f"캐시 제거 (LRU): {evicted_key}")
+        if previous is None or previous.value != value:
+            self._notify(entry, ADDED if previous is None else UPDATED)
+        for evicted_entry in evicted:
+            self._notify(evicted_entry, REMOVED)
+
+    def _notify(self, entry: CacheEntry, event: str):
+        for listener in self._listeners:
+            try:
+                listener(entry, event)
+            except Exception as e:
+                logger.warning(f"캐시 리스너 오류 ({entry.endpoint}, {event}): {e}")
+
+    def invalidate(self, endpoint: str = None):
+        """캐시 무효화 (endpoint 미지정 시 전체, 제거된 항목마다 리스너 호출)"""
+        keys = [k for k in self._entries if endpoint is None or k.startswith(f"{endpoint}?")]
+        for key in keys:
+            self._notify(self._entries.pop(key), REMOVED)
+
+    def cached_requests(self, used_within: Optional[float] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """캐시에 있는 (엔드포인트, 파라미터) 목록 (used_within을 지정하면 그 시간(초) 안에 조회된 항목만)"""
+        since = time.monotonic() - used_within if used_within is not None else None
+        return [
+            (entry.endpoint, entry.params)
+            for entry in list(self._entries.values())
+            if entry.endpoint and entry.params is not None and (since is None or entry.last_used >= since)
+        ]
+
+    async def get_or_fetch(self, endpoint: str, params: Dict[str, Any], fetch: FetchFunc) -> Dict[str, Any]:
+        """캐시 조회 후 없으면 fetch 실행
+
+        - fresh: 캐시 응답 반환
+        - stale: 캐시 응답 반환 + 백그라운드 갱신
+        - 없음/만료: fetch 결과 반환 (정상 응답만 캐시)
+
+        같은 키의 동시 fetch는 하나로 합쳐지며 모든 호출자가 같은 응답을 받습니다.
+        """
+        key = make_cache_key(endpoint, params)
+        now = time.monotonic()
+        entry = self.get(key)
+
+        if entry is not None and entry.is_fresh(now):
+            self.hits += 1
+            return entry.value
+
+        if entry is not None and entry.is_usable(now):
+            self.stale_hits += 1
+            self._schedule_refresh(key, endpoint, params, fetch)
+            return entry.value
+
+        self.misses += 1
+        return await self._flight.do(key, lambda: self._fetch_and_store(key, endpoint, params, fetch))
+
+    async def refresh(self, endpoint: str, params: Dict[str, Any], fetch: FetchFunc) -> bool:
+        """캐시 상태와 관계없이 fetch 후 정상 응답이면 교체 (실패 시 기존 응답 유지)"""
+        key = make_cache_key(endpoint, params)
+        data = await self._flight.do(key, lambda: self._fetch_and_store(key, endpoint, params, fetch))
+        return is_cacheable(data)
+
+    async def _fetch_and_store(self, key: str, endpoint: str, params: Dict[str, Any], fetch: FetchFunc) -> Dict[str, Any]:
+        """fetch 실행 후 정상 응답이면 캐시에 저장"""
+        data = await fetch()
+        if is_cacheable(data):
+            self.set(key, endpoint, data, params)
+        return data
+
+    def _schedule_refresh(self, key: str, endpoint: str, params: Dict[str, Any], fetch: FetchFunc):
+        """백그라운드 갱신 예약 (키당 하나만 실행)"""
+        if key in self._refreshing:
+            return
+        self._refreshing[key] = asyncio.create_task(self._refresh(key, endpoint, params, fetch))
+
+    async def _refresh(self, key: str, endpoint: str, params: Dict[str, Any], fetch: FetchFunc):
+        """백그라운드 갱신 실행 - 실패 시 기존 응답 유지"""
+        try:
+            data = await self._flight.do(key, lambda: self._fetch_and_store(key, endpoint, params, fetch))
+            if is_cacheable(data):
+                logger.info(f"캐시 백그라운드 갱신 완료: {key}")
+            else:
+                logger.warning(f"캐시 백그라운드 갱신 실패, 기존 응답 유지: {key}")
+        except Exception as e:
+            logger.warning(f"캐시 백그라운드 갱신 오류 ({key}): {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self._flight.coalesced,
+            "in_flight": len(self._flight),
+            "refreshing": len(self._refreshing)
+        }
+
+    async def close(self):
+        """진행 중인 백그라운드 갱신 취소"""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshing.clear()
+
+
+# 프로세스 전역 공유 캐시
+_shared_cache: Optional[ResponseCache] = None
+
+
+def get_shared_cache() -> ResponseCache:
+    """프로세스 전역 공유 캐시 반환"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ResponseCache()
+    return _shared_cache
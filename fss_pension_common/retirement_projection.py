@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+은퇴 자금 몬테카를로 시뮬레이션
+
+선택한 상품 유형의 FSS 수익률 분포로 연간 수익률 경로를 수천 개 생성하여
+은퇴 시점 적립금, 기대수명까지의 자금 고갈 확률, 부족 금액과 추가 저축 필요액을 계산합니다.
+모든 경로를 NumPy 배열 연산으로 한 번에 계산하며, 여러 시나리오 조합(그리드)도 같은 수익률 경로로
+한 번에 평가합니다. 금액 단위는 입력과 같은 만원입니다.
+계산은 물가상승률을 뺀 실질 수익률 기준이므로 결과 금액은 현재 가치입니다.
+"""
+
+import os
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 시뮬레이션 경로 수
+DEFAULT_PATHS = int(os.getenv("FSS_PROJECTION_PATHS", "5000"))
+# 난수 시드 (같은 입력이면 같은 결과)
+PROJECTION_SEED = int(os.getenv("FSS_PROJECTION_SEED", "20231231"))
+# 물가상승률 (연)
+INFLATION_RATE = float(os.getenv("FSS_INFLATION_RATE", "0.02"))
+# 목표 달성 신뢰수준 (필요 자금·추가 저축액 계산 기준)
+TARGET_SUCCESS_RATE = 0.9
+# 상품 간 수익률 차이가 거의 없을 때(원리금보장 등) 사용하는 최소 변동성
+MIN_VOLATILITY = 0.005
+# 연 수익률 하한 (한 해 원금 전액 손실 방지)
+MIN_ANNUAL_RETURN = -0.95
+# 그리드 평가 최대 시나리오 수
+MAX_SWEEP_CELLS = int(os.getenv("FSS_SWEEP_MAX_CELLS", "2000"))
+
+# 위험 성향별 상품 선택: 원리금보장 여부 (None이면 전체)
+RISK_GUARANTEES = {
+    "conservative": True,
+    "moderate": None,
+    "aggressive": False,
+}
+
+
+def product_columns(products: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """FSS 상품 행 목록 → return_distribution에 필요한 컬럼 (판매여부, 원리금보장 여부, 상품유형, 3년 수익률)"""
+    frame = pd.DataFrame.from_records(products, columns=["productType", "sells", "guarantees", "avgEarnRate3"])
+    return {
+        "sells": (frame["sells"].fillna("Y") == "Y").to_numpy(dtype=bool),
+        "guarantees": (frame["guarantees"] == "Y").to_numpy(dtype=bool),
+        "productType": frame["productType"].fillna("").astype(str).to_numpy(dtype=object),
+        "avgEarnRate3": pd.to_numeric(frame["avgEarnRate3"], errors="coerce").to_numpy(dtype=np.float64),
+    }
+
+
+def return_distribution(table: Mapping[str, np.ndarray], product_types: Optional[Sequence[str]] = None,
+                        risk_preference: Optional[str] = None) -> Dict[str, Any]:
+    """판매 중인 상품의 3년 평균 수익률 분포 (연 수익률, 소수)
+
+    table은 컬럼별 배열(ProductTable 또는 product_columns() 결과)입니다.
+    product_types를 지정하면 해당 상품 유형, 아니면 위험 성향에 따라 원리금보장/비보장 상품을 사용합니다.
+    상품 간 3년 평균 수익률의 평균과 표준편차를 연간 수익률 분포로 사용합니다.
+    """
+    selected = table["sells"].copy()
+    if product_types:
+        wanted = {value.lower() for value in product_types}
+        selected &= np.array([value.lower() in wanted for value in table["productType"]], dtype=bool)
+    else:
+        guarantees = RISK_GUARANTEES.get(risk_preference)
+        if guarantees is not None:
+            selected &= table["guarantees"] == guarantees
+
+    rates = table["avgEarnRate3"][selected]
+    rates = rates[~np.isnan(rates)] / 100.0
+    if not rates.size:
+        raise ValueError("선택한 조건의 수익률 데이터가 없습니다")
+
+    return {
+        "mean": float(rates.mean()),
+        "volatility": max(float(rates.std()), MIN_VOLATILITY),
+        "products": int(rates.size),
+        "product_types": list(product_types) if product_types else None,
+        "risk_preference": risk_preference,
+    }
+
+
+def _return_growth(paths: int, years: int, mean_return: float, volatility: float,
+                   seed: int, inflation: float) -> np.ndarray:
+    """경로별 연간 실질 수익률의 누적 성장률 (paths × years)"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(mean_return - inflation, volatility, size=(paths, years))
+    return np.cumprod(1.0 + np.maximum(returns, MIN_ANNUAL_RETURN), axis=1)
+
+
+def _accumulation(growth: np.ndarray, years: int) -> Tuple[np.ndarray, np.ndarray]:
+    """적립기 (누적 성장률, 연간 저축액 1당 은퇴 시점 적립금)
+
+    은퇴 시점 적립금 = 현재 적립금 × 누적 성장률 + 연간 저축액 × 납입 시점 이후 성장률의 합
+    """
+    if not years:
+        return np.ones(len(growth)), np.zeros(len(growth))
+    accumulated = growth[:, years - 1]
+    return accumulated, accumulated * (1.0 / growth[:, :years]).sum(axis=1)
+
+
+def _payout_discount(growth: np.ndarray, accumulated: np.ndarray, start: int) -> np.ndarray:
+    """인출기 연간 인출액 1당 필요 적립금 누적합 (k년차까지 버티는 데 필요한 은퇴 시점 적립금)
+
+    k년차 말 잔액 = 은퇴 후 누적 성장률 × (은퇴 시점 적립금 - 인출액 × 이 값)
+    """
+    return np.cumsum(accumulated[:, None] / growth[:, start:], axis=1)
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    return {"p10": round(float(p10), 1), "p50": round(float(p50), 1), "p90": round(float(p90), 1)}
+
+
+def project_retirement(age: int, retirement_age: int, life_expectancy: int,
+                       current_balance: float, monthly_savings: float, monthly_living_cost: float,
+                       mean_return: float, volatility: float,
+                       paths: int = DEFAULT_PATHS, seed: int = PROJECTION_SEED,
+                       inflation: float = INFLATION_RATE,
+                       target_success_rate: float = TARGET_SUCCESS_RATE) -> Dict[str, Any]:
+    """은퇴 자금 시뮬레이션
+
+    적립기(현재~은퇴): 매년 말 연간 저축액(월 저축액 × 12) 납입
+    인출기(은퇴~기대수명): 매년 말 연간 생활비(월 생활비 × 12) 인출, 잔액이 음수가 되면 고갈
+    """
+    accumulation_years = max(int(retirement_age) - int(age), 0)
+    payout_years = max(int(life_expectancy) - max(int(retirement_age), int(age)), 1)
+    annual_savings = float(monthly_savings) * 12
+    annual_cost = float(monthly_living_cost) * 12
+
+    growth = _return_growth(paths, accumulation_years + payout_years, mean_return, volatility, seed, inflation)
+    accumulated, savings_factor = _accumulation(growth, accumulation_years)
+    balance = float(current_balance) * accumulated + annual_savings * savings_factor
+
+    discounted_cost = annual_cost * _payout_discount(growth, accumulated, accumulation_years)
+    required = discounted_cost[:, -1]  # 경로별 기대수명까지 버티는 데 필요한 은퇴 시점 적립금
+    depleted = discounted_cost > balance[:, None]
+    failed = depleted.any(axis=1)
+    depletion_age = max(int(retirement_age), int(age)) + depleted.argmax(axis=1)[failed] + 1
+
+    success_rate = float(1.0 - failed.mean())
+    required_capital = float(np.quantile(required, target_success_rate))
+    median_balance = float(np.median(balance))
+
+    # 추가 저축 필요액: 경로별로 목표 자금에 도달하는 데 필요한 추가 월 저축액의 신뢰수준 분위수
+    additional_monthly_savings = None
+    if accumulation_years:
+        needed = (required - balance) / (savings_factor * 12)
+        additional_monthly_savings = round(max(float(np.quantile(needed, target_success_rate)), 0.0), 1)
+
+    return {
+        "success_rate": round(success_rate, 4),
+        "target_success_rate": target_success_rate,
+        "balance_at_retirement": _percentiles(balance),
+        "required_capital": round(required_capital, 1),
+        "shortfall": round(max(required_capital - median_balance, 0.0), 1),
+        "additional_monthly_savings": additional_monthly_savings,
+        "depletion_age": _percentiles(depletion_age) if failed.any() else None,
+        "years": {"accumulation": accumulation_years, "payout": payout_years},
+        "assumptions": {
+            "paths": paths,
+            "mean_return": round(mean_return, 4),
+            "volatility": round(volatility, 4),
+            "inflation": inflation,
+            "annual_savings": annual_savings,
+            "annual_living_cost": annual_cost,
+        },
+    }
+
+
+def _matrix(values: np.ndarray, digits: int) -> list:
+    """결과 배열 → 중첩 리스트 (계산할 수 없는 값은 None)"""
+    rounded = np.round(values, digits).astype(object)
+    rounded[np.isnan(values)] = None
+    return rounded.tolist()
+
+
+def sweep_retirement(age: int, current_balance: float,
+                     monthly_living_costs: Sequence[float], monthly_savings: Sequence[float],
+                     retirement_ages: Sequence[int], life_expectancies: Sequence[int],
+                     mean_return: float, volatility: float,
+                     paths: int = DEFAULT_PATHS, seed: int = PROJECTION_SEED,
+                     inflation: float = INFLATION_RATE,
+                     target_success_rate: float = TARGET_SUCCESS_RATE) -> Dict[str, Any]:
+    """월 생활비 × 월 저축액 × 은퇴 나이 × 기대수명 그리드 평가
+
+    모든 시나리오가 같은 수익률 경로를 공유하며, 자금 유지 여부는 은퇴 시점 적립금이
+    필요 적립금 이상인지로 판정되므로 생활비·저축액·기대수명 축은 배열 브로드캐스트로 한 번에 계산합니다.
+    결과 행렬의 차원 순서는 dims와 같습니다.
+    """
+    costs = np.asarray(monthly_living_costs, dtype=np.float64) * 12
+    savings = np.asarray(monthly_savings, dtype=np.float64) * 12
+    retirement = [int(value) for value in retirement_ages]
+    lives = np.asarray(life_expectancies, dtype=np.int64)
+    shape = (len(costs), len(savings), len(retirement), len(lives))
+    cells = int(np.prod(shape))
+    if not cells:
+        raise ValueError("시나리오 축이 비어 있습니다")
+    if cells > MAX_SWEEP_CELLS:
+        raise ValueError(f"시나리오 수가 너무 많습니다 ({cells}개, 최대 {MAX_SWEEP_CELLS}개)")
+
+    starts = [max(value, int(age)) for value in retirement]
+    years = max(start - int(age) + max(int(lives.max()) - start, 1) for start in starts)
+    growth = _return_growth(paths, years, mean_return, volatility, seed, inflation)
+
+    success = np.empty(shape)
+    required_capital = np.empty(shape)
+    median_balance = np.empty(shape)
+    additional = np.full(shape, np.nan)
+    for j, start in enumerate(starts):
+        accumulation_years = start - int(age)
+        accumulated, savings_factor = _accumulation(growth, accumulation_years)
+        base = float(current_balance) * accumulated
+        balance = base[:, None] + savings[None, :] * savings_factor[:, None]  # 경로 × 저축액
+
+        discount = _payout_discount(growth, accumulated, accumulation_years)
+        payout_years = np.maximum(lives - start, 1)
+        required = costs[None, :, None] * discount[:, payout_years - 1][:, None, :]  # 경로 × 생활비 × 기대수명
+
+        success[:, :, j, :] = (balance[:, None, :, None] >= required[:, :, None, :]).mean(axis=0)
+        required_capital[:, :, j, :] = np.quantile(required, target_success_rate, axis=0)[:, None, :]
+        median_balance[:, :, j, :] = np.median(balance, axis=0)[None, :, None]
+        if accumulation_years:
+            # 저축액 0 기준 필요 월 저축액의 신뢰수준 분위수에서 현재 저축액을 뺀 값
+            needed = np.quantile((required - base[:, None, None]) / (savings_factor * 12)[:, None, None],
+                                 target_success_rate, axis=0)
+            additional[:, :, j, :] = np.maximum(needed[:, None, :] - savings[None, :, None] / 12, 0.0)
+
+    return {
+        "dims": ["monthly_living_cost", "monthly_savings", "retirement_age", "life_expectancy"],
+        "axes": {
+            "monthly_living_cost": [float(value) for value in monthly_living_costs],
+            "monthly_savings": [float(value) for value in monthly_savings],
+            "retirement_age": retirement,
+            "life_expectancy": lives.tolist(),
+        },
+        "success_rate": _matrix(success, 4),
+        "median_balance_at_retirement": _matrix(median_balance, 1),
+        "required_capital": _matrix(required_capital, 1),
+        "shortfall": _matrix(np.maximum(required_capital - median_balance, 0.0), 1),
+        "additional_monthly_savings": _matrix(additional, 1),
+        "target_success_rate": target_success_rate,
+        "assumptions": {
+            "paths": paths,
+            "mean_return": round(mean_return, 4),
+            "volatility": round(volatility, 4),
+            "inflation": inflation,
+            "current_balance": float(current_balance),
+            "age": int(age),
+        },
+    }
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+FSS 데이터셋 스냅샷 저장소 (SQLite)
+
+조회에 성공한 FSS 응답을 엔드포인트·연도·분기별 버전으로 디스크에 보관합니다.
+재시작 직후에도 네트워크 없이 응답할 수 있고, FSS 장애 시나 오프라인 모드에서
+마지막으로 저장된 데이터를 제공합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from fss_pension_common.response_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+# 저장 경로 (설정하면 앱 기본 경로 대신 사용, 빈 문자열이면 스냅샷 저장소 비활성화)
+SNAPSHOT_PATH = os.getenv("FSS_SNAPSHOT_PATH")
+
+# 오프라인 모드: FSS API를 호출하지 않고 스냅샷만 사용
+OFFLINE_MODE = os.getenv("FSS_OFFLINE_MODE", "").lower() in ("1", "true", "yes")
+
+# 기간 파라미터 (나머지 파라미터가 같으면 같은 데이터셋의 기간별 버전)
+PERIOD_PARAMS = ("year", "quarter")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot_versions (
+    endpoint TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    year TEXT NOT NULL,
+    quarter TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (endpoint, variant, year, quarter)
+);
+CREATE TABLE IF NOT EXISTS snapshot_aliases (
+    endpoint TEXT NOT NULL,
+    params_key TEXT NOT NULL,
+    year TEXT NOT NULL,
+    quarter TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    PRIMARY KEY (endpoint, params_key)
+);
+"""
+
+
+def _latest_period(timestamp: float) -> Tuple[str, str]:
+    """저장 시점 기준 가장 최근에 끝난 분기"""
+    today = date.fromtimestamp(timestamp)
+    quarter = (today.month - 1) // 3
+    if quarter == 0:
+        return str(today.year - 1), "4"
+    return str(today.year), str(quarter)
+
+
+def resolve_period(params: Dict[str, Any], payload: Dict[str, Any], fetched_at: float) -> Tuple[str, str]:
+    """스냅샷 기간 (연도, 분기)
+
+    요청의 연도·분기 → 응답(또는 첫 행)의 연도·분기 → 저장 시점 기준 가장 최근에 끝난 분기 순으로 정합니다.
+    연도 단위 데이터의 분기는 빈 문자열입니다.
+    """
+    if params.get("year"):
+        return str(params["year"]).strip(), str(params.get("quarter") or "").strip()
+    rows = payload.get("list")
+    for source in (payload, rows[0] if isinstance(rows, list) and rows else None):
+        if isinstance(source, dict) and source.get("year"):
+            return str(source["year"]).strip(), str(source.get("quarter") or "").strip()
+    return _latest_period(fetched_at)
+
+
+def _period_value(year: str, quarter: str) -> int:
+    """정렬 가능한 기간 값 (예: 2023년 4분기 → 20234)"""
+    try:
+        return int(year) * 10 + int(quarter or 0)
+    except ValueError:
+        return 0
+
+
+@dataclass
+class Snapshot:
+    """저장된 데이터셋 스냅샷"""
+    endpoint: str
+    year: str
+    quarter: str
+    payload: Dict[str, Any]
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        """저장 후 경과 시간 (초)"""
+        return time.time() - self.fetched_at
+
+
+class SnapshotStore:
+    """SQLite 기반 FSS 데이터셋 스냅샷 저장소
+
+    스냅샷은 (엔드포인트, 기간 외 파라미터, 연도, 분기)마다 하나씩 보관하므로
+    새 분기 데이터가 이전 분기 스냅샷을 대체하지 않습니다. 연도·분기 없이 요청한 최신 데이터는
+    응답의 기간으로 저장하고, 요청 파라미터는 가장 최근 기간 버전을 가리키는 별칭으로만 기록합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._migrate_legacy(conn)
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10.0)
+
+    def _migrate_legacy(self, conn: sqlite3.Connection):
+        """이전 형식(엔드포인트·파라미터당 하나) 스냅샷을 기간별 버전으로 옮김"""
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snapshots'").fetchone():
+            return
+        rows = conn.execute("SELECT endpoint, params_key, payload, fetched_at FROM snapshots ORDER BY fetched_at").fetchall()
+        for endpoint, params_key, blob, fetched_at in rows:
+            params = dict(parse_qsl(params_key.partition("?")[2]))
+            payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+            self._write(conn, endpoint, params, payload, blob, fetched_at)
+        conn.execute("DROP TABLE snapshots")
+        logger.info(f"이전 형식 스냅샷 {len(rows)}건을 기간별 버전으로 변환")
+
+    @staticmethod
+    def _variant(endpoint: str, params: Dict[str, Any]) -> str:
+        return make_cache_key(endpoint, {k: v for k, v in params.items() if k not in PERIOD_PARAMS})
+
+    def _write(self, conn: sqlite3.Connection, endpoint: str, params: Dict[str, Any],
+               payload: Dict[str, Any], blob: bytes, fetched_at: float) -> Tuple[str, str]:
+        year, quarter = resolve_period(params, payload, fetched_at)
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshot_versions "
+            "(endpoint, variant, year, quarter, payload, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (endpoint, self._variant(endpoint, params), year, quarter, blob, fetched_at)
+        )
+        if not params.get("year"):
+            # 최신 데이터 요청: 별칭은 더 최근(또는 같은) 기간으로만 이동
+            conn.execute(
+                "INSERT INTO snapshot_aliases (endpoint, params_key, year, quarter, period) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (endpoint, params_key) DO UPDATE SET "
+                "year = excluded.year, quarter = excluded.quarter, period = excluded.period "
+                "WHERE excluded.period >= snapshot_aliases.period",
+                (endpoint, make_cache_key(endpoint, params), year, quarter, _period_value(year, quarter))
+            )
+        return year, quarter
+
+    def save(self, endpoint: str, params: Dict[str, Any], payload: Dict[str, Any]) -> Tuple[str, str]:
+        """스냅샷 저장 후 저장한 기간 (연도, 분기) 반환 (같은 기간의 버전만 최신 데이터로 교체)"""
+        blob = zlib.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        with closing(self._connect()) as conn:
+            period = self._write(conn, endpoint, params, payload, blob, time.time())
+            conn.commit()
+        return period
+
+    def load(self, endpoint: str, params: Dict[str, Any]) -> Optional[Snapshot]:
+        """스냅샷 조회 (연도를 지정하면 그 기간 버전, 아니면 별칭이 가리키는 최근 기간 버전)"""
+        variant = self._variant(endpoint, params)
+        with closing(self._connect()) as conn:
+            if params.get("year"):
+                year, quarter = str(params["year"]).strip(), str(params.get("quarter") or "").strip()
+            else:
+                alias = conn.execute(
+                    "SELECT year, quarter FROM snapshot_aliases WHERE endpoint = ? AND params_key = ?",
+                    (endpoint, make_cache_key(endpoint, params))
+                ).fetchone()
+                if alias is None:
+                    return None
+                year, quarter = alias
+            row = conn.execute(
+                "SELECT payload, fetched_at FROM snapshot_versions "
+                "WHERE endpoint = ? AND variant = ? AND year = ? AND quarter = ?",
+                (endpoint, variant, year, quarter)
+            ).fetchone()
+        if row is None:
+            return None
+        blob, fetched_at = row
+        payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+        return Snapshot(endpoint, year, quarter, payload, fetched_at)
+
+    def list_snapshots(self, endpoint: str = None) -> List[Dict[str, Any]]:
+        """저장된 기간별 스냅샷 목록 (데이터 제외)"""
+        query = "SELECT endpoint, variant, year, quarter, fetched_at, length(payload) FROM snapshot_versions"
+        args: tuple = ()
+        if endpoint:
+            query += " WHERE endpoint = ?"
+            args = (endpoint,)
+        query += " ORDER BY endpoint, variant, year, quarter"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, args).fetchall()
+        return [
+            {
+                "endpoint": r[0],
+                "variant": r[1],
+                "year": r[2],
+                "quarter": r[3],
+                "fetched_at": r[4],
+                "size_bytes": r[5]
+            }
+            for r in rows
+        ]
+
+    async def asave(self, endpoint: str, params: Dict[str, Any], payload: Dict[str, Any]):
+        """스냅샷 저장 (이벤트 루프 비차단)"""
+        try:
+            await asyncio.to_thread(self.save, endpoint, params, payload)
+        except Exception as e:
+            logger.warning(f"스냅샷 저장 실패 ({endpoint}): {e}")
+
+    async def aload(self, endpoint: str, params: Dict[str, Any]) -> Optional[Snapshot]:
+        """스냅샷 조회 (이벤트 루프 비차단)"""
+        try:
+            return await asyncio.to_thread(self.load, endpoint, params)
+        except Exception as e:
+            logger.warning(f"스냅샷 조회 실패 ({endpoint}): {e}")
+            return None
+
+
+# 프로세스 전역 공유 저장소
+_shared_store: Optional[SnapshotStore] = None
+
+
+def get_shared_snapshot_store(default_path: str = "") -> Optional[SnapshotStore]:
+    """프로세스 전역 스냅샷 저장소 반환
+
+    경로는 FSS_SNAPSHOT_PATH, 없으면 앱이 넘긴 default_path입니다 (경로가 비었거나 초기화 실패 시 None).
+    """
+    global _shared_store
+    path = SNAPSHOT_PATH if SNAPSHOT_PATH is not None else default_path
+    if _shared_store is None and path:
+        try:
+            _shared_store = SnapshotStore(path)
+        except Exception as e:
+            logger.warning(f"스냅샷 저장소 초기화 실패, 비활성화: {e}")
+            return None
+    return _shared_store
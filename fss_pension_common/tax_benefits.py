@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+연금 세액공제 계산 (여러 고객 일괄 계산)
+
+연금저축·퇴직연금(IRP) 납입액의 세액공제 대상 금액, 권장 월 납입액, 예상 절세액을
+고객 배열 단위로 한 번에 계산합니다. 금액 단위는 만원입니다.
+- 세액공제 대상 한도: 연 소득의 15%, 최대 연 700만원
+- 세액공제율: 15% (소득세 + 지방소득세)
+"""
+
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+# 연 소득 대비 세액공제 대상 한도 비율
+DEDUCTION_INCOME_RATIO = 0.15
+# 세액공제 대상 최대 한도 (만원/년)
+DEDUCTION_LIMIT = 700
+# 세액공제율
+TAX_CREDIT_RATE = 0.15
+
+ArrayLike = Union[float, List[float], np.ndarray]
+
+
+def calculate_tax_benefits(monthly_income: ArrayLike, pension_savings: ArrayLike = 0,
+                           irp: ArrayLike = 0) -> Dict[str, np.ndarray]:
+    """고객별 세액공제 계산 (입력은 같은 길이의 배열 또는 스칼라, 결과는 고객별 배열)
+
+    monthly_income: 월 소득 (만원), pension_savings/irp: 현재 연간 납입액 (만원)
+    권장 연 납입액은 세액공제 대상 한도 전액입니다.
+    """
+    monthly_income, pension_savings, irp = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(values, dtype=np.float64)) for values in (monthly_income, pension_savings, irp))
+    )
+    annual_income = monthly_income * 12
+    limit = np.minimum(annual_income * DEDUCTION_INCOME_RATIO, DEDUCTION_LIMIT)
+    eligible = np.minimum(pension_savings + irp, limit)
+
+    return {
+        "annual_income": annual_income,
+        "tax_credit_rate": np.full(annual_income.shape, TAX_CREDIT_RATE),
+        "deduction_limit": limit,
+        "eligible_contribution": eligible,
+        "additional_available": limit - eligible,
+        "recommended_annual_contribution": limit,
+        "recommended_monthly_contribution": limit / 12,
+        "current_tax_credit": eligible * TAX_CREDIT_RATE,
+        "expected_tax_credit": limit * TAX_CREDIT_RATE,
+        "additional_tax_credit": (limit - eligible) * TAX_CREDIT_RATE,
+    }
+
+
+def to_columns(result: Dict[str, np.ndarray], digits: int = 1) -> Dict[str, List[float]]:
+    """계산 결과 → 필드별 리스트 (JSON 응답용)"""
+    return {
+        name: (values.round(4) if name == "tax_credit_rate" else values.round(digits)).tolist()
+        for name, values in result.items()
+    }
+
+
+def to_record(result: Dict[str, np.ndarray], index: int = 0) -> Dict[str, Any]:
+    """계산 결과 → 고객 한 명의 dict"""
+    return {name: values[index].item() for name, values in result.items()}
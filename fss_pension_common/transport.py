@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+FSS API 전송 계층 (재시도 / 서킷 브레이커 / 호출량 제한)
+
+- 멱등 GET 요청은 지터가 있는 지수 백오프로 재시도
+- 엔드포인트별 서킷 브레이커로 FSS 장애 중에는 즉시 실패
+- 토큰 버킷으로 서비스키 호출 한도 이하로 요청량 제한
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = int(os.getenv("FSS_RETRY_MAX", "2"))
+BACKOFF_BASE = float(os.getenv("FSS_RETRY_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("FSS_RETRY_BACKOFF_MAX", "8.0"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("FSS_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("FSS_BREAKER_RESET_TIMEOUT", "60"))
+RATE_LIMIT_PER_SEC = float(os.getenv("FSS_RATE_LIMIT_PER_SEC", "5"))
+RATE_LIMIT_BURST = float(os.getenv("FSS_RATE_LIMIT_BURST", "10"))
+
+# 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않음"""
+
+
+class TokenBucket:
+    """토큰 버킷 호출량 제한기"""
+
+    def __init__(self, rate: float = RATE_LIMIT_PER_SEC, capacity: float = RATE_LIMIT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """토큰 1개 획득 (부족하면 채워질 때까지 대기)"""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class CircuitBreaker:
+    """엔드포인트 단위 서킷 브레이커
+
+    연속 실패가 임계값에 도달하면 열리고(open), reset_timeout 이후
+    한 번의 시험 요청(half-open)이 성공하면 다시 닫힙니다(closed).
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """요청 허용 여부 (half-open 상태에서는 시험 요청 하나만 허용)"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self):
+        """시험 요청이 결과 없이 끝난 경우(취소 등) 다음 시험 요청 허용"""
+        self._trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class ResilientTransport:
+    """재시도·서킷 브레이커·호출량 제한을 적용한 GET 전송"""
+
+    def __init__(self, client: httpx.AsyncClient,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 breakers: Optional[Dict[str, CircuitBreaker]] = None,
+                 max_retries: int = MAX_RETRIES,
+                 backoff_base: float = BACKOFF_BASE,
+                 backoff_max: float = BACKOFF_MAX):
+        self.client = client
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.breakers = breakers if breakers is not None else _shared_breakers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def breaker_for(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker()
+        return breaker
+
+    def _backoff(self, attempt: int) -> float:
+        """full jitter 지수 백오프"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def get(self, url: str, endpoint: str) -> httpx.Response:
+        """GET 요청 실행 (실패 시 마지막 예외 발생)"""
+        breaker = self.breaker_for(endpoint)
+        if not breaker.allow():
+            raise CircuitOpenError(f"FSS API 일시 차단 중 ({endpoint}): 연속 {breaker.failures}회 실패")
+
+        try:
+            last_error: Exception = None
+            for attempt in range(self.max_retries + 1):
+                await self.rate_limiter.acquire()
+                try:
+                    response = await self.client.get(url)
+                    response.raise_for_status()
+                    breaker.record_success()
+                    return response
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code not in RETRYABLE_STATUS:
+                        # 요청 자체의 문제(4xx)는 FSS 장애가 아니므로 서킷에 반영하지 않음
+                        breaker.record_success()
+                        raise
+                    last_error = e
+                except httpx.TransportError as e:
+                    last_error = e
+
+                if attempt < self.max_retries:
+                    delay = self._backoff(attempt)
+                    logger.warning(f"FSS API 재시도 {attempt + 1}/{self.max_retries} ({endpoint}, {delay:.2f}초 후): {last_error}")
+                    await asyncio.sleep(delay)
+
+            breaker.record_failure()
+            raise last_error
+        finally:
+            breaker.release_trial()
+
+    def status(self) -> Dict[str, Dict[str, object]]:
+        """엔드포인트별 서킷 상태"""
+        return {
+            endpoint: {"state": breaker.state, "failures": breaker.failures}
+            for endpoint, breaker in self.breakers.items()
+        }
+
+
+# 프로세스 전역 공유 상태 (서비스키 호출 한도와 FSS 장애 상태는 클라이언트 간 공유)
+_shared_rate_limiter: Optional[TokenBucket] = None
+_shared_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_shared_rate_limiter() -> TokenBucket:
+    """프로세스 전역 호출량 제한기 반환"""
+    global _shared_rate_limiter
+    if _shared_rate_limiter is None:
+        _shared_rate_limiter = TokenBucket()
+    return _shared_rate_limiter
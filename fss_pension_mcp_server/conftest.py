@@ -0,0 +1,61 @@
+"""
+MCP 서버 테스트 공용 fixture (가짜 FSS API와 임시 저장소를 쓰는 서버)
+"""
+
+import asyncio
+
+import pytest
+
+import fss_pension_server
+from fss_pension_common.response_cache import ResponseCache
+from fss_pension_common.snapshot_store import SnapshotStore
+from fss_pension_server import FSSPensionServer
+from history_store import HistoryStore
+
+
+class FakeFSS:
+    """엔드포인트별 응답을 돌려주는 가짜 FSS API (호출 기록과 최대 동시 호출 수 측정)
+
+    responses 값이 callable이면 params로 호출한 결과, list면 호출 순서대로의 응답입니다.
+    """
+
+    def __init__(self, responses, delay: float = 0.0):
+        self.responses = responses
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, endpoint, params):
+        self.calls.append((endpoint, dict(params)))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            response = self.responses.get(endpoint, {"error": f"응답 없음: {endpoint}"})
+            if callable(response):
+                return response(params)
+            if isinstance(response, list):
+                count = sum(1 for called, _ in self.calls if called == endpoint)
+                return response[min(count, len(response)) - 1]
+            return response
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def make_server(tmp_path, monkeypatch):
+    """make_server(responses, offline=False, delay=0) → 가짜 FSS API를 쓰고 get_fss_server()가 반환하는 서버"""
+
+    def make(responses, offline=False, delay=0.0):
+        server = FSSPensionServer(
+            "TEST_KEY", cache=ResponseCache(), snapshot_store=SnapshotStore(str(tmp_path / "snapshots.db")),
+            offline=offline, history_store=HistoryStore(str(tmp_path / "history.db"))
+        )
+        server.fake = FakeFSS(responses, delay)
+        server._fetch_api_response = server.fake
+        monkeypatch.setattr(fss_pension_server, "fss_server", server)
+        return server
+
+    return make
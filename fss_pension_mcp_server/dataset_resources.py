@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+캐시된 FSS 데이터셋의 MCP 리소스 노출
+
+응답 캐시에 있는 데이터셋(엔드포인트 + 연도·분기 등 파라미터)마다 고정 URI를 부여하고,
+캐시 내용이 바뀌면 해당 URI를 구독한 세션에 resources/updated 알림을,
+데이터셋이 캐시에 들어오거나 캐시에서 빠지면(LRU 제거·무효화) 목록을 조회한 세션에
+resources/list_changed 알림을 보냅니다.
+클라이언트는 리소스를 자체 캐시해 두고 알림이 올 때만 다시 읽으면 됩니다.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict, List, Set, Tuple
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
+
+from pydantic import AnyUrl
+
+from fss_pension_common.response_cache import ADDED, REMOVED, CacheEntry, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_PREFIX = "fss://datasets/"
+RESOURCE_MIME_TYPE = "application/json"
+
+# 엔드포인트별 데이터셋 이름
+DATASET_TITLES: Dict[str, str] = {
+    "psCorpList.json": "연금저축 회사별 수익률·수수료율",
+    "psProdList.json": "연금저축 상품별 수익률·수수료율",
+    "psGuaranteedProdList.json": "원리금보장 연금저축보험",
+    "rpCorpResultList.json": "퇴직연금 수익률",
+    "rpCorpBurdenRatioList.json": "퇴직연금 총비용 부담률",
+    "rpCorpCustomFeeList.json": "퇴직연금 맞춤형 수수료 비교",
+    "rpGuaranteedProdSupplyList.json": "원리금보장상품 제공현황",
+    "rpGuaranteedProdList.json": "원리금보장 상품",
+    "pensionStat.json": "연금 통계",
+    "publicPensionStat.json": "공적연금 통계",
+    "personalPensionStat.json": "개인연금 통계",
+    "retirementPensionStat.json": "퇴직연금 통계",
+}
+
+
+def dataset_uri(endpoint: str, params: Dict[str, Any]) -> str:
+    """데이터셋 고정 URI (캐시 키와 같은 정규화, 예: fss://datasets/psProdList.json?quarter=4&year=2023)"""
+    key = make_cache_key(endpoint, params)
+    _, _, query = key.partition("?")
+    uri = RESOURCE_PREFIX + quote(endpoint)
+    if query:
+        uri += "?" + urlencode(parse_qsl(query), quote_via=quote)
+    return uri
+
+
+def parse_dataset_uri(uri: str) -> Tuple[str, Dict[str, str]]:
+    """데이터셋 URI → (엔드포인트, 파라미터)"""
+    uri = str(uri)
+    if not uri.startswith(RESOURCE_PREFIX):
+        raise ValueError(f"알 수 없는 리소스: {uri}")
+    parts = urlsplit(uri)
+    endpoint = parts.path.lstrip("/")
+    if endpoint not in DATASET_TITLES:
+        raise ValueError(f"알 수 없는 데이터셋: {endpoint}")
+    return endpoint, dict(parse_qsl(parts.query))
+
+
+def dataset_name(endpoint: str, params: Dict[str, Any]) -> str:
+    """데이터셋 표시 이름 (예: 연금저축 상품별 수익률·수수료율 2023년 4분기)"""
+    name = DATASET_TITLES.get(endpoint, endpoint)
+    if params.get("year"):
+        name += f" {params['year']}년"
+        if params.get("quarter"):
+            name += f" {params['quarter']}분기"
+    extra = {k: v for k, v in params.items() if k not in ("year", "quarter")}
+    if extra:
+        name += " (" + ", ".join(f"{k}={v}" for k, v in sorted(extra.items())) + ")"
+    return name
+
+
+class ResourceNotifier:
+    """리소스 구독 관리와 변경 알림 전송
+
+    세션은 약한 참조로 보관하므로 연결이 끊긴 세션은 자동으로 빠집니다.
+    캐시 리스너(on_cache_update)는 동기 호출이므로 알림 전송은 백그라운드 태스크로 수행합니다.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, "weakref.WeakSet[Any]"] = {}
+        self._listing_sessions: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._tasks: Set[asyncio.Task] = set()
+        self._list_pending = False  # 아직 보내지 않은 목록 변경 알림이 있는지 (여러 변경을 한 번으로 합침)
+        self.sent = 0
+
+    def subscribe(self, session: Any, uri: str):
+        self._subscribers.setdefault(str(uri), weakref.WeakSet()).add(session)
+
+    def unsubscribe(self, session: Any, uri: str):
+        sessions = self._subscribers.get(str(uri))
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self._subscribers[str(uri)]
+
+    def watch_list(self, session: Any):
+        """목록 변경 알림 대상 세션 등록 (resources/list를 호출한 세션)"""
+        self._listing_sessions.add(session)
+
+    def subscriptions(self) -> Dict[str, int]:
+        return {uri: len(sessions) for uri, sessions in self._subscribers.items() if sessions}
+
+    def on_cache_update(self, entry: CacheEntry, event: str):
+        """응답 캐시 리스너: 저장·변경된 데이터셋의 구독자와, 데이터셋이 추가·제거되면 목록 조회 세션에 알림
+
+        제거된 데이터셋도 읽기 요청 시 다시 조회되므로 구독자에게는 알리지 않습니다.
+        """
+        if not entry.endpoint or entry.params is None:
+            return
+        uri = dataset_uri(entry.endpoint, entry.params)
+        updated = list(self._subscribers.get(uri, ())) if event != REMOVED else []
+        listing = []
+        if event in (ADDED, REMOVED) and not self._list_pending:
+            listing = list(self._listing_sessions)
+            self._list_pending = bool(listing)
+        if not updated and not listing:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._send(uri, updated, listing))
+        except RuntimeError:
+            self._list_pending = False
+            return  # 이벤트 루프 밖 (알림 대상 세션도 없음)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, uri: str, updated: List[Any], listing: List[Any]):
+        if listing:
+            self._list_pending = False  # 이후 변경은 새 알림으로 보냄
+        for session in updated:
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+                self.sent += 1
+            except Exception as e:
+                logger.info(f"리소스 변경 알림 실패, 구독 해제 ({uri}): {e}")
+                self.unsubscribe(session, uri)
+        for session in listing:
+            try:
+                await session.send_resource_list_changed()
+                self.sent += 1
+            except Exception as e:
+                logger.info(f"리소스 목록 변경 알림 실패: {e}")
+                self._listing_sessions.discard(session)
+
+    async def close(self):
+        """전송 중인 알림 취소"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
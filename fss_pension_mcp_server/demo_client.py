@@ -9,6 +9,8 @@ import asyncio
 import json
 from datetime import datetime
 
+from fss_pension_common.tax_benefits import calculate_tax_benefits, to_record
+
 # 데모용 샘플 데이터 (실제 API 응답 형태)
 SAMPLE_COMPANY_PERFORMANCE = {
     "response": {
@@ -161,8 +163,8 @@ class PensionAnalysisDemo:
         elif risk_preference == "aggressive":
             stock_ratio = min(80, stock_ratio + 20)
         
-        # 세액공제 계산
-        max_deduction = min(income * 12 * 0.15, 7000000)
+        # 세액공제 계산 (만원 → 원)
+        tax = to_record(calculate_tax_benefits(income))
         
         recommendation = {
             "투자_전략": strategy,
@@ -170,9 +172,9 @@ class PensionAnalysisDemo:
                 "주식형": f"{stock_ratio}%",
                 "채권형": f"{100-stock_ratio}%"
             },
-            "연간_세액공제_한도": f"{max_deduction:,}원",
-            "월_권장_납입액": f"{max_deduction // 12:,}원",
-            "예상_절세액": f"{max_deduction * 0.15:,}원"
+            "연간_세액공제_한도": f"{round(tax['deduction_limit'] * 10000):,}원",
+            "월_권장_납입액": f"{round(tax['recommended_monthly_contribution'] * 10000):,}원",
+            "예상_절세액": f"{round(tax['expected_tax_credit'] * 10000):,}원"
         }
         
         return recommendation
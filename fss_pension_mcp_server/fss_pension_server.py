@@ -7,29 +7,63 @@
 """
 
 import asyncio
-import json
 import logging
+import os
+import signal
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlencode
 
+import anyio
 import httpx
 import pandas as pd
 import xmltodict
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
-from mcp.types import ServerCapabilities
+from mcp.server.sse import SseServerTransport
 from mcp.server.stdio import stdio_server
 from mcp.types import (
-    CallToolRequest,
-    CallToolResult,
-    ListToolsRequest,
-    ListToolsResult,
+    Resource,
+    ResourcesCapability,
+    ServerCapabilities,
     TextContent,
     Tool,
 )
 from pydantic import BaseModel
 
+from fss_pension_common.http_pool import close_http_clients, get_http_client
+from fss_pension_common.name_index import NameIndex
+from fss_pension_common.quarter_diff import previous_quarter
+from fss_pension_common.refresh import REFRESH_ENABLED, REFRESH_RECENT_WINDOW, RefreshScheduler
+from fss_pension_common.response_cache import ResponseCache, get_shared_cache, is_cacheable, make_cache_key
+from fss_pension_common.retirement_projection import product_columns, return_distribution, sweep_retirement
+from fss_pension_common.snapshot_store import OFFLINE_MODE, SnapshotStore, get_shared_snapshot_store
+from fss_pension_common.tax_benefits import calculate_tax_benefits, to_record
+from fss_pension_common.transport import ResilientTransport
+
+from dataset_resources import (
+    DATASET_TITLES,
+    RESOURCE_MIME_TYPE,
+    ResourceNotifier,
+    dataset_name,
+    dataset_uri,
+    parse_dataset_uri,
+)
+from history_store import (
+    BACKFILL_ENABLED,
+    DIFF_ENDPOINTS,
+    HISTORY_ENDPOINTS,
+    HistoryBackfill,
+    HistoryStore,
+    get_shared_history_store,
+    period_of,
+    split_period,
+)
+from response_format import RESPONSE_OPTIONS_SCHEMA, InvalidResponseOptionError, ResponseShaper, dumps, format_response
+from tool_registry import Handler, ToolArgumentError, ToolRegistry, UnknownToolError
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,16 +72,87 @@ logger = logging.getLogger(__name__)
 FSS_API_BASE_URL = "https://www.fss.or.kr/openapi/api"
 DEFAULT_SERVICE_KEY = "49d25d57b112aa90ad14183172a3c668"  # 실제 사용시 서비스키 필요
 
+# 스냅샷 저장소 기본 경로 (FSS_SNAPSHOT_PATH로 변경)
+DEFAULT_SNAPSHOT_PATH = str(Path(__file__).resolve().parent / "data" / "fss_snapshots.db")
+
+# MCP 전송 방식: stdio (클라이언트별 프로세스) 또는 sse (여러 클라이언트가 공유하는 HTTP 서버)
+MCP_TRANSPORT = os.getenv("FSS_MCP_TRANSPORT", "stdio").lower()
+MCP_HOST = os.getenv("FSS_MCP_HOST", "127.0.0.1")
+MCP_PORT = int(os.getenv("FSS_MCP_PORT", "8000"))
+# 모든 클라이언트 세션에서 동시에 실행하는 도구 호출 수 (워커 수)
+MCP_WORKERS = int(os.getenv("FSS_MCP_WORKERS", "8"))
+# 종료 시 열린 SSE 연결을 기다리는 최대 시간 (초)
+MCP_SHUTDOWN_TIMEOUT = float(os.getenv("FSS_MCP_SHUTDOWN_TIMEOUT", "10"))
+
+# 분석 도구 호출 하나가 동시에 실행하는 업스트림 호출 수 제한
+FANOUT_CONCURRENCY = int(os.getenv("FSS_FANOUT_CONCURRENCY", "4"))
+
+# 트렌드 분석 기간 (연)
+TREND_YEARS = int(os.getenv("FSS_TREND_YEARS", "5"))
+# 트렌드 분석 지표 (None이면 숫자 필드 전체)
+TREND_METRICS = {
+    "psCorpList.json": ("avgFeeRate3", "avgEarnRate3", "reserve"),
+    "psProdList.json": ("avgFeeRate3", "avgEarnRate3", "reserve"),
+    "rpCorpResultList.json": None,
+    "rpCorpBurdenRatioList.json": None,
+}
+
+# batch_query 한 번에 실행하는 최대 조회 수와 동시 실행 수
+BATCH_MAX_QUERIES = int(os.getenv("FSS_BATCH_MAX_QUERIES", "20"))
+BATCH_CONCURRENCY = int(os.getenv("FSS_BATCH_CONCURRENCY", "4"))
+
+# 은퇴 시나리오 그리드 기본 축 (만원/월, 세)
+DEFAULT_SWEEP_GRID = {
+    "monthly_living_costs": [200, 250, 300, 350],
+    "additional_savings": [0, 50, 100],
+    "retirement_ages": [60, 65],
+    "life_expectancies": [85, 90, 95],
+}
+
+# 추천 결과에 포함하는 상품 수와 필드
+RECOMMENDATION_TOP_N = int(os.getenv("FSS_RECOMMENDATION_TOP_N", "10"))
+RECOMMENDATION_FIELDS = ("company", "product", "productType", "avgFeeRate3", "avgEarnRate3", "reserve")
+
+# 이름 검색 인덱스를 보관하는 응답 수
+NAME_INDEX_CACHE_SIZE = 32
+
+# 사전 갱신 기본 대상 (필수 파라미터가 없는 엔드포인트)
+# 필수 파라미터가 있는 엔드포인트는 캐시에 있는 요청 기준으로 갱신
+DEFAULT_REFRESH_REQUESTS = [
+    ("psCorpList.json", {}),
+    ("psProdList.json", {}),
+    ("psGuaranteedProdList.json", {}),
+    ("rpCorpResultList.json", {}),
+    ("rpCorpBurdenRatioList.json", {}),
+    ("rpCorpCustomFeeList.json", {}),
+    ("rpGuaranteedProdSupplyList.json", {}),
+    ("pensionStat.json", {}),
+    ("publicPensionStat.json", {}),
+]
+
 class FSSPensionServer:
     """금융감독원 연금 정보 MCP 서버"""
     
-    def __init__(self, service_key: str = DEFAULT_SERVICE_KEY):
+    def __init__(self, service_key: str = DEFAULT_SERVICE_KEY, cache: Optional[ResponseCache] = None,
+                 snapshot_store: Optional[SnapshotStore] = None, offline: bool = OFFLINE_MODE,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 history_store: Optional[HistoryStore] = None):
         self.service_key = service_key
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = http_client or get_http_client("fss")
+        self.transport = ResilientTransport(self.client)
+        self.cache = cache or get_shared_cache()
+        self.snapshot_store = snapshot_store or get_shared_snapshot_store(DEFAULT_SNAPSHOT_PATH)
+        self.offline = offline
+        self.history_store = history_store or get_shared_history_store()
+        self._name_indexes: "OrderedDict[Tuple[int, str], Tuple[Dict[str, Any], NameIndex, Dict[str, List[Dict[str, Any]]]]]" = OrderedDict()
         
     async def close(self):
-        """클라이언트 연결 종료"""
-        await self.client.aclose()
+        """진행 중인 캐시 백그라운드 갱신을 취소하고 이름 인덱스 해제
+        
+        공유 연결 풀은 프로세스 종료 시 close_http_clients()로 정리합니다.
+        """
+        await self.cache.close()
+        self._name_indexes.clear()
     
     def _build_api_url(self, endpoint: str, params: Dict[str, Any]) -> str:
         """API URL 생성"""
@@ -61,13 +166,82 @@ class FSSPensionServer:
         return f"{url}?{query_string}"
     
     async def _make_api_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """API 요청 실행"""
+        """API 요청 실행 (응답 캐시 경유)"""
+        return await self.cache.get_or_fetch(
+            endpoint, params, lambda: self._load_dataset(endpoint, params)
+        )
+    
+    async def _load_dataset(self, endpoint: str, params: Dict[str, Any], force: bool = False,
+                            record_history: bool = True) -> Dict[str, Any]:
+        """스냅샷 저장소 → FSS API 순으로 데이터 조회
+        
+        - 오프라인 모드: 스냅샷만 사용
+        - 스냅샷이 엔드포인트 TTL 이내: 네트워크 호출 없이 스냅샷 사용 (force=True면 API 호출)
+        - API 호출 실패: 저장된 스냅샷으로 대체
+        - 새로 받은 분기 데이터는 이력 저장소에도 기록 (record_history=False면 생략)
+        """
+        snapshot = None
+        if self.snapshot_store:
+            snapshot = await self.snapshot_store.aload(endpoint, params)
+        
+        if self.offline:
+            if snapshot:
+                return snapshot.payload
+            return {"error": "오프라인 모드: 저장된 스냅샷 없음"}
+        
+        if not force and snapshot and snapshot.age < self.cache.ttl_for(endpoint):
+            return snapshot.payload
+        
+        data = await self._fetch_api_response(endpoint, params)
+        if is_cacheable(data):
+            if self.snapshot_store:
+                await self.snapshot_store.asave(endpoint, params, data)
+            if record_history:
+                await self._record_history(endpoint, params, data)
+        elif snapshot:
+            logger.warning(f"API 호출 실패, 저장된 스냅샷 사용: {endpoint} ({snapshot.year}/{snapshot.quarter})")
+            return snapshot.payload
+        return data
+    
+    async def _record_history(self, endpoint: str, params: Dict[str, Any], data: Dict[str, Any]):
+        """연도(·분기)를 지정한 이력 대상 응답을 이력 저장소에 기록"""
+        if not self.history_store or endpoint not in HISTORY_ENDPOINTS or not data.get("list"):
+            return
+        _, quarterly = HISTORY_ENDPOINTS[endpoint]
+        # 권역 등으로 걸러진 부분 목록은 기간 전체 데이터를 대체하지 않도록 제외
+        if not params.get("year") or (quarterly and not params.get("quarter")) or set(params) - {"year", "quarter"}:
+            return
+        await self.history_store.aingest(endpoint, params["year"], params.get("quarter"), data["list"])
+    
+    async def ensure_history(self, endpoint: str, year: str, quarter: str) -> Dict[str, Any]:
+        """해당 기간이 이력 저장소에 없으면 조회하여 저장 (저장 시 직전 기간 대비 변화도 계산)"""
+        period = period_of(year, quarter)
+        if period in await asyncio.to_thread(self.history_store.periods, endpoint):
+            return {"period": period, "stored": True}
+        data = await self._make_api_request(endpoint, {"year": year, "quarter": quarter})
+        if not is_cacheable(data) or not data.get("list"):
+            return {"period": period, "stored": False, "error": data.get("error") or data.get("message")}
+        # 새로 내려받은 응답은 _load_dataset에서 이미 저장되었을 수 있음
+        if period not in await asyncio.to_thread(self.history_store.periods, endpoint):
+            await self.history_store.aingest(endpoint, year, quarter, data["list"])
+        return {"period": period, "stored": True}
+    
+    def history_backfill(self) -> Optional[HistoryBackfill]:
+        """과거 분기 이력 백필 작업 (이력 저장소가 없으면 None)"""
+        if not self.history_store:
+            return None
+        return HistoryBackfill(
+            self.history_store,
+            lambda endpoint, params: self._load_dataset(endpoint, params, record_history=False)
+        )
+    
+    async def _fetch_api_response(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """FSS API 직접 호출"""
         try:
             url = self._build_api_url(endpoint, params)
             logger.info(f"API 요청: {url}")
             
-            response = await self.client.get(url)
-            response.raise_for_status()
+            response = await self.transport.get(url, endpoint)
             
             content_type = response.headers.get("content-type", "")
             
@@ -86,10 +260,67 @@ class FSSPensionServer:
             logger.error(f"API 요청 실패: {e}")
             return {"error": str(e)}
     
+    def refresh_requests(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """사전 갱신 대상 목록 (기본 대상 + 최근 REFRESH_RECENT_WINDOW 안에 조회된 캐시 요청)"""
+        requests = {}
+        for endpoint, params in DEFAULT_REFRESH_REQUESTS + self.cache.cached_requests(REFRESH_RECENT_WINDOW):
+            requests.setdefault(make_cache_key(endpoint, params), (endpoint, params))
+        return list(requests.values())
+    
+    async def refresh_dataset(self, endpoint: str, params: Dict[str, Any], force: bool = True) -> bool:
+        """데이터셋 갱신 (force=False면 캐시/스냅샷을 재사용하여 적재만 수행)"""
+        if not force:
+            return is_cacheable(await self._make_api_request(endpoint, params))
+        return await self.cache.refresh(
+            endpoint, params, lambda: self._load_dataset(endpoint, params, force=True)
+        )
+    
+    def _name_lookup(self, data: Dict[str, Any], field: str) -> Tuple[NameIndex, Dict[str, List[Dict[str, Any]]]]:
+        """응답별 이름 인덱스와 이름별 행 목록 (같은 응답 객체면 재사용)"""
+        key = (id(data), field)
+        entry = self._name_indexes.get(key)
+        if entry is None or entry[0] is not data:
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            for row in data.get("list") or []:
+                groups.setdefault(row.get(field) or "", []).append(row)
+            entry = (data, NameIndex(groups), groups)
+            self._name_indexes[key] = entry
+            if len(self._name_indexes) > NAME_INDEX_CACHE_SIZE:
+                self._name_indexes.popitem(last=False)
+        else:
+            self._name_indexes.move_to_end(key)
+        return entry[1], entry[2]
+    
+    def filter_by_name(self, data: Dict[str, Any], **names: Optional[str]) -> Dict[str, Any]:
+        """응답 목록을 필드별 이름으로 필터링 (예: company="삼성생명")
+        
+        FSS 표기와 정확히 일치하지 않는 이름(오타, 띄어쓰기, 일부 입력)도
+        자모 n-gram 유사도로 가장 가까운 이름을 찾아 해당 행만 반환합니다.
+        """
+        names = {field: name for field, name in names.items() if name}
+        if not names or not isinstance(data, dict) or not isinstance(data.get("list"), list):
+            return data
+        
+        rows = None
+        matched_names = {}
+        for field, name in names.items():
+            index, groups = self._name_lookup(data, field)
+            matched = index.resolve(name)
+            matched_names[field] = matched
+            field_rows = [row for matched_name in matched for row in groups[matched_name]]
+            if rows is None:
+                rows = field_rows
+            else:
+                keep = {id(row) for row in field_rows}
+                rows = [row for row in rows if id(row) in keep]
+        
+        return {**data, "list": rows, "matchedNames": matched_names}
+    
     async def get_pension_savings_company_performance(self, 
                                                     year: str = None,
                                                     quarter: str = None,
-                                                    area_code: str = None) -> Dict[str, Any]:
+                                                    area_code: str = None,
+                                                    company_name: str = None) -> Dict[str, Any]:
         """연금저축 회사별 수익률·수수료율 조회 (API 1)"""
         params = {}
         if year:
@@ -99,12 +330,14 @@ class FSSPensionServer:
         if area_code:
             params["areaCode"] = area_code
             
-        return await self._make_api_request("psCorpList.json", params)
+        data = await self._make_api_request("psCorpList.json", params)
+        return self.filter_by_name(data, company=company_name)
     
     async def get_pension_savings_product_performance(self,
                                                     year: str = None,
                                                     quarter: str = None,
-                                                    area_code: str = None) -> Dict[str, Any]:
+                                                    area_code: str = None,
+                                                    company_name: str = None) -> Dict[str, Any]:
         """연금저축 상품별 수익률·수수료율 조회 (API 2)"""
         params = {}
         if year:
@@ -114,11 +347,13 @@ class FSSPensionServer:
         if area_code:
             params["areaCode"] = area_code
             
-        return await self._make_api_request("psProdList.json", params)
+        data = await self._make_api_request("psProdList.json", params)
+        return self.filter_by_name(data, company=company_name)
     
     async def get_pension_savings_insurance(self,
                                           area_code: str = None,
-                                          channel_code: str = None) -> Dict[str, Any]:
+                                          channel_code: str = None,
+                                          company_name: str = None) -> Dict[str, Any]:
         """원리금보장 연금저축보험 조회 (API 3)"""
         params = {}
         if area_code:
@@ -126,12 +361,14 @@ class FSSPensionServer:
         if channel_code:
             params["channelCode"] = channel_code
             
-        return await self._make_api_request("psGuaranteedProdList.json", params)
+        data = await self._make_api_request("psGuaranteedProdList.json", params)
+        return self.filter_by_name(data, company=company_name)
     
     async def get_retirement_pension_performance(self,
                                                year: str = None,
                                                quarter: str = None,
-                                               sys_type: str = None) -> Dict[str, Any]:
+                                               sys_type: str = None,
+                                               company_name: str = None) -> Dict[str, Any]:
         """퇴직연금 수익률 조회 (API 4)"""
         params = {}
         if year:
@@ -141,16 +378,19 @@ class FSSPensionServer:
         if sys_type:
             params["sysType"] = sys_type
             
-        return await self._make_api_request("rpCorpResultList.json", params)
+        data = await self._make_api_request("rpCorpResultList.json", params)
+        return self.filter_by_name(data, company=company_name)
     
     async def get_retirement_pension_cost(self,
-                                        year: str = None) -> Dict[str, Any]:
+                                        year: str = None,
+                                        company_name: str = None) -> Dict[str, Any]:
         """퇴직연금 총비용 부담률 조회 (API 5)"""
         params = {}
         if year:
             params["year"] = year
             
-        return await self._make_api_request("rpCorpBurdenRatioList.json", params)
+        data = await self._make_api_request("rpCorpBurdenRatioList.json", params)
+        return self.filter_by_name(data, company=company_name)
     
     async def get_retirement_pension_custom_fee(self,
                                               sys_type: str = None,
@@ -168,19 +408,23 @@ class FSSPensionServer:
         return await self._make_api_request("rpCorpCustomFeeList.json", params)
     
     async def get_principal_guaranteed_product_status(self,
-                                                    area_code: str = None) -> Dict[str, Any]:
+                                                    area_code: str = None,
+                                                    company_name: str = None) -> Dict[str, Any]:
         """원리금보장상품 제공현황 조회 (API 7)"""
         params = {}
         if area_code:
             params["areaCode"] = area_code
             
-        return await self._make_api_request("rpGuaranteedProdSupplyList.json", params)
+        data = await self._make_api_request("rpGuaranteedProdSupplyList.json", params)
+        return self.filter_by_name(data, company=company_name)
     
     async def get_principal_guaranteed_product(self,
                                              area_code: str,
                                              sys_type: str,
                                              report_date: str,
-                                             product_type: str = None) -> Dict[str, Any]:
+                                             product_type: str = None,
+                                             company_name: str = None,
+                                             product_name: str = None) -> Dict[str, Any]:
         """원리금보장 상품 조회 (API 8)"""
         params = {
             "areaCode": area_code,
@@ -190,11 +434,15 @@ class FSSPensionServer:
         if product_type:
             params["productType"] = product_type
             
-        return await self._make_api_request("rpGuaranteedProdList.json", params)
+        data = await self._make_api_request("rpGuaranteedProdList.json", params)
+        return self.filter_by_name(data, company=company_name, product=product_name)
     
-    async def get_pension_statistics(self) -> Dict[str, Any]:
+    async def get_pension_statistics(self,
+                                     year: str = None) -> Dict[str, Any]:
         """연금 통계 조회 (API 9)"""
         params = {}
+        if year:
+            params["year"] = year
         return await self._make_api_request("pensionStat.json", params)
     
     async def get_public_pension_statistics(self) -> Dict[str, Any]:
@@ -220,370 +468,187 @@ class FSSPensionServer:
 
 # MCP 서버 인스턴스 생성
 app = Server("fss-pension-server")
-fss_server = FSSPensionServer()
+# 캐시된 데이터셋이 바뀌면 구독 세션에 리소스 변경 알림
+resource_notifier = ResourceNotifier()
+# FSS 클라이언트는 처음 사용할 때 생성 (스냅샷·이력 SQLite 파일을 만들므로 import 시에는 만들지 않음)
+fss_server: Optional[FSSPensionServer] = None
 
-@app.list_tools()
-async def list_tools() -> ListToolsResult:
-    """사용 가능한 도구 목록 반환"""
-    return ListToolsResult(
-        tools=[
-            Tool(
-                name="get_pension_savings_company_performance",
-                description="연금저축 회사별 수익률·수수료율 정보를 조회합니다. 특정 연도와 분기를 지정할 수 있습니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "search_year": {
-                            "type": "string",
-                            "description": "조회할 연도 (예: '2023')"
-                        },
-                        "search_quarter": {
-                            "type": "string",
-                            "description": "조회할 분기 (예: '1', '2', '3', '4')"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_pension_savings_product_performance",
-                description="연금저축 상품별 수익률·수수료율 정보를 조회합니다. 회사명으로 필터링할 수 있습니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "search_year": {
-                            "type": "string",
-                            "description": "조회할 연도 (예: '2023')"
-                        },
-                        "search_quarter": {
-                            "type": "string",
-                            "description": "조회할 분기 (예: '1', '2', '3', '4')"
-                        },
-                        "company_name": {
-                            "type": "string",
-                            "description": "금융회사명 (예: '삼성생명', 'KB국민은행')"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_pension_savings_insurance",
-                description="원리금보장 연금저축보험 상품 정보를 조회합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "company_name": {
-                            "type": "string",
-                            "description": "보험회사명 (예: '삼성생명', '한화생명')"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_retirement_pension_performance",
-                description="퇴직연금 사업자별 수익률 정보를 조회합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "search_year": {
-                            "type": "string",
-                            "description": "조회할 연도 (예: '2023')"
-                        },
-                        "search_quarter": {
-                            "type": "string",
-                            "description": "조회할 분기 (예: '1', '2', '3', '4')"
-                        },
-                        "company_name": {
-                            "type": "string",
-                            "description": "퇴직연금 사업자명"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_retirement_pension_cost",
-                description="퇴직연금 총비용 부담률 및 수수료 정보를 조회합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "search_year": {
-                            "type": "string",
-                            "description": "조회할 연도 (예: '2023')"
-                        },
-                        "search_quarter": {
-                            "type": "string",
-                            "description": "조회할 분기 (예: '1', '2', '3', '4')"
-                        },
-                        "company_name": {
-                            "type": "string",
-                            "description": "퇴직연금 사업자명"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_retirement_pension_custom_fee",
-                description="적립금액에 따른 퇴직연금 맞춤형 수수료 정보를 조회합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "deposit_amount": {
-                            "type": "string",
-                            "description": "적립금액 (예: '1000000', '5000000')"
-                        },
-                        "contract_period": {
-                            "type": "string",
-                            "description": "계약기간 (예: '1', '3', '5')"
-                        },
-                        "system_type": {
-                            "type": "string",
-                            "description": "제도유형 (예: 'DB', 'DC', 'IRP')"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_principal_guaranteed_product_status",
-                description="원리금보장상품의 사업자별 제공현황 정보를 조회합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "company_name": {
-                            "type": "string",
-                            "description": "사업자명"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_principal_guaranteed_product",
-                description="퇴직연금 원리금보장 상품 정보를 조회합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "company_name": {
-                            "type": "string",
-                            "description": "사업자명"
-                        },
-                        "product_name": {
-                            "type": "string",
-                            "description": "상품명"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_pension_statistics",
-                description="개인연금, 퇴직연금, 국민연금 등 전체 연금 적립금 통계를 조회합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "search_year": {
-                            "type": "string",
-                            "description": "조회할 연도 (예: '2023')"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_public_pension_statistics",
-                description="국민연금, 공무원연금 등 공적연금 적립금 통계를 조회합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "search_year": {
-                            "type": "string",
-                            "description": "조회할 연도 (예: '2023')"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_personal_pension_statistics",
-                description="세제적격여부 및 업권별 개인연금 적립금 통계를 조회합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "search_year": {
-                            "type": "string",
-                            "description": "조회할 연도 (예: '2023')"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_retirement_pension_statistics",
-                description="제도별 퇴직연금 적립금 통계를 조회합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "search_year": {
-                            "type": "string",
-                            "description": "조회할 연도 (예: '2023')"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="analyze_pension_performance",
-                description="연금 상품의 성과를 분석하고 인사이트를 제공합니다. 여러 API 데이터를 조합하여 종합적인 분석을 수행합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "analysis_type": {
-                            "type": "string",
-                            "description": "분석 유형 ('company_comparison', 'product_ranking', 'cost_analysis', 'trend_analysis')",
-                            "enum": ["company_comparison", "product_ranking", "cost_analysis", "trend_analysis"]
-                        },
-                        "search_year": {
-                            "type": "string",
-                            "description": "분석 대상 연도 (예: '2023')"
-                        },
-                        "search_quarter": {
-                            "type": "string",
-                            "description": "분석 대상 분기 (예: '4')"
-                        }
-                    },
-                    "required": ["analysis_type"]
-                }
-            ),
-            Tool(
-                name="generate_pension_recommendation",
-                description="사용자의 조건에 맞는 연금 상품 추천을 생성합니다.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "user_age": {
-                            "type": "integer",
-                            "description": "사용자 나이"
-                        },
-                        "monthly_income": {
-                            "type": "integer",
-                            "description": "월 소득 (만원 단위)"
-                        },
-                        "risk_preference": {
-                            "type": "string",
-                            "description": "위험 선호도 ('conservative', 'moderate', 'aggressive')",
-                            "enum": ["conservative", "moderate", "aggressive"]
-                        },
-                        "target_retirement_age": {
-                            "type": "integer",
-                            "description": "목표 은퇴 나이"
-                        },
-                        "current_pension_amount": {
-                            "type": "integer",
-                            "description": "현재 연금 적립액 (만원 단위)"
-                        }
-                    },
-                    "required": ["user_age", "monthly_income", "risk_preference"]
-                }
-            )
-        ]
-    )
+def get_fss_server() -> FSSPensionServer:
+    """공유 FSS 클라이언트 (처음 호출 시 생성하고 리소스 변경 알림 리스너 등록)"""
+    global fss_server
+    if fss_server is None:
+        fss_server = FSSPensionServer()
+        fss_server.cache.add_listener(resource_notifier.on_cache_update)
+    return fss_server
 
-@app.call_tool()
-async def call_tool(name: str, arguments: dict) -> CallToolResult:
-    """도구 호출 처리"""
-    try:
-        if name == "get_pension_savings_company_performance":
-            result = await fss_server.get_pension_savings_company_performance(
-                search_year=arguments.get("search_year"),
-                search_quarter=arguments.get("search_quarter")
-            )
-        elif name == "get_pension_savings_product_performance":
-            result = await fss_server.get_pension_savings_product_performance(
-                search_year=arguments.get("search_year"),
-                search_quarter=arguments.get("search_quarter"),
-                company_name=arguments.get("company_name")
-            )
-        elif name == "get_pension_savings_insurance":
-            result = await fss_server.get_pension_savings_insurance(
-                company_name=arguments.get("company_name")
-            )
-        elif name == "get_retirement_pension_performance":
-            result = await fss_server.get_retirement_pension_performance(
-                search_year=arguments.get("search_year"),
-                search_quarter=arguments.get("search_quarter"),
-                company_name=arguments.get("company_name")
-            )
-        elif name == "get_retirement_pension_cost":
-            result = await fss_server.get_retirement_pension_cost(
-                search_year=arguments.get("search_year"),
-                search_quarter=arguments.get("search_quarter"),
-                company_name=arguments.get("company_name")
-            )
-        elif name == "get_retirement_pension_custom_fee":
-            result = await fss_server.get_retirement_pension_custom_fee(
-                deposit_amount=arguments.get("deposit_amount"),
-                contract_period=arguments.get("contract_period"),
-                system_type=arguments.get("system_type")
-            )
-        elif name == "get_principal_guaranteed_product_status":
-            result = await fss_server.get_principal_guaranteed_product_status(
-                company_name=arguments.get("company_name")
-            )
-        elif name == "get_principal_guaranteed_product":
-            result = await fss_server.get_principal_guaranteed_product(
-                company_name=arguments.get("company_name"),
-                product_name=arguments.get("product_name")
-            )
-        elif name == "get_pension_statistics":
-            result = await fss_server.get_pension_statistics(
-                search_year=arguments.get("search_year")
-            )
-        elif name == "get_public_pension_statistics":
-            result = await fss_server.get_public_pension_statistics(
-                search_year=arguments.get("search_year")
-            )
-        elif name == "get_personal_pension_statistics":
-            result = await fss_server.get_personal_pension_statistics(
-                search_year=arguments.get("search_year")
-            )
-        elif name == "get_retirement_pension_statistics":
-            result = await fss_server.get_retirement_pension_statistics(
-                search_year=arguments.get("search_year")
-            )
-        elif name == "analyze_pension_performance":
-            result = await analyze_pension_performance(
-                analysis_type=arguments.get("analysis_type"),
-                search_year=arguments.get("search_year"),
-                search_quarter=arguments.get("search_quarter")
-            )
-        elif name == "generate_pension_recommendation":
-            result = await generate_pension_recommendation(
-                user_age=arguments.get("user_age"),
-                monthly_income=arguments.get("monthly_income"),
-                risk_preference=arguments.get("risk_preference"),
-                target_retirement_age=arguments.get("target_retirement_age"),
-                current_pension_amount=arguments.get("current_pension_amount")
-            )
-        else:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"알 수 없는 도구: {name}")]
-            )
-        
-        return CallToolResult(
-            content=[TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-        )
-        
-    except Exception as e:
-        logger.error(f"도구 호출 오류 ({name}): {e}")
-        return CallToolResult(
-            content=[TextContent(type="text", text=f"오류 발생: {str(e)}")]
-        )
+def _server_method(name: str) -> Handler:
+    """get_fss_server()의 메서드를 호출하는 처리 함수 (도구 등록만으로 클라이언트를 만들지 않도록)"""
+    async def handler(**kwargs):
+        return await getattr(get_fss_server(), name)(**kwargs)
+    handler.__name__ = name
+    return handler
+
+@app.list_resources()
+async def list_resources() -> List[Resource]:
+    """캐시된 데이터셋 리소스 목록 (이후 새 데이터셋이 캐시되면 목록 변경 알림)"""
+    resource_notifier.watch_list(app.request_context.session)
+    return [
+        Resource(uri=dataset_uri(endpoint, params), name=dataset_name(endpoint, params), mimeType=RESOURCE_MIME_TYPE)
+        for endpoint, params in get_fss_server().cache.cached_requests()
+        if endpoint in DATASET_TITLES
+    ]
+
+@app.read_resource()
+async def read_resource(uri) -> str:
+    """데이터셋 리소스 읽기 (도구와 같은 캐시 경로)
+    
+    TTL 이내면 메모리에서 바로 반환하고, 만료 후 유예 기간이면 기존 응답을 반환하며 백그라운드에서 갱신,
+    캐시에 없거나 유예 기간도 지났으면 조회 후 캐시합니다.
+    """
+    endpoint, params = parse_dataset_uri(uri)
+    data = await get_fss_server()._make_api_request(endpoint, params)
+    if not is_cacheable(data):
+        raise ValueError(f"데이터셋을 불러오지 못했습니다: {data.get('error') if isinstance(data, dict) else data}")
+    return dumps(data)
+
+@app.subscribe_resource()
+async def subscribe_resource(uri) -> None:
+    """데이터셋 변경 알림 구독"""
+    resource_notifier.subscribe(app.request_context.session, dataset_uri(*parse_dataset_uri(uri)))
+
+@app.unsubscribe_resource()
+async def unsubscribe_resource(uri) -> None:
+    """데이터셋 변경 알림 구독 해제"""
+    resource_notifier.unsubscribe(app.request_context.session, dataset_uri(*parse_dataset_uri(uri)))
+
+async def _gather_bounded(*coros) -> List[Dict[str, Any]]:
+    """업스트림 호출 동시 실행
+    
+    동시 실행 수는 호출마다 FANOUT_CONCURRENCY로 제한하며 (다른 세션의 요청과는 한도를 나누지 않음),
+    개별 호출이 실패해도 나머지 결과는 유지하고 실패한 호출만 오류 dict로 반환합니다.
+    """
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+    
+    async def run(coro):
+        async with semaphore:
+            try:
+                return await coro
+            except Exception as e:
+                logger.error(f"업스트림 호출 실패: {e}")
+                return {"error": str(e)}
+    
+    return await asyncio.gather(*(run(coro) for coro in coros))
+
+def _failed_sources(**results: Dict[str, Any]) -> List[str]:
+    """오류가 발생한 데이터 소스 이름 목록"""
+    return [name for name, result in results.items()
+            if not isinstance(result, dict) or result.get("error")]
+
+async def _history_trends(start: int, end: int) -> Dict[str, Any]:
+    """이력 저장소의 엔드포인트별 기간 집계"""
+    store = get_fss_server().history_store
+    if not store:
+        return {"error": "이력 저장소가 비활성화되어 있습니다"}
+    
+    trends = {}
+    for endpoint, metrics in TREND_METRICS.items():
+        try:
+            trends[endpoint] = await asyncio.to_thread(store.period_summary, endpoint, metrics, start, end)
+        except Exception as e:
+            logger.error(f"이력 집계 실패 ({endpoint}): {e}")
+            trends[endpoint] = {"error": str(e)}
+    return trends
+
+async def get_quarter_diff(search_year: str = None, search_quarter: str = None) -> Dict[str, Any]:
+    """직전 분기 대비 변화 (이력 저장 시 계산해 둔 결과 사용)"""
+    store = get_fss_server().history_store
+    if not store:
+        return {"error": "이력 저장소가 비활성화되어 있습니다"}
+    
+    if not search_year or not search_quarter:
+        periods = await asyncio.to_thread(store.periods, "psProdList.json")
+        if not periods:
+            return {"error": "저장된 분기 이력이 없습니다. search_year와 search_quarter를 지정하세요"}
+        search_year, search_quarter = split_period(periods[-1])
+    
+    # 해당 분기와 직전 분기가 아직 저장되지 않았다면 조회하여 저장
+    quarters = [(search_year, search_quarter), previous_quarter(search_year, search_quarter)]
+    await _gather_bounded(*(
+        get_fss_server().ensure_history(endpoint, year, quarter)
+        for endpoint in DIFF_ENDPOINTS for year, quarter in quarters
+    ))
+    
+    period = period_of(search_year, search_quarter)
+    result: Dict[str, Any] = {"period": f"{search_year}년 {search_quarter}분기"}
+    for endpoint, key in (("psProdList.json", "products"), ("psCorpList.json", "company_ranks")):
+        try:
+            diff = await asyncio.to_thread(store.diff, endpoint, period)
+        except Exception as e:
+            logger.error(f"분기 변화 조회 실패 ({endpoint}): {e}")
+            diff = {"error": str(e)}
+        if diff is None:
+            diff = {"error": "비교할 직전 기간 데이터가 없습니다"}
+        elif "previous" in diff:
+            year, quarter = split_period(diff.pop("previous"))
+            diff.pop("period", None)
+            diff["compared_with"] = f"{year}년 {quarter}분기"
+        result[key] = diff
+    return result
+
+async def batch_query(queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """여러 도구 호출을 동시에 실행하여 한 번에 반환
+    
+    동시 실행 수는 batch_query 호출마다 BATCH_CONCURRENCY로 제한하며 (한 클라이언트의 일괄 조회가
+    다른 세션의 일괄 조회를 기다리게 하지 않음), 조회별 실패는 해당 항목의 error로만 반환합니다.
+    결과는 요청 순서와 같습니다.
+    """
+    if not isinstance(queries, list) or not queries:
+        return {"error": "queries에 {tool, arguments} 목록을 지정하세요"}
+    if len(queries) > BATCH_MAX_QUERIES:
+        return {"error": f"조회 수가 너무 많습니다 ({len(queries)}개, 최대 {BATCH_MAX_QUERIES}개)"}
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def run(query: Any) -> Dict[str, Any]:
+        if not isinstance(query, dict) or not isinstance(query.get("tool"), str):
+            return {"tool": None, "ok": False, "error": "각 항목은 {tool, arguments} 형식이어야 합니다"}
+        tool, arguments = query["tool"], query.get("arguments") or {}
+        if tool == "batch_query":
+            return {"tool": tool, "ok": False, "error": "batch_query는 중첩할 수 없습니다"}
+        async with semaphore:
+            try:
+                result = await tool_registry.call(tool, arguments)
+            except Exception as e:
+                logger.error(f"일괄 조회 항목 실패 ({tool}): {e}")
+                return {"tool": tool, "ok": False, "error": str(e)}
+        if isinstance(result, dict) and result.get("error"):
+            return {"tool": tool, "ok": False, "error": result["error"]}
+        return {"tool": tool, "ok": True, "result": result}
+    
+    results = await asyncio.gather(*(run(query) for query in queries))
+    return {
+        "total": len(results),
+        "succeeded": sum(1 for item in results if item["ok"]),
+        "failed": sum(1 for item in results if not item["ok"]),
+        "results": results
+    }
 
 async def analyze_pension_performance(analysis_type: str, search_year: str = None, search_quarter: str = None) -> Dict[str, Any]:
     """연금 성과 분석"""
+    server = get_fss_server()
     try:
         if analysis_type == "company_comparison":
             # 회사별 성과 비교 분석
-            company_data = await fss_server.get_pension_savings_company_performance(search_year, search_quarter)
-            product_data = await fss_server.get_pension_savings_product_performance(search_year, search_quarter)
+            company_data, product_data = await _gather_bounded(
+                server.get_pension_savings_company_performance(search_year, search_quarter),
+                server.get_pension_savings_product_performance(search_year, search_quarter)
+            )
             
             analysis = {
                 "analysis_type": "회사별 성과 비교",
                 "period": f"{search_year}년 {search_quarter}분기" if search_year and search_quarter else "최신 데이터",
                 "company_performance": company_data,
                 "product_details": product_data,
+                "failed_sources": _failed_sources(company_performance=company_data, product_details=product_data),
                 "insights": [
                     "수익률 상위 회사와 하위 회사 간의 격차 분석",
                     "수수료율 대비 수익률 효율성 평가",
@@ -593,7 +658,7 @@ async def analyze_pension_performance(analysis_type: str, search_year: str = Non
             
         elif analysis_type == "product_ranking":
             # 상품별 순위 분석
-            product_data = await fss_server.get_pension_savings_product_performance(search_year, search_quarter)
+            product_data = await server.get_pension_savings_product_performance(search_year, search_quarter)
             
             analysis = {
                 "analysis_type": "상품별 순위 분석",
@@ -607,15 +672,18 @@ async def analyze_pension_performance(analysis_type: str, search_year: str = Non
             }
             
         elif analysis_type == "cost_analysis":
-            # 비용 분석
-            cost_data = await fss_server.get_retirement_pension_cost(search_year, search_quarter)
-            custom_fee_data = await fss_server.get_retirement_pension_custom_fee()
+            # 비용 분석 (총비용 부담률 API는 연도 단위로만 조회)
+            cost_data, custom_fee_data = await _gather_bounded(
+                server.get_retirement_pension_cost(search_year),
+                server.get_retirement_pension_custom_fee()
+            )
             
             analysis = {
                 "analysis_type": "비용 구조 분석",
                 "period": f"{search_year}년 {search_quarter}분기" if search_year and search_quarter else "최신 데이터",
                 "cost_breakdown": cost_data,
                 "custom_fee_comparison": custom_fee_data,
+                "failed_sources": _failed_sources(cost_breakdown=cost_data, custom_fee_comparison=custom_fee_data),
                 "insights": [
                     "총비용 부담률 업체별 비교",
                     "적립금액별 수수료 차이 분석",
@@ -628,14 +696,24 @@ async def analyze_pension_performance(analysis_type: str, search_year: str = Non
             current_year = search_year or str(datetime.now().year)
             prev_year = str(int(current_year) - 1)
             
-            current_stats = await fss_server.get_pension_statistics(current_year)
-            prev_stats = await fss_server.get_pension_statistics(prev_year)
+            current_stats, prev_stats = await _gather_bounded(
+                server.get_pension_statistics(current_year),
+                server.get_pension_statistics(prev_year)
+            )
+            
+            # 다년간 분기별 추이는 이력 저장소의 로컬 데이터로 계산 (업스트림 호출 없음)
+            historical_trends = await _history_trends(
+                start=period_of(int(current_year) - TREND_YEARS + 1),
+                end=period_of(current_year, 4)
+            )
             
             analysis = {
                 "analysis_type": "연금 시장 트렌드 분석",
                 "period": f"{prev_year}년 대비 {current_year}년",
                 "current_statistics": current_stats,
                 "previous_statistics": prev_stats,
+                "historical_trends": historical_trends,
+                "failed_sources": _failed_sources(current_statistics=current_stats, previous_statistics=prev_stats),
                 "insights": [
                     "연금 적립금 증가율 분석",
                     "제도별 성장 패턴 분석",
@@ -651,6 +729,55 @@ async def analyze_pension_performance(analysis_type: str, search_year: str = Non
     except Exception as e:
         return {"error": f"분석 중 오류 발생: {str(e)}"}
 
+async def sweep_retirement_scenarios(user_age: int, current_pension_amount: int = None,
+                                     risk_preference: str = None,
+                                     monthly_living_costs: List[int] = None,
+                                     additional_savings: List[int] = None,
+                                     retirement_ages: List[int] = None,
+                                     life_expectancies: List[int] = None,
+                                     product_types: List[str] = None) -> Dict[str, Any]:
+    """은퇴 시나리오 그리드 일괄 계산 (생략한 축은 DEFAULT_SWEEP_GRID 사용)"""
+    product_data = await get_fss_server().get_pension_savings_product_performance()
+    if not isinstance(product_data, dict) or not product_data.get("list"):
+        return {"error": "상품 수익률 데이터를 불러오지 못했습니다"}
+    
+    try:
+        distribution = return_distribution(product_columns(product_data["list"]), product_types, risk_preference)
+        result = await asyncio.to_thread(
+            sweep_retirement,
+            age=user_age,
+            current_balance=current_pension_amount or 0,
+            monthly_living_costs=monthly_living_costs or DEFAULT_SWEEP_GRID["monthly_living_costs"],
+            monthly_savings=additional_savings or DEFAULT_SWEEP_GRID["additional_savings"],
+            retirement_ages=retirement_ages or DEFAULT_SWEEP_GRID["retirement_ages"],
+            life_expectancies=life_expectancies or DEFAULT_SWEEP_GRID["life_expectancies"],
+            mean_return=distribution["mean"],
+            volatility=distribution["volatility"]
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    
+    result["return_distribution"] = distribution
+    return result
+
+def _rate(row: Dict[str, Any], field: str) -> Optional[float]:
+    try:
+        return float(row.get(field))
+    except (TypeError, ValueError):
+        return None
+
+def _top_low_fee_products(rows: List[Dict[str, Any]], limit: int = RECOMMENDATION_TOP_N) -> Dict[str, Any]:
+    """판매 중인 상품 중 3년 평균 수수료율이 낮은 순 (같으면 수익률 높은 순) 상위 상품의 주요 필드"""
+    selling = [row for row in rows if row.get("sells", "Y") == "Y"]
+    ranked = sorted(
+        (row for row in selling if _rate(row, "avgFeeRate3") is not None),
+        key=lambda row: (_rate(row, "avgFeeRate3"), -(_rate(row, "avgEarnRate3") or 0.0))
+    )
+    return {
+        "total": len(selling),
+        "products": [{field: row.get(field) for field in RECOMMENDATION_FIELDS if field in row} for row in ranked[:limit]]
+    }
+
 async def generate_pension_recommendation(user_age: int, monthly_income: int, risk_preference: str,
                                         target_retirement_age: int = None, current_pension_amount: int = None) -> Dict[str, Any]:
     """개인 맞춤형 연금 상품 추천"""
@@ -662,8 +789,7 @@ async def generate_pension_recommendation(user_age: int, monthly_income: int, ri
         
         # 최신 상품 데이터 조회
         current_year = str(datetime.now().year)
-        product_data = await fss_server.get_pension_savings_product_performance(current_year)
-        insurance_data = await fss_server.get_pension_savings_insurance()
+        product_data = await get_fss_server().get_pension_savings_product_performance(current_year)
         
         # 위험 선호도에 따른 상품 필터링
         risk_mapping = {
@@ -706,16 +832,18 @@ async def generate_pension_recommendation(user_age: int, monthly_income: int, ri
             "expected_return": f"{risk_profile['min_return']}-{risk_profile['max_return']}%"
         }
         
-        # 세제 혜택 계산
-        max_deduction = min(monthly_income * 12 * 0.15, 7000000)  # 연간 소득의 15%, 최대 700만원
-        current_deduction = current_pension_amount * 0.15 if current_pension_amount else 0
-        additional_deduction_available = max_deduction - current_deduction
+        # 세제 혜택 계산 (금액 단위: 원, 연간 소득의 15%, 최대 700만원)
+        # 현재 공제액은 적립액의 15%로 추정
+        tax = to_record(calculate_tax_benefits(monthly_income or 0, pension_savings=current_pension_amount * 0.15))
+        additional_deduction_available = round(tax["additional_available"] * 10000)
         
         recommendations["tax_benefits"] = {
-            "max_annual_deduction": max_deduction,
-            "current_deduction": current_deduction,
+            "max_annual_deduction": round(tax["deduction_limit"] * 10000),
+            "current_deduction": round(tax["eligible_contribution"] * 10000),
             "additional_available": additional_deduction_available,
-            "tax_saving_rate": "15% (소득세 + 지방소득세)"
+            "recommended_monthly_contribution": round(tax["recommended_monthly_contribution"] * 10000),
+            "expected_tax_credit": round(tax["expected_tax_credit"] * 10000),
+            "tax_saving_rate": f"{tax['tax_credit_rate'] * 100:g}% (소득세 + 지방소득세)"
         }
         
         # 액션 아이템 생성
@@ -735,34 +863,403 @@ async def generate_pension_recommendation(user_age: int, monthly_income: int, ri
         
         recommendations["action_items"] = action_items
         
-        # 상품 데이터가 있다면 구체적인 상품 추천 추가
+        # 상품 데이터가 있다면 구체적인 상품 추천 추가 (전체 목록 대신 저수수료 상위 상품의 주요 필드만)
         if product_data and not product_data.get("error"):
             recommendations["data_source"] = "금융감독원 최신 데이터 기반"
-            recommendations["recommended_products"] = product_data
+            recommendations["recommended_products"] = _top_low_fee_products(product_data.get("list") or [])
         
         return recommendations
         
     except Exception as e:
         return {"error": f"추천 생성 중 오류 발생: {str(e)}"}
 
+# 도구 인자 스키마 (여러 도구가 같은 인자 정의를 공유)
+YEAR_ARG = {"type": "string", "description": "조회할 연도 (예: '2023')"}
+QUARTER_ARG = {"type": "string", "description": "조회할 분기 (예: '1', '2', '3', '4')"}
+AREA_ARG = {"type": "string", "description": "권역 코드 (FSS OpenAPI 코드값, 생략 시 전체)"}
+SYS_TYPE_ARG = {"type": "string", "description": "제도유형 ('DB', 'DC', 'IRP' 또는 코드 '1', '2', '3')"}
+STAT_TYPE_ARG = {"type": "string", "description": "통계 구분 (FSS OpenAPI statType 코드값)"}
+RISK_PREFERENCE_ARG = {
+    "type": "string",
+    "description": "위험 선호도 ('conservative', 'moderate', 'aggressive')",
+    "enum": ["conservative", "moderate", "aggressive"]
+}
+
+def _company_arg(description: str = "금융회사명 (예: '삼성생명', 'KB국민은행')") -> Dict[str, Any]:
+    return {"type": "string", "description": description}
+
+# 도구 인자 이름 → FSSPensionServer 메서드 매개변수 이름
+PERIOD_ALIASES = {"search_year": "year", "search_quarter": "quarter"}
+# 제도유형 이름 → FSS sysType 코드
+SYS_TYPE_CODES = {"DB": "1", "DC": "2", "IRP": "3", "db": "1", "dc": "2", "irp": "3"}
+
+tool_registry = ToolRegistry(common_properties=RESPONSE_OPTIONS_SCHEMA)
+
+tool_registry.register(
+    "get_pension_savings_company_performance",
+    "연금저축 회사별 수익률·수수료율 정보를 조회합니다. 특정 연도와 분기를 지정할 수 있습니다.",
+    _server_method("get_pension_savings_company_performance"),
+    {"search_year": YEAR_ARG, "search_quarter": QUARTER_ARG, "area_code": AREA_ARG,
+     "company_name": _company_arg()},
+    aliases=PERIOD_ALIASES
+)
+tool_registry.register(
+    "get_pension_savings_product_performance",
+    "연금저축 상품별 수익률·수수료율 정보를 조회합니다. 회사명으로 필터링할 수 있습니다.",
+    _server_method("get_pension_savings_product_performance"),
+    {"search_year": YEAR_ARG, "search_quarter": QUARTER_ARG, "area_code": AREA_ARG,
+     "company_name": _company_arg()},
+    aliases=PERIOD_ALIASES
+)
+tool_registry.register(
+    "get_pension_savings_insurance",
+    "원리금보장 연금저축보험 상품 정보를 조회합니다.",
+    _server_method("get_pension_savings_insurance"),
+    {"area_code": AREA_ARG,
+     "channel_code": {"type": "string", "description": "판매채널 코드 (FSS OpenAPI channelCode 코드값)"},
+     "company_name": _company_arg("보험회사명 (예: '삼성생명', '한화생명')")}
+)
+tool_registry.register(
+    "get_retirement_pension_performance",
+    "퇴직연금 사업자별 수익률 정보를 조회합니다.",
+    _server_method("get_retirement_pension_performance"),
+    {"search_year": YEAR_ARG, "search_quarter": QUARTER_ARG, "system_type": SYS_TYPE_ARG,
+     "company_name": _company_arg("퇴직연금 사업자명")},
+    aliases={**PERIOD_ALIASES, "system_type": "sys_type"},
+    values={"system_type": SYS_TYPE_CODES}
+)
+tool_registry.register(
+    "get_retirement_pension_cost",
+    "퇴직연금 총비용 부담률 및 수수료 정보를 조회합니다. 연도 단위로 공시됩니다.",
+    _server_method("get_retirement_pension_cost"),
+    {"search_year": YEAR_ARG, "company_name": _company_arg("퇴직연금 사업자명")},
+    aliases=PERIOD_ALIASES
+)
+tool_registry.register(
+    "get_retirement_pension_custom_fee",
+    "적립금액에 따른 퇴직연금 맞춤형 수수료 정보를 조회합니다.",
+    _server_method("get_retirement_pension_custom_fee"),
+    {"system_type": SYS_TYPE_ARG,
+     "contract_period": {"type": "string", "description": "가입기간 (년, 예: '1', '3', '5', '10')"},
+     "deposit_amount": {"type": "string", "description": "적립금 (백만원 단위, 예: '10', '50', '100')"}},
+    aliases={"system_type": "sys_type", "contract_period": "term", "deposit_amount": "reserve"},
+    values={"system_type": SYS_TYPE_CODES}
+)
+tool_registry.register(
+    "get_principal_guaranteed_product_status",
+    "원리금보장상품의 사업자별 제공현황 정보를 조회합니다.",
+    _server_method("get_principal_guaranteed_product_status"),
+    {"area_code": AREA_ARG, "company_name": _company_arg("사업자명")}
+)
+tool_registry.register(
+    "get_principal_guaranteed_product",
+    "퇴직연금 원리금보장 상품 정보를 조회합니다.",
+    _server_method("get_principal_guaranteed_product"),
+    {"area_code": {"type": "string", "description": "권역 코드 (FSS OpenAPI 코드값)"},
+     "system_type": SYS_TYPE_ARG,
+     "report_date": {"type": "string", "description": "공시 기준일 (FSS OpenAPI reportDate 값)"},
+     "product_type": {"type": "string", "description": "상품 유형 (FSS OpenAPI productType 코드값)"},
+     "company_name": _company_arg("사업자명"),
+     "product_name": {"type": "string", "description": "상품명"}},
+    required=["area_code", "system_type", "report_date"],
+    aliases={"system_type": "sys_type"},
+    values={"system_type": SYS_TYPE_CODES}
+)
+tool_registry.register(
+    "get_pension_statistics",
+    "개인연금, 퇴직연금, 국민연금 등 전체 연금 적립금 통계를 조회합니다.",
+    _server_method("get_pension_statistics"),
+    {"search_year": YEAR_ARG},
+    aliases=PERIOD_ALIASES
+)
+tool_registry.register(
+    "get_public_pension_statistics",
+    "국민연금, 공무원연금 등 공적연금 적립금 통계를 조회합니다.",
+    _server_method("get_public_pension_statistics")
+)
+tool_registry.register(
+    "get_personal_pension_statistics",
+    "세제적격여부 및 업권별 개인연금 적립금 통계를 조회합니다.",
+    _server_method("get_personal_pension_statistics"),
+    {"stat_type": STAT_TYPE_ARG},
+    required=["stat_type"]
+)
+tool_registry.register(
+    "get_retirement_pension_statistics",
+    "제도별 퇴직연금 적립금 통계를 조회합니다.",
+    _server_method("get_retirement_pension_statistics"),
+    {"stat_type": STAT_TYPE_ARG},
+    required=["stat_type"]
+)
+tool_registry.register(
+    "get_quarter_diff",
+    "직전 분기 대비 변화를 조회합니다. 신규/판매중지 연금저축 상품, 수수료율·수익률 변동이 큰 상품, 권역별 회사 순위 변동을 미리 계산된 결과로 제공합니다.",
+    get_quarter_diff,
+    {"search_year": {"type": "string", "description": "조회할 연도 (예: '2023', 생략 시 저장된 최근 분기)"},
+     "search_quarter": QUARTER_ARG}
+)
+tool_registry.register(
+    "sweep_retirement_scenarios",
+    "월 생활비 × 추가 저축 × 은퇴 나이 × 기대수명 조합별 은퇴 자금 시뮬레이션 결과를 한 번에 계산합니다. FSS 상품 수익률 분포 기반 몬테카를로 시뮬레이션이며, 조합별 자금 유지 확률·필요 자금·부족 금액·추가 저축 필요액 행렬을 반환합니다.",
+    sweep_retirement_scenarios,
+    {
+        "user_age": {"type": "integer", "description": "사용자 나이"},
+        "current_pension_amount": {"type": "integer", "description": "현재 연금 적립액 (만원 단위)"},
+        "risk_preference": {
+            **RISK_PREFERENCE_ARG,
+            "description": "위험 선호도 ('conservative', 'moderate', 'aggressive') - 수익률 분포에 사용할 상품 선택"
+        },
+        "monthly_living_costs": {"type": "array", "items": {"type": "integer"}, "description": "은퇴 후 월 생활비 후보 (만원 단위)"},
+        "additional_savings": {"type": "array", "items": {"type": "integer"}, "description": "월 추가 저축액 후보 (만원 단위)"},
+        "retirement_ages": {"type": "array", "items": {"type": "integer"}, "description": "은퇴 나이 후보"},
+        "life_expectancies": {"type": "array", "items": {"type": "integer"}, "description": "기대수명 후보"},
+        "product_types": {"type": "array", "items": {"type": "string"}, "description": "수익률 분포에 사용할 상품 유형 (생략 시 위험 선호도 기준)"}
+    },
+    required=["user_age"]
+)
+tool_registry.register(
+    "analyze_pension_performance",
+    "연금 상품의 성과를 분석하고 인사이트를 제공합니다. 여러 API 데이터를 조합하여 종합적인 분석을 수행합니다.",
+    analyze_pension_performance,
+    {
+        "analysis_type": {
+            "type": "string",
+            "description": "분석 유형 ('company_comparison', 'product_ranking', 'cost_analysis', 'trend_analysis')",
+            "enum": ["company_comparison", "product_ranking", "cost_analysis", "trend_analysis"]
+        },
+        "search_year": {"type": "string", "description": "분석 대상 연도 (예: '2023')"},
+        "search_quarter": {"type": "string", "description": "분석 대상 분기 (예: '4')"}
+    },
+    required=["analysis_type"]
+)
+tool_registry.register(
+    "batch_query",
+    "여러 도구 호출을 한 번에 동시 실행하여 결과를 함께 반환합니다. 항목별 실패는 해당 항목의 error로 표시됩니다.",
+    batch_query,
+    {
+        "queries": {
+            "type": "array",
+            "description": f"실행할 도구 호출 목록 (최대 {BATCH_MAX_QUERIES}개, batch_query 제외). 응답 옵션(fields, limit, summary)은 최상위에 지정하면 모든 결과에 적용",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "tool": {"type": "string", "description": "도구 이름 (예: 'get_retirement_pension_cost')"},
+                    "arguments": {"type": "object", "description": "도구 인자"}
+                },
+                "required": ["tool"]
+            }
+        }
+    },
+    required=["queries"]
+)
+tool_registry.register(
+    "generate_pension_recommendation",
+    "사용자의 조건에 맞는 연금 상품 추천을 생성합니다.",
+    generate_pension_recommendation,
+    {
+        "user_age": {"type": "integer", "description": "사용자 나이"},
+        "monthly_income": {"type": "integer", "description": "월 소득 (만원 단위)"},
+        "risk_preference": RISK_PREFERENCE_ARG,
+        "target_retirement_age": {"type": "integer", "description": "목표 은퇴 나이"},
+        "current_pension_amount": {"type": "integer", "description": "현재 연금 적립액 (만원 단위)"}
+    },
+    required=["user_age", "monthly_income", "risk_preference"]
+)
+
+@app.list_tools()
+async def list_tools() -> List[Tool]:
+    """사용 가능한 도구 목록 반환 (등록 시 만든 목록 그대로)"""
+    return tool_registry.tools
+
+_tool_workers = asyncio.Semaphore(MCP_WORKERS)
+
+@app.call_tool()
+async def call_tool(name: str, arguments: dict) -> List[TextContent]:
+    """도구 호출 처리 (전체 세션 합산 동시 실행 수를 MCP_WORKERS로 제한)"""
+    async with _tool_workers:
+        return await _call_tool(name, arguments)
+
+async def _call_tool(name: str, arguments: dict) -> List[TextContent]:
+    """도구 실행 (레지스트리 조회 → 인자·응답 옵션 검사 → 처리 함수 → 응답 압축)"""
+    try:
+        tool_registry.get(name)
+        shaper = ResponseShaper.from_arguments(name, arguments)
+        result = await tool_registry.call(name, arguments)
+        text = format_response(result, name, shaper=shaper)
+    except UnknownToolError as e:
+        text = str(e)
+    except (ToolArgumentError, InvalidResponseOptionError) as e:
+        text = f"오류 발생: {str(e)}"
+    except Exception as e:
+        logger.error(f"도구 호출 오류 ({name}): {e}")
+        text = f"오류 발생: {str(e)}"
+    return [TextContent(type="text", text=text)]
+
+def _initialization_options() -> InitializationOptions:
+    return InitializationOptions(
+        server_name="fss-pension-server",
+        server_version="1.0.0",
+        capabilities=ServerCapabilities(
+            tools={},
+            resources=ResourcesCapability(subscribe=True, listChanged=True)
+        ),
+    )
+
+async def run_stdio():
+    """stdio 전송으로 실행 (MCP 클라이언트가 프로세스를 직접 실행)"""
+    async with stdio_server() as (read_stream, write_stream):
+        await app.run(read_stream, write_stream, _initialization_options())
+
+class SseSessions:
+    """SSE 전송과 열린 세션 목록
+    
+    세션마다 요청 전달 스트림을 하나 더 두고(전송 → 세션 스트림 → MCP 서버),
+    그 송신 쪽을 직접 관리하여 종료 시 세션을 닫습니다.
+    """
+    
+    def __init__(self, endpoint: str = "/messages"):
+        self.transport = SseServerTransport(endpoint)
+        self._writers: set = set()  # 열린 세션의 요청 전달 스트림 (송신 쪽)
+    
+    @property
+    def active(self) -> int:
+        return len(self._writers)
+    
+    async def handle_sse(self, scope, receive, send):
+        """ASGI: 새 세션 연결 후 MCP 서버 실행"""
+        async with self.transport.connect_sse(scope, receive, send) as (read_stream, write_stream):
+            writer, reader = anyio.create_memory_object_stream(0)
+            self._writers.add(writer)
+            
+            async def forward():
+                try:
+                    async with writer:
+                        async for message in read_stream:
+                            await writer.send(message)
+                except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                    pass  # close_all()로 닫힌 세션
+            
+            try:
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(forward)
+                    await app.run(reader, write_stream, _initialization_options())
+                    tg.cancel_scope.cancel()
+            finally:
+                self._writers.discard(writer)
+    
+    async def handle_messages(self, scope, receive, send):
+        """ASGI: 클라이언트 요청을 세션으로 전달"""
+        await self.transport.handle_post_message(scope, receive, send)
+    
+    def close_all(self):
+        """열린 세션의 요청 전달 스트림을 닫아 진행 중인 요청 처리 후 세션 종료"""
+        for writer in list(self._writers):
+            writer.close()
+
+class ASGIEndpoint:
+    """응답을 직접 보내는 ASGI 핸들러를 Starlette 라우트에 연결 (Response 반환 없이)"""
+    
+    def __init__(self, handler):
+        self.handler = handler
+    
+    async def __call__(self, scope, receive, send):
+        await self.handler(scope, receive, send)
+
+def create_sse_app(sessions: SseSessions):
+    """SSE 전송 ASGI 앱 (GET /sse로 세션 연결, POST /messages로 요청 전달, GET /health 상태 확인)
+    
+    모든 세션이 같은 FSS 클라이언트(get_fss_server(): 응답 캐시, 연결 풀, 이력 저장소)를 공유합니다.
+    """
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+    
+    async def health(request):
+        return JSONResponse({
+            "status": "healthy",
+            "sessions": sessions.active,
+            "cache": get_fss_server().cache.stats()
+        })
+    
+    return Starlette(routes=[
+        Route("/sse", endpoint=ASGIEndpoint(sessions.handle_sse)),
+        Route("/messages", endpoint=ASGIEndpoint(sessions.handle_messages), methods=["POST"]),
+        Route("/health", endpoint=health),
+    ])
+
+def create_sse_server(sessions: SseSessions, host: str = MCP_HOST, port: int = MCP_PORT,
+                      on_shutdown: Optional[Callable[[], Awaitable[None]]] = None):
+    """SSE 전송 uvicorn 서버 (serve()로 실행, should_exit = True로 종료)
+    
+    종료는 uvicorn의 종료 과정을 그대로 따릅니다 (SIGINT/SIGTERM 수신 또는 should_exit 설정).
+    새 연결을 받지 않고 열린 세션을 닫은 뒤 남은 연결을 MCP_SHUTDOWN_TIMEOUT까지 기다리고,
+    마지막으로 on_shutdown을 실행합니다 (uvicorn이 받은 신호를 다시 보내기 전에 정리되도록).
+    """
+    import uvicorn
+    
+    class SseServer(uvicorn.Server):
+        async def shutdown(self, sockets=None):
+            sessions.close_all()
+            try:
+                await super().shutdown(sockets)
+            finally:
+                if on_shutdown is not None:
+                    await on_shutdown()
+    
+    config = uvicorn.Config(
+        create_sse_app(sessions), host=host, port=port,
+        timeout_graceful_shutdown=MCP_SHUTDOWN_TIMEOUT, log_level="info"
+    )
+    return SseServer(config)
+
+async def run_sse(host: str = MCP_HOST, port: int = MCP_PORT,
+                  on_shutdown: Optional[Callable[[], Awaitable[None]]] = None):
+    """SSE 전송으로 실행 (하나의 프로세스가 여러 클라이언트 세션을 처리)
+    
+    세션 상태와 캐시가 프로세스 메모리에 있으므로 단일 프로세스로 실행하며,
+    동시 처리량은 MCP_WORKERS(도구 호출 동시 실행 수)로 조절합니다.
+    """
+    logger.info(f"MCP SSE 서버 시작: http://{host}:{port}/sse (도구 동시 실행 {MCP_WORKERS})")
+    await create_sse_server(SseSessions(), host, port, on_shutdown).serve()
+
 async def main():
-    """MCP 서버 실행"""
+    """MCP 서버 실행 (FSS_MCP_TRANSPORT=sse면 HTTP/SSE, 아니면 stdio)"""
+    server = get_fss_server()
+    # FSS 데이터 사전 갱신 스케줄러 (도구 호출이 업스트림 지연을 겪지 않도록)
+    refresh_scheduler = RefreshScheduler(server)
+    if REFRESH_ENABLED:
+        refresh_scheduler.start()
+    # 과거 분기 이력 백필 (이미 저장된 기간은 건너뜀)
+    history_backfill = server.history_backfill()
+    if history_backfill and BACKFILL_ENABLED:
+        history_backfill.start()
+    
+    closed = False
+    
+    async def close():
+        nonlocal closed
+        if closed:
+            return
+        closed = True
+        await refresh_scheduler.stop()
+        if history_backfill:
+            await history_backfill.stop()
+        await resource_notifier.close()
+        await server.close()
+        await close_http_clients()
+        logger.info("MCP 서버 종료")
+    
     try:
-        async with stdio_server() as (read_stream, write_stream):
-            await app.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="fss-pension-server",
-                    server_version="1.0.0",
-                    capabilities=ServerCapabilities(
-                        tools={}
-                    ),
-                ),
-            )
+        if MCP_TRANSPORT == "sse":
+            await run_sse(on_shutdown=close)
+        else:
+            await run_stdio()
     finally:
-        await fss_server.close()
+        await close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        raise SystemExit(128 + signal.SIGINT)
 
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+FSS 분기별 이력 저장소 (SQLite)
+
+연금저축 회사/상품, 퇴직연금 수익률/총비용 부담률 데이터를 연도·분기별로
+회사·상품 식별자 기준 시계열로 보관합니다. 과거 분기는 동시 실행 수를 제한한
+백필로 한 번만 내려받고, 다년간 추이 조회는 업스트림 호출 없이 로컬 데이터로 처리합니다.
+저장 시 표기가 바뀐 회사·상품명도 같은 엔티티 ID로 이어 붙이므로 분기 간 비교는 ID 조인으로 처리하며,
+직전 기간 대비 변화는 저장할 때 한 번 계산해 둡니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from fss_pension_common.quarter_diff import company_rank_moves, product_diff
+from fss_pension_common.refresh import last_quarter_end
+
+from identity import IdentityIndex, identity_key
+
+logger = logging.getLogger(__name__)
+
+# 저장 경로 (빈 문자열이면 이력 저장소 비활성화)
+DEFAULT_HISTORY_PATH = os.getenv(
+    "FSS_HISTORY_PATH",
+    str(Path(__file__).resolve().parent / "data" / "fss_history.db")
+)
+# 백필 시작 연도
+HISTORY_START_YEAR = int(os.getenv("FSS_HISTORY_START_YEAR", "2019"))
+# 백필 동시 실행 수
+BACKFILL_CONCURRENCY = int(os.getenv("FSS_BACKFILL_CONCURRENCY", "4"))
+# 서버 시작 시 백필 실행 여부 (기본 비활성화, 업스트림 호출이 많으므로 필요할 때만 사용)
+BACKFILL_ENABLED = os.getenv("FSS_BACKFILL_ENABLED", "0").lower() in ("1", "true", "yes")
+# 백필 한 번에 조회하는 최대 기간 수 (최근 기간부터, 나머지는 다음 실행에서)
+BACKFILL_MAX_PER_RUN = int(os.getenv("FSS_BACKFILL_MAX_PER_RUN", "20"))
+# 빈 응답·실패한 기간을 다시 조회하기까지의 대기 시간 (초)
+BACKFILL_RETRY_AFTER = float(os.getenv("FSS_BACKFILL_RETRY_AFTER", str(7 * 24 * 60 * 60)))
+
+# 이력 대상 엔드포인트: 엔드포인트 → (식별 필드, 분기 단위 여부)
+# 분기 단위가 아닌 엔드포인트는 연도 단위로 조회하며 분기는 0으로 기록
+HISTORY_ENDPOINTS: Dict[str, Tuple[Tuple[str, ...], bool]] = {
+    "psCorpList.json": (("area", "company"), True),
+    "psProdList.json": (("company", "product"), True),
+    "rpCorpResultList.json": (("company", "sysType"), True),
+    "rpCorpBurdenRatioList.json": (("company", "sysType"), False),
+}
+
+# 표기 변경을 유사도로 이어 붙일 식별 필드 (나머지 식별 필드는 정규화 후 정확히 일치해야 함)
+FUZZY_FIELDS: Dict[str, str] = {
+    "psCorpList.json": "company",
+    "psProdList.json": "product",
+    "rpCorpResultList.json": "company",
+    "rpCorpBurdenRatioList.json": "company",
+}
+
+FetchFunc = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+# 직전 기간 대비 변화를 계산하는 엔드포인트 → 변화 계산 함수
+DIFF_ENDPOINTS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "psProdList.json": product_diff,
+    "psCorpList.json": company_rank_moves,
+}
+
+# 저장 형식 버전 (이전 형식의 이력은 백필로 다시 채울 수 있으므로 버전이 바뀌면 새로 만듦)
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    key TEXT NOT NULL,
+    label TEXT NOT NULL,
+    last_period INTEGER NOT NULL,
+    UNIQUE (endpoint, key)
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    endpoint TEXT NOT NULL,
+    alias TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    PRIMARY KEY (endpoint, alias)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS observations (
+    entity_id INTEGER NOT NULL,
+    period INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (entity_id, period)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS diffs (
+    endpoint TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    previous INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (endpoint, period)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS periods (
+    endpoint TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (endpoint, period)
+);
+CREATE TABLE IF NOT EXISTS backfill_attempts (
+    endpoint TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempted_at REAL NOT NULL,
+    PRIMARY KEY (endpoint, period)
+) WITHOUT ROWID;
+"""
+
+
+def period_of(year: Any, quarter: Any = None) -> int:
+    """연도·분기 → 정렬 가능한 기간 값 (예: 2023년 4분기 → 20234, 연도 단위 → 20230)"""
+    return int(year) * 10 + int(quarter or 0)
+
+
+def split_period(period: int) -> Tuple[str, str]:
+    """기간 값 → (연도, 분기) 문자열 (연도 단위면 분기는 빈 문자열)"""
+    year, quarter = divmod(int(period), 10)
+    return str(year), str(quarter) if quarter else ""
+
+
+def entity_key(endpoint: str, row: Dict[str, Any]) -> str:
+    """행의 정규화된 회사·상품 식별자"""
+    fields, _ = HISTORY_ENDPOINTS[endpoint]
+    return identity_key(fields, row)
+
+
+class HistoryStore:
+    """SQLite 기반 FSS 분기별 이력 저장소
+
+    entities: 엔티티(회사·상품)별 안정적인 ID와 가장 최근 표기
+    aliases: 관측된 정규화 식별자 → 엔티티 ID (표기가 바뀌어도 같은 ID로 연결)
+    observations: 엔티티·기간별 원본 행 (공백 없는 JSON)
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.executescript(
+                    "DROP TABLE IF EXISTS observations; DROP TABLE IF EXISTS aliases; DROP TABLE IF EXISTS diffs;"
+                    "DROP TABLE IF EXISTS entities; DROP TABLE IF EXISTS periods;"
+                )
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        # 엔드포인트별 식별자 해시 색인 (처음 사용할 때 로드, 저장 시 갱신)
+        self._indexes: Dict[str, IdentityIndex] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10.0)
+
+    def _index(self, conn: sqlite3.Connection, endpoint: str) -> IdentityIndex:
+        index = self._indexes.get(endpoint)
+        if index is None:
+            fields, _ = HISTORY_ENDPOINTS[endpoint]
+            index = IdentityIndex(
+                fields,
+                FUZZY_FIELDS.get(endpoint),
+                aliases=dict(conn.execute(
+                    "SELECT alias, entity_id FROM aliases WHERE endpoint = ?", (endpoint,)
+                ).fetchall()),
+                entity_keys=dict(conn.execute(
+                    "SELECT id, key FROM entities WHERE endpoint = ?", (endpoint,)
+                ).fetchall())
+            )
+            self._indexes[endpoint] = index
+        return index
+
+    def identity_index(self, endpoint: str) -> IdentityIndex:
+        """엔드포인트의 식별자 해시 색인"""
+        with self._lock, closing(self._connect()) as conn:
+            return self._index(conn, endpoint)
+
+    def ingest(self, endpoint: str, year: Any, quarter: Any, rows: Iterable[Dict[str, Any]]) -> int:
+        """한 기간의 데이터 저장 (같은 기간의 기존 데이터는 교체), 저장한 행 수 반환"""
+        fields, _ = HISTORY_ENDPOINTS[endpoint]
+        period = period_of(year, quarter)
+
+        records = [
+            (row, json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+            for row in rows
+        ]
+
+        with self._lock, closing(self._connect()) as conn:
+            index = self._index(conn, endpoint)
+            assigned = index.assign([entity_key(endpoint, row) for row, _ in records])
+            ids: List[int] = []
+            new_aliases: Dict[int, List[str]] = {}
+            for (key, entity_id), (row, _) in zip(assigned, records):
+                label = json.dumps({field: row.get(field) for field in fields}, ensure_ascii=False)
+                if entity_id is None:
+                    cursor = conn.execute(
+                        "INSERT INTO entities (endpoint, key, label, last_period) VALUES (?, ?, ?, ?)",
+                        (endpoint, key, label, period)
+                    )
+                    entity_id = cursor.lastrowid
+                else:
+                    # 가장 최근 기간의 표기를 대표 이름으로 사용
+                    conn.execute(
+                        "UPDATE entities SET label = ?, last_period = ? WHERE id = ? AND last_period <= ?",
+                        (label, period, entity_id, period)
+                    )
+                if index.get(key) is None:
+                    new_aliases.setdefault(entity_id, []).append(key)
+                ids.append(entity_id)
+            conn.executemany(
+                "INSERT OR IGNORE INTO aliases (endpoint, alias, entity_id) VALUES (?, ?, ?)",
+                [(endpoint, key, entity_id) for entity_id, keys in new_aliases.items() for key in keys]
+            )
+            conn.execute(
+                "DELETE FROM observations WHERE period = ? AND entity_id IN "
+                "(SELECT id FROM entities WHERE endpoint = ?)",
+                (period, endpoint)
+            )
+            conn.executemany(
+                "INSERT INTO observations (entity_id, period, data) VALUES (?, ?, ?)",
+                [(entity_id, period, data) for entity_id, (_, data) in zip(ids, records)]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO periods (endpoint, period, row_count, ingested_at) VALUES (?, ?, ?, ?)",
+                (endpoint, period, len(records), time.time())
+            )
+            conn.commit()
+            for entity_id, keys in new_aliases.items():
+                index.add(entity_id, keys)
+
+            if endpoint in DIFF_ENDPOINTS:
+                # 이 기간과, 이 기간을 직전 기간으로 삼는 다음 기간의 변화를 다시 계산
+                periods = self.periods(endpoint)
+                position = periods.index(period)
+                for target in periods[position:position + 2]:
+                    self._compute_diff(endpoint, target, periods)
+        return len(records)
+
+    def _compute_diff(self, endpoint: str, period: int, periods: List[int]) -> Optional[Dict[str, Any]]:
+        """직전 저장 기간 대비 변화 계산 후 저장 (직전 기간이 없으면 None)"""
+        earlier = [p for p in periods if p < period]
+        if not earlier:
+            return None
+        previous = earlier[-1]
+        diff = DIFF_ENDPOINTS[endpoint](self.join(endpoint, previous, period))
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO diffs (endpoint, period, previous, data) VALUES (?, ?, ?, ?)",
+                (endpoint, period, previous, json.dumps(diff, ensure_ascii=False, separators=(",", ":")))
+            )
+            conn.commit()
+        return {"period": period, "previous": previous, **diff}
+
+    def diff(self, endpoint: str, period: int) -> Optional[Dict[str, Any]]:
+        """직전 저장 기간 대비 변화 {"period", "previous", ...} (저장된 값이 없으면 계산, 비교할 기간이 없으면 None)"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT previous, data FROM diffs WHERE endpoint = ? AND period = ?", (endpoint, period)
+            ).fetchone()
+        if row is not None:
+            return {"period": period, "previous": row[0], **json.loads(row[1])}
+        with self._lock:
+            periods = self.periods(endpoint)
+            if period not in periods:
+                return None
+            return self._compute_diff(endpoint, period, periods)
+
+    def resolve(self, endpoint: str, row: Dict[str, Any]) -> Optional[int]:
+        """행(식별 필드 포함 dict) → 엔티티 ID (해시 조회, 없으면 None)"""
+        return self.identity_index(endpoint).get(entity_key(endpoint, row))
+
+    def periods(self, endpoint: str) -> List[int]:
+        """저장된 기간 목록 (오름차순)"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT period FROM periods WHERE endpoint = ? ORDER BY period", (endpoint,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def record_attempt(self, endpoint: str, period: int, status: str):
+        """저장하지 못한 백필 시도 기록 (status: 'empty' 또는 'failed')"""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO backfill_attempts (endpoint, period, status, attempted_at) VALUES (?, ?, ?, ?)",
+                (endpoint, period, status, time.time())
+            )
+            conn.commit()
+
+    def attempted_periods(self, endpoint: str, since: float) -> Set[int]:
+        """since(유닉스 시각) 이후 백필을 시도했지만 저장하지 못한 기간"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT period FROM backfill_attempts WHERE endpoint = ? AND attempted_at >= ?", (endpoint, since)
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def labels(self, endpoint: str, entity_ids: Optional[Sequence[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """엔티티 ID → 가장 최근 표기의 식별 필드"""
+        query = "SELECT id, label FROM entities WHERE endpoint = ?"
+        args: List[Any] = [endpoint]
+        if entity_ids is not None:
+            if not entity_ids:
+                return {}
+            query += f" AND id IN ({','.join('?' * len(entity_ids))})"
+            args.extend(entity_ids)
+        with closing(self._connect()) as conn:
+            return {entity_id: json.loads(label) for entity_id, label in conn.execute(query, args)}
+
+    def snapshot(self, endpoint: str, period: int) -> Dict[int, Dict[str, Any]]:
+        """한 기간의 엔티티 ID → 원본 행"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT o.entity_id, o.data FROM observations o "
+                "JOIN entities e ON e.id = o.entity_id WHERE e.endpoint = ? AND o.period = ?",
+                (endpoint, period)
+            ).fetchall()
+        return {entity_id: json.loads(data) for entity_id, data in rows}
+
+    def join(self, endpoint: str, before: int, after: int) -> Dict[int, Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """두 기간의 엔티티 ID 기준 완전 외부 조인 {엔티티 ID: (이전 행, 이후 행)}"""
+        old = self.snapshot(endpoint, before)
+        new = self.snapshot(endpoint, after)
+        return {entity_id: (old.get(entity_id), new.get(entity_id)) for entity_id in old.keys() | new.keys()}
+
+    def series(self, endpoint: str, entity_ids: Optional[Sequence[int]] = None,
+               start: Optional[int] = None, end: Optional[int] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """엔티티 ID별 시계열 {엔티티 ID: [{"period": 기간, ...필드}, ...]} (기간 오름차순)"""
+        query = (
+            "SELECT o.entity_id, o.period, o.data FROM observations o "
+            "JOIN entities e ON e.id = o.entity_id WHERE e.endpoint = ?"
+        )
+        args: List[Any] = [endpoint]
+        if entity_ids is not None:
+            if not entity_ids:
+                return {}
+            query += f" AND o.entity_id IN ({','.join('?' * len(entity_ids))})"
+            args.extend(entity_ids)
+        if start is not None:
+            query += " AND o.period >= ?"
+            args.append(start)
+        if end is not None:
+            query += " AND o.period <= ?"
+            args.append(end)
+        query += " ORDER BY o.entity_id, o.period"
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, args).fetchall()
+
+        result: Dict[int, List[Dict[str, Any]]] = {}
+        for entity_id, period, data in rows:
+            result.setdefault(entity_id, []).append({"period": period, **json.loads(data)})
+        return result
+
+    def entity_series(self, endpoint: str, row: Dict[str, Any],
+                      start: Optional[int] = None, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """행이 가리키는 회사·상품의 기간별 관측값 (표기가 바뀐 기간 포함)"""
+        entity_id = self.resolve(endpoint, row)
+        if entity_id is None:
+            return []
+        return self.series(endpoint, [entity_id], start, end).get(entity_id, [])
+
+    def period_summary(self, endpoint: str, metrics: Optional[Sequence[str]] = None,
+                       start: Optional[int] = None, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """기간별 집계 (건수, 지표별 평균/최소/최대), metrics가 None이면 숫자 필드 전체"""
+        totals: Dict[int, Dict[str, List[float]]] = {}
+        counts: Dict[int, int] = {}
+        for observations in self.series(endpoint, start=start, end=end).values():
+            for obs in observations:
+                period = obs["period"]
+                counts[period] = counts.get(period, 0) + 1
+                bucket = totals.setdefault(period, {})
+                if metrics is None:
+                    values = {k: v for k, v in obs.items()
+                              if k != "period" and isinstance(v, (int, float)) and not isinstance(v, bool)}
+                else:
+                    values = {metric: obs.get(metric) for metric in metrics}
+                for metric, value in values.items():
+                    try:
+                        bucket.setdefault(metric, []).append(float(value))
+                    except (TypeError, ValueError):
+                        continue
+
+        summary = []
+        for period in sorted(counts):
+            year, quarter = split_period(period)
+            item: Dict[str, Any] = {"year": year, "quarter": quarter, "count": counts[period]}
+            for metric, values in totals[period].items():
+                if values:
+                    item[metric] = {
+                        "avg": round(sum(values) / len(values), 4),
+                        "min": min(values),
+                        "max": max(values)
+                    }
+            summary.append(item)
+        return summary
+
+    async def aingest(self, endpoint: str, year: Any, quarter: Any, rows: List[Dict[str, Any]]) -> int:
+        """기간 데이터 저장 (이벤트 루프 비차단, 실패 시 0)"""
+        try:
+            return await asyncio.to_thread(self.ingest, endpoint, year, quarter, rows)
+        except Exception as e:
+            logger.warning(f"이력 저장 실패 ({endpoint} {year}/{quarter}): {e}")
+            return 0
+
+
+def backfill_targets(endpoints: Iterable[str] = HISTORY_ENDPOINTS,
+                     start_year: int = HISTORY_START_YEAR,
+                     today: Optional[date] = None) -> List[Tuple[str, str, str]]:
+    """백필 대상 (엔드포인트, 연도, 분기) 목록 - 시작 연도부터 가장 최근에 끝난 분기까지"""
+    last = last_quarter_end(today or date.today())
+    last_quarter = (last.month - 1) // 3 + 1
+    targets = []
+    for endpoint in endpoints:
+        _, quarterly = HISTORY_ENDPOINTS[endpoint]
+        for year in range(start_year, last.year + 1):
+            if not quarterly:
+                targets.append((endpoint, str(year), ""))
+                continue
+            for quarter in range(1, 5):
+                if (year, quarter) > (last.year, last_quarter):
+                    break
+                targets.append((endpoint, str(year), str(quarter)))
+    return targets
+
+
+class HistoryBackfill:
+    """과거 분기 데이터 백필
+
+    fetch(endpoint, params)는 FSS 응답 dict를 반환해야 합니다.
+    이미 저장된 기간과 retry_after 안에 빈 응답·실패로 끝난 기간은 건너뛰고,
+    한 번에 최근 기간부터 max_per_run개까지만 동시 실행 수를 제한하여 조회합니다.
+    """
+
+    def __init__(self, store: HistoryStore, fetch: FetchFunc,
+                 concurrency: int = BACKFILL_CONCURRENCY,
+                 start_year: int = HISTORY_START_YEAR,
+                 max_per_run: int = BACKFILL_MAX_PER_RUN,
+                 retry_after: float = BACKFILL_RETRY_AFTER):
+        self.store = store
+        self.fetch = fetch
+        self.concurrency = concurrency
+        self.start_year = start_year
+        self.max_per_run = max_per_run
+        self.retry_after = retry_after
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Dict[str, Any] = {}
+
+    async def run(self, endpoints: Iterable[str] = HISTORY_ENDPOINTS, skip_existing: bool = True) -> Dict[str, Any]:
+        """백필 실행, 결과 통계 반환"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        since = time.time() - self.retry_after
+        skipped: Dict[str, Set[int]] = {}
+        for endpoint in endpoints:
+            skipped[endpoint] = set()
+            if skip_existing:
+                skipped[endpoint] |= set(await asyncio.to_thread(self.store.periods, endpoint))
+                skipped[endpoint] |= await asyncio.to_thread(self.store.attempted_periods, endpoint, since)
+        pending = [
+            (endpoint, year, quarter)
+            for endpoint, year, quarter in backfill_targets(endpoints, self.start_year)
+            if period_of(year, quarter) not in skipped[endpoint]
+        ]
+        # 최근 기간부터 (같은 기간이면 엔드포인트 순서대로)
+        pending.sort(key=lambda target: period_of(target[1], target[2]), reverse=True)
+        targets = pending[:self.max_per_run]
+
+        async def run_one(endpoint: str, year: str, quarter: str) -> str:
+            params = {"year": year}
+            if quarter:
+                params["quarter"] = quarter
+            async with semaphore:
+                try:
+                    data = await self.fetch(endpoint, params)
+                except Exception as e:
+                    logger.warning(f"이력 백필 실패 ({endpoint} {year}/{quarter}): {e}")
+                    await asyncio.to_thread(self.store.record_attempt, endpoint, period_of(year, quarter), "failed")
+                    return "failed"
+            if not isinstance(data, dict) or data.get("code") != "000" or not data.get("list"):
+                # 아직 공시되지 않았거나 제공되지 않는 기간은 retry_after가 지난 뒤 다시 시도
+                await asyncio.to_thread(self.store.record_attempt, endpoint, period_of(year, quarter), "empty")
+                return "empty"
+            await self.store.aingest(endpoint, year, quarter, data["list"])
+            return "ingested"
+
+        results = await asyncio.gather(*(run_one(*target) for target in targets))
+        self.last_run = {
+            "total": len(targets),
+            "remaining": len(pending) - len(targets),
+            "ingested": results.count("ingested"),
+            "empty": results.count("empty"),
+            "failed": results.count("failed")
+        }
+        logger.info(f"FSS 이력 백필 완료: {self.last_run}")
+        return self.last_run
+
+    def start(self):
+        """백그라운드에서 백필 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+            logger.info("FSS 이력 백필 시작")
+
+    async def stop(self):
+        """백필 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"FSS 이력 백필 오류: {e}")
+            self._task = None
+
+
+# 프로세스 전역 공유 저장소
+_shared_store: Optional[HistoryStore] = None
+
+
+def get_shared_history_store() -> Optional[HistoryStore]:
+    """프로세스 전역 이력 저장소 반환 (경로 미설정 또는 초기화 실패 시 None)"""
+    global _shared_store
+    if _shared_store is None and DEFAULT_HISTORY_PATH:
+        try:
+            _shared_store = HistoryStore(DEFAULT_HISTORY_PATH)
+        except Exception as e:
+            logger.warning(f"이력 저장소 초기화 실패, 비활성화: {e}")
+            return None
+    return _shared_store
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+분기 간 회사·상품 식별자 매칭
+
+FSS 공시의 회사명/상품명은 분기마다 표기가 조금씩 바뀝니다 ((주) 표기, 띄어쓰기, 영문 대소문자 등).
+이력 저장 시 식별 필드를 정규화한 식별자로 안정적인 엔티티 ID를 부여하고,
+정규화 후에도 일치하지 않는 이름은 같은 회사(·제도 유형) 안에서 자모 n-gram 유사도로 이어 붙입니다.
+정규화 식별자 → 엔티티 ID 해시 색인을 유지하므로 분기 간 조인은 이름 비교 없이 ID 조회로 끝납니다.
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from fss_pension_common.name_index import NameIndex, normalize_name
+
+# 표기 변경으로 간주할 최소 이름 유사도
+IDENTITY_MIN_SCORE = float(os.getenv("FSS_IDENTITY_MIN_SCORE", "0.85"))
+
+# 식별 필드 값 구분자
+KEY_SEPARATOR = "\x1f"
+# 한 기간에 같은 식별자가 여러 번 나올 때 붙이는 순번 구분자 (정규화 이름에는 나오지 않는 문자)
+DUPLICATE_MARK = "#"
+
+_DIGITS = re.compile(r"\d+")
+
+
+def identity_key(fields: Sequence[str], row: Dict[str, Any]) -> str:
+    """행의 정규화 식별자 (식별 필드별 정규화 값을 구분자로 연결)"""
+    return KEY_SEPARATOR.join(normalize_name(str(row.get(field) or "")) for field in fields)
+
+
+def _digits(name: str) -> List[str]:
+    """이름에 포함된 숫자 (예: 연금저축 1호/2호는 표기가 비슷해도 다른 상품)"""
+    return _DIGITS.findall(name)
+
+
+class IdentityIndex:
+    """엔드포인트 하나의 정규화 식별자(별칭) → 엔티티 ID 해시 색인
+
+    aliases: 지금까지 관측된 모든 정규화 식별자 → 엔티티 ID
+    entity_keys: 엔티티 ID → 처음 관측된 정규화 식별자
+    fuzzy_field: 유사도로 이어 붙일 식별 필드 (나머지 식별 필드는 정확히 일치해야 함)
+    """
+
+    def __init__(self, fields: Sequence[str], fuzzy_field: Optional[str] = None,
+                 aliases: Optional[Dict[str, int]] = None,
+                 entity_keys: Optional[Dict[int, str]] = None):
+        self.fields = tuple(fields)
+        self.fuzzy_position = self.fields.index(fuzzy_field) if fuzzy_field in self.fields else None
+        self.aliases: Dict[str, int] = dict(aliases or {})
+        self.entity_keys: Dict[int, str] = dict(entity_keys or {})
+
+    def get(self, key: str) -> Optional[int]:
+        """정규화 식별자 → 엔티티 ID"""
+        return self.aliases.get(key)
+
+    def add(self, entity_id: int, keys: Sequence[str]):
+        """엔티티와 별칭 등록"""
+        for key in keys:
+            self.entity_keys.setdefault(entity_id, key)
+            self.aliases.setdefault(key, entity_id)
+
+    def _split(self, key: str) -> Tuple[Tuple[str, ...], str]:
+        """식별자 → (유사도 비교 대상이 아닌 필드 값, 유사도 비교 이름)"""
+        parts = key.split(KEY_SEPARATOR)
+        name = parts.pop(self.fuzzy_position)
+        return tuple(parts), name
+
+    def assign(self, keys: Sequence[str]) -> List[Tuple[str, Optional[int]]]:
+        """한 기간의 식별자 목록 → (식별자, 엔티티 ID) 목록 (새 엔티티는 None)
+
+        1) 별칭 해시 조회로 정확히 일치하는 엔티티 연결
+           (같은 식별자나 같은 엔티티가 한 기간에 다시 나오면 순번을 붙인 식별자로 조회)
+        2) 남은 식별자는 이번 기간에 아직 연결되지 않은 같은 그룹 엔티티 중
+           이름 유사도가 IDENTITY_MIN_SCORE 이상이고 숫자 표기가 같은 후보가 하나뿐일 때만 연결
+        """
+        claimed: Set[int] = set()
+        used: Set[str] = set()
+        result: List[Tuple[str, Optional[int]]] = []
+        for key in keys:
+            base, suffix = key, 2
+            entity_id = self.aliases.get(key)
+            while key in used or entity_id in claimed:
+                key = f"{base}{DUPLICATE_MARK}{suffix}"
+                suffix += 1
+                entity_id = self.aliases.get(key)
+            used.add(key)
+            if entity_id is not None:
+                claimed.add(entity_id)
+            result.append((key, entity_id))
+
+        pending = [i for i, (key, entity_id) in enumerate(result)
+                   if entity_id is None and DUPLICATE_MARK not in key]
+        if not pending or self.fuzzy_position is None:
+            return result
+
+        pools: Dict[Tuple[str, ...], Dict[str, int]] = {}
+        for entity_id, key in self.entity_keys.items():
+            if entity_id in claimed or DUPLICATE_MARK in key:
+                continue
+            group, name = self._split(key)
+            if name:
+                pools.setdefault(group, {})[name] = entity_id
+
+        indexes: Dict[Tuple[str, ...], NameIndex] = {}
+        for i in pending:
+            key = result[i][0]
+            group, name = self._split(key)
+            pool = pools.get(group)
+            if not name or not pool:
+                continue
+            index = indexes.get(group)
+            if index is None:
+                index = indexes[group] = NameIndex(pool)
+            matches = [
+                candidate for candidate in index.resolve(name, min_score=IDENTITY_MIN_SCORE)
+                if _digits(candidate) == _digits(name) and pool[candidate] not in claimed
+            ]
+            if len(matches) == 1:
+                result[i] = (key, pool[matches[0]])
+                claimed.add(pool[matches[0]])
+        return result
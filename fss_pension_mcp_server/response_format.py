@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+MCP 도구 응답 압축
+
+FSS 응답의 행 목록(list)에 필드 선택, 행 수 제한과 이어보기 커서, 서버 측 요약을 적용하고
+공백 없는 JSON(orjson이 설치되어 있으면 orjson)으로 직렬화합니다.
+직렬화 결과가 바이트·토큰 예산을 넘으면 행 수를 줄이고, 그래도 넘으면 요약으로 바꾸며,
+마지막으로 배열 항목 수와 문자열 길이를 줄인 JSON에 truncated 표시를 붙여 반환합니다.
+"""
+
+import base64
+import json
+import logging
+import math
+import os
+import zlib
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 행 목록별 기본 최대 행 수
+DEFAULT_ROW_LIMIT = int(os.getenv("FSS_RESPONSE_ROW_LIMIT", "50"))
+MAX_ROW_LIMIT = 1000
+# 도구 응답 예산 (직렬화 바이트, 추정 토큰)
+MAX_RESPONSE_BYTES = int(os.getenv("FSS_RESPONSE_MAX_BYTES", str(64 * 1024)))
+MAX_RESPONSE_TOKENS = int(os.getenv("FSS_RESPONSE_MAX_TOKENS", "12000"))
+# 요약 모드에서 범주형 필드로 취급하는 최대 고유값 수와 표시할 상위 값 수
+SUMMARY_MAX_CATEGORIES = 30
+SUMMARY_TOP_VALUES = 5
+# 예산 초과 시 구조 축소의 시작 값 (배열·객체 항목 수, 문자열 길이)
+TRUNCATE_MAX_ITEMS = 20
+TRUNCATE_MAX_CHARS = 200
+TRUNCATED_NOTE = "응답이 예산을 넘어 배열 항목과 문자열을 줄였습니다. fields, limit 또는 summary를 사용하세요"
+
+# 모든 도구에 공통으로 추가되는 응답 옵션
+RESPONSE_OPTIONS_SCHEMA: Dict[str, Dict[str, Any]] = {
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "행 목록에서 반환할 필드 (예: ['company', 'product', 'avgEarnRate3'])"
+    },
+    "limit": {
+        "type": "integer",
+        "description": f"행 목록별 최대 행 수 (기본 {DEFAULT_ROW_LIMIT}, 최대 {MAX_ROW_LIMIT})"
+    },
+    "cursor": {
+        "type": "string",
+        "description": "이전 응답의 next_cursor (같은 도구·인자로 다음 행 조회)"
+    },
+    "summary": {
+        "type": "boolean",
+        "description": "행 목록 대신 필드별 통계 요약 반환"
+    },
+}
+RESPONSE_OPTIONS = tuple(RESPONSE_OPTIONS_SCHEMA)
+
+
+class InvalidResponseOptionError(ValueError):
+    """형식이 맞지 않는 응답 옵션 (fields, limit, cursor, summary)"""
+
+
+class InvalidCursorError(InvalidResponseOptionError):
+    """해석할 수 없거나 현재 도구·인자와 맞지 않는 커서"""
+
+
+def dumps(value: Any) -> str:
+    """공백 없는 JSON 문자열 (한글 그대로, 직렬화할 수 없는 값은 문자열로)"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def estimate_tokens(text: str, size: Optional[int] = None) -> int:
+    """토큰 수 추정 (ASCII 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 1토큰)"""
+    size = len(text.encode("utf-8")) if size is None else size
+    non_ascii = (size - len(text)) // 2  # 한글은 UTF-8 3바이트
+    return math.ceil((len(text) - non_ascii) / 4) + non_ascii
+
+
+def query_fingerprint(tool: str, arguments: Mapping[str, Any]) -> str:
+    """도구·인자 지문 (커서가 다른 조회에 재사용되는 것을 방지, 응답 옵션은 제외)"""
+    raw = json.dumps([tool, {k: v for k, v in arguments.items() if k not in RESPONSE_OPTIONS}],
+                     sort_keys=True, ensure_ascii=False, default=str)
+    return format(zlib.crc32(raw.encode("utf-8")), "08x")
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> int:
+    """커서 → 다음 행 위치"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError(f"잘못된 커서: {e}")
+    if not isinstance(state, dict) or not isinstance(state.get("p"), int) or state["p"] < 0:
+        raise InvalidCursorError("잘못된 커서")
+    if state.get("q") != fingerprint:
+        raise InvalidCursorError("다른 도구·인자로 만든 커서입니다")
+    return state["p"]
+
+
+def _is_rows(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(row, dict) for row in value)
+
+
+def summarize_rows(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """행 목록 요약: 숫자 필드는 최소/평균/중앙값/최대, 범주형 필드는 상위 값 빈도"""
+    frame = pd.DataFrame(rows)
+    numeric: Dict[str, Dict[str, float]] = {}
+    categorical: Dict[str, Dict[str, int]] = {}
+    for column in frame.columns:
+        values = pd.to_numeric(frame[column], errors="coerce")
+        present = frame[column].notna() & (frame[column].astype(str) != "")
+        if present.any() and values[present].notna().all():
+            values = values.dropna()
+            numeric[column] = {
+                "min": round(float(values.min()), 4),
+                "mean": round(float(values.mean()), 4),
+                "median": round(float(values.median()), 4),
+                "max": round(float(values.max()), 4),
+            }
+            continue
+        counts = frame[column][present].astype(str).value_counts()
+        if 0 < len(counts) <= SUMMARY_MAX_CATEGORIES:
+            categorical[column] = {str(k): int(v) for k, v in counts.head(SUMMARY_TOP_VALUES).items()}
+    return {"rows": len(rows), "numeric": numeric, "categorical": categorical}
+
+
+class ResponseShaper:
+    """도구 응답 변환기 (도구 호출 하나당 하나)
+
+    응답 안의 모든 FSS 행 목록(list 키)에 같은 필드 선택·행 수를 적용합니다.
+    행 위치(offset)와 이어보기 커서는 주 행 목록(응답을 앞에서부터 훑을 때 처음 나오는 행 목록)에만 적용하고,
+    나머지 행 목록은 항상 처음부터 반환합니다.
+    """
+
+    def __init__(self, fields: Optional[Sequence[str]] = None, limit: Optional[int] = None,
+                 offset: int = 0, summary: bool = False, fingerprint: str = ""):
+        self.fields = list(fields) if fields else None
+        self.limit = min(max(int(limit), 1), MAX_ROW_LIMIT) if limit else DEFAULT_ROW_LIMIT
+        self.offset = offset
+        self.summary = summary
+        self.fingerprint = fingerprint
+        self.max_returned = 0  # 마지막 변환에서 행 목록별 최대 반환 행 수 (-1이면 행 목록 없음)
+        self._primary_seen = False
+
+    @classmethod
+    def from_arguments(cls, tool: str, arguments: Optional[Dict[str, Any]]) -> "ResponseShaper":
+        """도구 인자의 응답 옵션 검사 후 변환기 생성 (형식이 맞지 않으면 InvalidResponseOptionError)"""
+        if not isinstance(arguments, Mapping):
+            arguments = {}  # 인자 형식 오류는 도구 레지스트리에서 처리
+        fields = arguments.get("fields")
+        if fields is not None and (not isinstance(fields, list) or not all(isinstance(field, str) for field in fields)):
+            raise InvalidResponseOptionError(f"fields는 문자열 배열이어야 합니다: {fields!r}")
+        limit = arguments.get("limit")
+        if isinstance(limit, str) and limit.strip().isdigit():
+            limit = int(limit)
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int)):
+            raise InvalidResponseOptionError(f"limit은 정수여야 합니다: {limit!r}")
+        cursor = arguments.get("cursor")
+        if cursor is not None and not isinstance(cursor, str):
+            raise InvalidResponseOptionError(f"cursor는 문자열이어야 합니다: {cursor!r}")
+        summary = arguments.get("summary")
+        if summary is not None and not isinstance(summary, bool):
+            raise InvalidResponseOptionError(f"summary는 true 또는 false여야 합니다: {summary!r}")
+        fingerprint = query_fingerprint(tool, arguments)
+        offset = decode_cursor(cursor, fingerprint) if cursor else 0
+        return cls(fields, limit, offset, bool(summary), fingerprint)
+
+    def apply(self, result: Any) -> Any:
+        """응답 전체 변환 (변환마다 주 행 목록과 반환 행 수를 새로 셈)"""
+        self.max_returned = -1
+        self._primary_seen = False
+        return self.shape(result)
+
+    def _rows(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        rows = payload["list"]
+        primary = not self._primary_seen
+        self._primary_seen = True
+        self.max_returned = max(self.max_returned, 0)
+        shaped = {key: self.shape(value) for key, value in payload.items() if key != "list"}
+        if self.summary:
+            shaped["summary"] = summarize_rows(rows)
+            return shaped
+        offset = self.offset if primary else 0
+        window = rows[offset:offset + self.limit]
+        if self.fields:
+            window = [{field: row.get(field) for field in self.fields if field in row} for row in window]
+        shaped["list"] = window
+        shaped["total_rows"] = len(rows)
+        shaped["returned_rows"] = len(window)
+        self.max_returned = max(self.max_returned, len(window))
+        if primary and offset + len(window) < len(rows):
+            shaped["next_cursor"] = encode_cursor({"q": self.fingerprint, "p": offset + len(window)})
+        return shaped
+
+    def shape(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if _is_rows(value.get("list")):
+                return self._rows(value)
+            return {key: self.shape(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.shape(item) for item in value]
+        return value
+
+
+def _fits(text: str, max_bytes: int, max_tokens: int) -> Tuple[bool, int]:
+    size = len(text.encode("utf-8"))
+    return size <= max_bytes and estimate_tokens(text, size) <= max_tokens, size
+
+
+def _truncate(value: Any, max_items: int, max_chars: int) -> Any:
+    """배열·객체는 앞쪽 max_items개, 문자열은 max_chars자까지 남긴 복사본"""
+    if isinstance(value, dict):
+        return {key: _truncate(item, max_items, max_chars) for key, item in list(value.items())[:max_items]}
+    if isinstance(value, (list, tuple)):
+        return [_truncate(item, max_items, max_chars) for item in value[:max_items]]
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + "…"
+    return value
+
+
+def _truncated(value: Any) -> Dict[str, Any]:
+    """구조 축소 결과에 truncated 표시 추가 (객체가 아니면 result로 감쌈)"""
+    marker = {"truncated": True, "truncated_note": TRUNCATED_NOTE}
+    if isinstance(value, dict):
+        return {**marker, **value}
+    return {**marker, "result": value}
+
+
+def format_response(result: Any, tool: str = "", arguments: Optional[Dict[str, Any]] = None,
+                    max_bytes: int = MAX_RESPONSE_BYTES, max_tokens: int = MAX_RESPONSE_TOKENS,
+                    shaper: Optional[ResponseShaper] = None) -> str:
+    """도구 결과 → 예산 안의 압축 JSON 문자열
+
+    arguments의 응답 옵션(fields, limit, cursor, summary)을 적용하고(shaper를 주면 그대로 사용),
+    예산을 넘으면 행 수를 절반씩 줄인 뒤(이어보기 커서 제공) 요약 모드로 전환합니다.
+    그래도 넘으면 배열 항목 수와 문자열 길이를 절반씩 줄이고 truncated 표시를 붙입니다 (항상 올바른 JSON).
+    """
+    if shaper is None:
+        shaper = ResponseShaper.from_arguments(tool, arguments)
+
+    while True:
+        shaped = shaper.apply(result)
+        text = dumps(shaped)
+        fits, size = _fits(text, max_bytes, max_tokens)
+        if fits:
+            return text
+        if shaper.summary or shaper.max_returned < 0:
+            break
+        if shaper.max_returned > 1:
+            shaper.limit = shaper.max_returned // 2
+        else:
+            shaper.summary = True
+        logger.info(f"도구 응답 예산 초과 ({tool}, {size}바이트): 행 수 {shaper.limit}, 요약 {shaper.summary}")
+
+    # 줄일 행 목록이 없거나 요약으로도 예산을 넘으면 구조를 줄임
+    max_items, max_chars = TRUNCATE_MAX_ITEMS, TRUNCATE_MAX_CHARS
+    while max_items > 1 or max_chars > 1:
+        text = dumps(_truncated(_truncate(shaped, max_items, max_chars)))
+        fits, size = _fits(text, max_bytes, max_tokens)
+        if fits:
+            return text
+        max_items, max_chars = max(max_items // 2, 1), max(max_chars // 2, 1)
+    logger.warning(f"도구 응답 예산 초과 ({tool}, {size}바이트): 구조 축소로도 예산을 넘어 표시만 반환")
+    return dumps(_truncated({}))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+일괄 조회 도구 테스트 (요청 순서 유지, 항목별 오류, 중첩 금지, 동시 실행 제한)
+"""
+
+import asyncio
+import json
+
+import fss_pension_server
+
+COST = {"code": "000", "list": [{"company": "A은행", "totalCostRate": "0.4"}]}
+
+
+def custom_fee(params):
+    return {"code": "000", "list": [{"company": "A은행", "reserve": params["reserve"]}]}
+
+
+def batch(queries):
+    return asyncio.run(fss_pension_server.batch_query(queries))
+
+
+def test_results_in_request_order_with_item_errors(make_server):
+    make_server({"rpCorpBurdenRatioList.json": COST})
+    result = batch([
+        {"tool": "get_retirement_pension_cost", "arguments": {"search_year": "2023"}},
+        {"tool": "missing_tool"},
+        {"tool": "get_retirement_pension_custom_fee", "arguments": {"system_type": "IRP"}},
+        {"tool": "get_pension_statistics"},  # 응답 없음 → API 오류
+        "get_retirement_pension_cost",
+    ])
+
+    assert [item["tool"] for item in result["results"]] == [
+        "get_retirement_pension_cost", "missing_tool", "get_retirement_pension_custom_fee",
+        "get_pension_statistics", None,
+    ]
+    assert result["results"][0] == {"tool": "get_retirement_pension_cost", "ok": True, "result": COST}
+    assert [item["ok"] for item in result["results"]] == [True, False, False, False, False]
+    assert all(item["error"] for item in result["results"][1:])
+    assert (result["total"], result["succeeded"], result["failed"]) == (5, 1, 4)
+
+
+def test_nested_batch_is_rejected_without_running(make_server):
+    server = make_server({"rpCorpBurdenRatioList.json": COST})
+    result = batch([{"tool": "batch_query", "arguments": {
+        "queries": [{"tool": "get_retirement_pension_cost", "arguments": {"search_year": "2023"}}]
+    }}])
+    assert result["results"] == [{"tool": "batch_query", "ok": False, "error": "batch_query는 중첩할 수 없습니다"}]
+    assert server.fake.calls == []
+
+
+def test_empty_or_oversized_batch(make_server, monkeypatch):
+    make_server({})
+    monkeypatch.setattr(fss_pension_server, "BATCH_MAX_QUERIES", 2)
+    assert "error" in batch([])
+    assert "최대 2개" in batch([{"tool": "get_pension_statistics"}] * 3)["error"]
+
+
+def test_queries_run_concurrently_up_to_limit(make_server, monkeypatch):
+    server = make_server({"rpCorpCustomFeeList.json": custom_fee}, delay=0.02)
+    monkeypatch.setattr(fss_pension_server, "BATCH_CONCURRENCY", 2)
+    queries = [
+        {"tool": "get_retirement_pension_custom_fee", "arguments": {"deposit_amount": str(reserve)}}
+        for reserve in (10, 30, 50, 100, 300)
+    ]
+    result = batch(queries)
+    assert result["succeeded"] == 5
+    assert [item["result"]["list"][0]["reserve"] for item in result["results"]] == ["10", "30", "50", "100", "300"]
+    assert server.fake.max_in_flight == 2
+
+
+def test_top_level_response_options_apply_to_each_result(make_server):
+    make_server({"rpCorpBurdenRatioList.json": COST})
+    text = asyncio.run(fss_pension_server._call_tool("batch_query", {
+        "queries": [{"tool": "get_retirement_pension_cost", "arguments": {"search_year": "2023"}}],
+        "fields": ["company"],
+    }))[0].text
+    assert json.loads(text)["results"][0]["result"]["list"] == [{"company": "A은행"}]
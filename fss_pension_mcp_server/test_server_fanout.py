@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+analyze_pension_performance 동시 조회 테스트 (동시 실행, 호출별 동시 실행 한도, 부분 실패)
+"""
+
+import asyncio
+
+import fss_pension_server
+from fss_pension_server import _gather_bounded, analyze_pension_performance
+
+OK = {"code": "000", "list": [{"company": "A사"}]}
+
+
+def test_company_comparison_fetches_sources_concurrently(make_server):
+    server = make_server({"psCorpList.json": OK, "psProdList.json": OK}, delay=0.02)
+    result = asyncio.run(analyze_pension_performance("company_comparison", "2023", "4"))
+
+    assert server.fake.max_in_flight == 2
+    assert {endpoint for endpoint, _ in server.fake.calls} == {"psCorpList.json", "psProdList.json"}
+    assert result["failed_sources"] == []
+
+
+def test_failed_source_keeps_other_results(make_server):
+    make_server({"psCorpList.json": OK, "psProdList.json": {"error": "timeout"}})
+    result = asyncio.run(analyze_pension_performance("company_comparison", "2023", "4"))
+
+    assert result["company_performance"] == OK
+    assert result["failed_sources"] == ["product_details"]
+
+
+def test_gather_bounded_limits_each_call_and_isolates_errors(monkeypatch):
+    monkeypatch.setattr(fss_pension_server, "FANOUT_CONCURRENCY", 2)
+    running = peak = 0
+
+    async def job(value):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if value == 3:
+            raise RuntimeError("실패")
+        return {"value": value}
+
+    results = asyncio.run(_gather_bounded(*(job(value) for value in range(5))))
+    assert peak == 2
+    assert results[3] == {"error": "실패"}
+    assert [result.get("value") for result in results] == [0, 1, 2, None, 4]
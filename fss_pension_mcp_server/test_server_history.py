@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+이력 저장소 테스트 (분기 변화 재계산, 백필 실행당 조회 수 제한)
+"""
+
+import asyncio
+from datetime import date
+
+from history_store import HistoryBackfill, HistoryStore, backfill_targets, period_of
+
+ENDPOINT = "psProdList.json"
+
+
+def product(name, fee):
+    return {"company": "A사", "product": name, "productType": "펀드", "sells": "Y", "avgFeeRate3": fee}
+
+
+def fee_change(store, period):
+    diff = store.diff(ENDPOINT, period)
+    return diff["previous"], [(item["product"], item["before"], item["after"]) for item in diff["fee_changes"]]
+
+
+def test_ingest_recomputes_diffs_for_this_and_next_period(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    store.ingest(ENDPOINT, "2023", "1", [product("가", 0.5)])
+    store.ingest(ENDPOINT, "2023", "3", [product("가", 0.3)])
+    assert fee_change(store, 20233) == (20231, [("가", 0.5, 0.3)])
+
+    # 늦게 받은 사이 분기: 자신의 변화와 다음 분기의 비교 대상이 바뀜
+    store.ingest(ENDPOINT, "2023", "2", [product("가", 0.4)])
+    assert fee_change(store, 20232) == (20231, [("가", 0.5, 0.4)])
+    assert fee_change(store, 20233) == (20232, [("가", 0.4, 0.3)])
+
+    # 같은 기간 재저장은 기존 데이터를 교체하고 다음 기간 변화도 갱신
+    store.ingest(ENDPOINT, "2023", "2", [product("가", 0.45), product("나", 0.1)])
+    assert fee_change(store, 20233) == (20232, [("가", 0.45, 0.3)])
+    assert store.diff(ENDPOINT, 20233)["discontinued_products"][0]["product"] == "나"
+    assert store.diff(ENDPOINT, 20231) is None  # 비교할 이전 기간 없음
+    assert len(store.snapshot(ENDPOINT, 20232)) == 2
+
+
+def test_backfill_caps_each_run_and_skips_known_periods(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    store.ingest(ENDPOINT, "2023", "4", [product("가", 0.5)])
+    fetched = []
+
+    async def fetch(endpoint, params):
+        fetched.append(period_of(params["year"], params["quarter"]))
+        if params["quarter"] == "1":
+            return {"code": "000", "list": []}  # 아직 공시되지 않은 기간
+        return {"code": "000", "list": [product("가", 0.4)]}
+
+    backfill = HistoryBackfill(store, fetch, concurrency=2, start_year=2023, max_per_run=3)
+    targets = [period_of(year, quarter) for _, year, quarter in backfill_targets([ENDPOINT], 2023)]
+    pending = sorted(set(targets) - {20234}, reverse=True)
+
+    first = asyncio.run(backfill.run([ENDPOINT]))
+    assert sorted(fetched, reverse=True) == pending[:3]  # 최근 기간부터 max_per_run개
+    assert first["total"] == 3 and first["remaining"] == len(pending) - 3
+
+    fetched.clear()
+    asyncio.run(backfill.run([ENDPOINT]))
+    assert sorted(fetched, reverse=True) == pending[3:6]  # 저장·시도한 기간은 건너뜀
+    assert 20234 in store.periods(ENDPOINT)
+
+
+def test_backfill_targets_stop_at_last_finished_quarter():
+    targets = backfill_targets([ENDPOINT, "rpCorpBurdenRatioList.json"], 2023, today=date(2024, 5, 1))
+    assert [(y, q) for e, y, q in targets if e == ENDPOINT] == [
+        ("2023", "1"), ("2023", "2"), ("2023", "3"), ("2023", "4"), ("2024", "1")
+    ]
+    assert [(y, q) for e, y, q in targets if e != ENDPOINT] == [("2023", ""), ("2024", "")]
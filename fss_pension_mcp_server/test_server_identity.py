@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+분기 간 식별자 매칭 테스트 (중복 순번, 유사도 기준, 숫자 표기, 유일 후보)
+"""
+
+from fss_pension_common.name_index import NameIndex
+from identity import DUPLICATE_MARK, IDENTITY_MIN_SCORE, IdentityIndex, identity_key
+
+FIELDS = ("company", "product")
+
+
+def key(company, product):
+    return identity_key(FIELDS, {"company": company, "product": product})
+
+
+def make_index(*names, company="A사"):
+    """names를 1번부터 엔티티로 등록한 색인"""
+    index = IdentityIndex(FIELDS, "product")
+    for entity_id, name in enumerate(names, 1):
+        index.add(entity_id, [key(company, name)])
+    return index
+
+
+def test_duplicates_in_one_period_get_numbered_keys():
+    index = IdentityIndex(FIELDS, "product")
+    first = index.assign([key("A사", "펀드"), key("A사", "펀드 "), key("A사", "펀드")])
+    assert first == [
+        (key("A사", "펀드"), None),
+        (f"{key('A사', '펀드')}{DUPLICATE_MARK}2", None),
+        (f"{key('A사', '펀드')}{DUPLICATE_MARK}3", None),
+    ]
+
+    for entity_id, (assigned, _) in enumerate(first, 1):
+        index.add(entity_id, [assigned])
+    assert [entity_id for _, entity_id in index.assign([key("A사", "펀드")] * 3)] == [1, 2, 3]
+
+
+def test_renamed_entity_is_linked_above_threshold_only():
+    index = make_index("미래에셋연금저축펀드")
+    assert index.assign([key("A사", "미래에셋 연금저축펀드A")]) == [(key("A사", "미래에셋 연금저축펀드A"), 1)]
+    assert index.assign([key("A사", "삼성연금저축펀드")]) == [(key("A사", "삼성연금저축펀드"), None)]
+    assert index.assign([key("B사", "미래에셋연금저축펀드A")])[0][1] is None  # 다른 회사는 비교하지 않음
+
+
+def test_different_numbers_are_different_entities():
+    old, new = "미래에셋연금저축펀드1호", "미래에셋연금저축펀드2호"
+    assert NameIndex([old]).search(new)[0][1] >= IDENTITY_MIN_SCORE  # 이름만으로는 같은 상품으로 보임
+    assert make_index(old).assign([key("A사", new)])[0][1] is None
+
+
+def test_fuzzy_link_needs_a_unique_unclaimed_candidate():
+    index = make_index("한국밸류연금저축신탁A", "한국밸류연금저축신탁C")
+    assert index.assign([key("A사", "한국밸류연금저축신탁")])[0][1] is None  # 후보가 둘
+
+    # 정확히 일치한 엔티티는 이번 기간에 다시 연결하지 않음
+    assigned = index.assign([key("A사", "한국밸류연금저축신탁A"), key("A사", "한국밸류연금저축신탁")])
+    assert [entity_id for _, entity_id in assigned] == [1, 2]
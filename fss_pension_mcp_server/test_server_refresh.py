@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+사전 갱신 대상 테스트 (기본 대상 + 최근 조회된 캐시 요청)
+"""
+
+import fss_pension_server
+from fss_pension_common.refresh import REFRESH_RECENT_WINDOW
+
+
+def test_refresh_requests_skip_entries_not_used_recently(make_server):
+    server = make_server({})
+    server.cache.set("recent", "psProdList.json", {"code": "000"}, params={"year": "2022", "quarter": "4"})
+    server.cache.set("old", "psProdList.json", {"code": "000"}, params={"year": "2019", "quarter": "4"})
+    server.cache.get("old").last_used -= REFRESH_RECENT_WINDOW + 1
+
+    requests = server.refresh_requests()
+    assert requests[:len(fss_pension_server.DEFAULT_REFRESH_REQUESTS)] == fss_pension_server.DEFAULT_REFRESH_REQUESTS
+    assert ("psProdList.json", {"year": "2022", "quarter": "4"}) in requests
+    assert ("psProdList.json", {"year": "2019", "quarter": "4"}) not in requests
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+도구 레지스트리 테스트 (인자 별칭·값 변환, 잘못된 인자, 미리 만든 도구 목록과 서버 도구 호출)
+"""
+
+import asyncio
+
+import pytest
+
+import fss_pension_server
+from tool_registry import ToolArgumentError, ToolRegistry, UnknownToolError
+
+COMPANIES = {"code": "000", "list": [{"company": "A생명", "avgEarnRate3": "3.1"}]}
+
+
+def make_registry():
+    async def handler(year, system="1", count=None):
+        return {"year": year, "system": system, "count": count}
+
+    registry = ToolRegistry(common_properties={"limit": {"type": "integer"}})
+    registry.register(
+        "lookup", "조회", handler,
+        properties={
+            "search_year": {"type": "string"},
+            "system_type": {"type": "string", "enum": ["DB", "DC"]},
+            "count": {"type": "integer"},
+        },
+        required=["search_year"],
+        aliases={"search_year": "year", "system_type": "system"},
+        values={"system_type": {"DB": "1", "DC": "2"}},
+    )
+    return registry
+
+
+def test_registry_aliases_values_and_conversion():
+    registry = make_registry()
+    result = asyncio.run(registry.call("lookup", {"search_year": 2023, "system_type": "DC", "count": "3", "limit": 5}))
+    assert result == {"year": "2023", "system": "2", "count": 3}
+    assert "limit" in registry.tools[0].inputSchema["properties"]
+    assert registry.tools[0].inputSchema["required"] == ["search_year"]
+
+
+@pytest.mark.parametrize("arguments", [
+    {},
+    {"search_year": ""},
+    {"search_year": "2023", "system_type": "IRP"},
+    {"search_year": "2023", "count": "많이"},
+    ["2023"],
+])
+def test_registry_rejects_invalid_arguments(arguments):
+    with pytest.raises(ToolArgumentError):
+        asyncio.run(make_registry().call("lookup", arguments))
+
+
+def test_registry_unknown_and_duplicate_tools():
+    registry = make_registry()
+    with pytest.raises(UnknownToolError):
+        registry.get("missing")
+    with pytest.raises(ValueError):
+        registry.register("lookup", "중복", registry.get("lookup").handler)
+    assert "lookup" in registry and len(registry) == 1
+
+
+def test_server_tool_list_is_built_once():
+    first = asyncio.run(fss_pension_server.list_tools())
+    assert asyncio.run(fss_pension_server.list_tools()) is first
+    assert [tool.name for tool in first] == [tool.name for tool in fss_pension_server.tool_registry.tools]
+    assert all("limit" in tool.inputSchema["properties"] for tool in first)
+
+
+def test_server_tool_arguments_map_to_method_parameters(make_server):
+    server = make_server({"psCorpList.json": COMPANIES})
+    text = asyncio.run(fss_pension_server._call_tool(
+        "get_pension_savings_company_performance", {"search_year": 2023, "search_quarter": "4"}
+    ))[0].text
+    assert "A생명" in text
+    assert server.fake.calls == [("psCorpList.json", {"year": "2023", "quarter": "4"})]
+
+
+def test_server_unknown_tool_and_invalid_arguments(make_server):
+    server = make_server({})
+    unknown = asyncio.run(fss_pension_server._call_tool("missing_tool", {}))[0].text
+    invalid = asyncio.run(fss_pension_server._call_tool(
+        "generate_pension_recommendation", {"user_age": "마흔", "monthly_income": 300, "risk_preference": "moderate"}
+    ))[0].text
+    assert "missing_tool" in unknown
+    assert invalid.startswith("오류 발생")
+    assert server.fake.calls == []
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+데이터셋 리소스 테스트 (고정 URI, 구독 세션 변경 알림, 캐시 추가·제거 시 목록 변경 알림, 메모리에서 읽기)
+"""
+
+import asyncio
+
+import pytest
+
+import fss_pension_server
+from dataset_resources import ResourceNotifier, dataset_uri, parse_dataset_uri
+from fss_pension_common.response_cache import ResponseCache, make_cache_key
+
+PRODUCTS = {"code": "000", "list": [{"company": "A사", "product": "펀드"}]}
+
+
+class FakeSession:
+    """보낸 알림을 기록하는 MCP 세션"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sent = []
+
+    async def send_resource_updated(self, uri):
+        if self.fail:
+            raise ConnectionError("연결 끊김")
+        self.sent.append(("updated", str(uri)))
+
+    async def send_resource_list_changed(self):
+        if self.fail:
+            raise ConnectionError("연결 끊김")
+        self.sent.append(("list_changed", None))
+
+
+def ok(value):
+    return {"code": "000", "list": [{"v": value}]}
+
+
+def store(cache, params, value):
+    cache.set(make_cache_key("psProdList.json", params), "psProdList.json", ok(value), params)
+
+
+def test_dataset_uri_is_stable_and_round_trips():
+    uri = dataset_uri("psProdList.json", {"year": 2023, "quarter": "4"})
+    assert uri == dataset_uri("psProdList.json", {"quarter": 4, "year": "2023"})
+    assert uri == "fss://datasets/psProdList.json?quarter=4&year=2023"
+    assert parse_dataset_uri(uri) == ("psProdList.json", {"quarter": "4", "year": "2023"})
+    with pytest.raises(ValueError):
+        parse_dataset_uri("fss://datasets/unknown.json")
+
+
+def test_subscribers_notified_only_on_content_change():
+    async def run():
+        cache, notifier, session = ResponseCache(), ResourceNotifier(), FakeSession()
+        cache.add_listener(notifier.on_cache_update)
+        params = {"year": "2023", "quarter": "4"}
+        notifier.subscribe(session, dataset_uri("psProdList.json", params))
+        store(cache, params, 1)
+        store(cache, params, 1)  # 같은 내용
+        store(cache, params, 2)
+        store(cache, {"year": "2023", "quarter": "3"}, 1)  # 구독하지 않은 데이터셋
+        await asyncio.sleep(0)
+        return session.sent
+
+    uri = "fss://datasets/psProdList.json?quarter=4&year=2023"
+    assert asyncio.run(run()) == [("updated", uri), ("updated", uri)]
+
+
+def test_list_changed_on_add_and_eviction_coalesced():
+    async def run():
+        cache, notifier = ResponseCache(max_entries=1), ResourceNotifier()
+        subscriber, lister = FakeSession(), FakeSession()
+        cache.add_listener(notifier.on_cache_update)
+        notifier.watch_list(lister)
+        notifier.subscribe(subscriber, dataset_uri("psProdList.json", {"year": "2023"}))
+        store(cache, {"year": "2023"}, 1)
+        await asyncio.sleep(0)
+        store(cache, {"year": "2024"}, 1)  # 추가와 LRU 제거 → 목록 변경 알림 한 번
+        await asyncio.sleep(0)
+        return subscriber.sent, lister.sent
+
+    subscriber_sent, lister_sent = asyncio.run(run())
+    assert lister_sent == [("list_changed", None), ("list_changed", None)]
+    assert subscriber_sent == [("updated", "fss://datasets/psProdList.json?year=2023")]  # 제거는 알리지 않음
+
+
+def test_failed_session_is_unsubscribed():
+    async def run():
+        cache, notifier = ResponseCache(), ResourceNotifier()
+        cache.add_listener(notifier.on_cache_update)
+        uri = dataset_uri("psProdList.json", {})
+        notifier.subscribe(FakeSession(fail=True), uri)
+        store(cache, {}, 1)
+        await asyncio.sleep(0)
+        return notifier.subscriptions()
+
+    assert asyncio.run(run()) == {}
+
+
+def test_read_resource_served_from_cache(make_server):
+    server = make_server({"psProdList.json": PRODUCTS})
+    uri = dataset_uri("psProdList.json", {"year": "2023", "quarter": "4"})
+
+    async def run():
+        return [await fss_pension_server.read_resource(uri) for _ in range(2)]
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert server.fake.calls == [("psProdList.json", {"quarter": "4", "year": "2023"})]
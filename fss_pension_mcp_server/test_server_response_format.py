@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+도구 응답 변환 테스트 (필드 선택, 행 수 제한과 이어보기 커서, 요약, 크기 제한)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import fss_pension_server
+from response_format import InvalidCursorError, InvalidResponseOptionError, ResponseShaper, format_response
+
+PRODUCTS = {"code": "000", "list": [
+    {"company": "A사", "product": f"펀드{i}", "productType": "연금저축펀드", "sells": "Y", "guarantees": "N",
+     "avgEarnRate3": 3.0 + i, "avgFeeRate3": 1.0 - i * 0.1}
+    for i in range(5)
+]}
+
+
+def rows_payload(count, extra=None):
+    payload = {"result": {"list": [{"id": i, "name": f"상품{i}"} for i in range(count)]}}
+    if extra is not None:
+        payload["other"] = {"list": [{"id": i} for i in range(extra)]}
+    return payload
+
+
+def call_tool(name, arguments):
+    return asyncio.run(fss_pension_server._call_tool(name, arguments))[0].text
+
+
+def test_shaper_cursor_round_trip():
+    arguments = {"year": "2023", "limit": 2}
+    seen = []
+    cursor = None
+    while True:
+        args = dict(arguments, cursor=cursor) if cursor else arguments
+        page = json.loads(format_response(rows_payload(5), "tool", args))["result"]
+        seen.extend(row["id"] for row in page["list"])
+        cursor = page.get("next_cursor")
+        if cursor is None:
+            break
+    assert seen == [0, 1, 2, 3, 4]
+
+
+def test_shaper_cursor_bound_to_query():
+    page = json.loads(format_response(rows_payload(5), "tool", {"year": "2023", "limit": 2}))
+    cursor = page["result"]["next_cursor"]
+    with pytest.raises(InvalidCursorError):
+        ResponseShaper.from_arguments("tool", {"year": "2024", "cursor": cursor})
+    with pytest.raises(InvalidCursorError):
+        ResponseShaper.from_arguments("tool", {"cursor": "잘못된커서"})
+
+
+def test_shaper_pages_primary_list_only():
+    page = json.loads(format_response(rows_payload(5, extra=5), "tool", {"limit": 2}))
+    cursor = page["result"]["next_cursor"]
+    assert "next_cursor" not in page["other"]
+
+    page = json.loads(format_response(rows_payload(5, extra=5), "tool", {"limit": 2, "cursor": cursor}))
+    assert [row["id"] for row in page["result"]["list"]] == [2, 3]
+    assert [row["id"] for row in page["other"]["list"]] == [0, 1]
+
+
+def test_shaper_fields_and_summary():
+    page = json.loads(format_response(rows_payload(3), "tool", {"fields": ["name"]}))
+    assert page["result"]["list"][0] == {"name": "상품0"}
+    summary = json.loads(format_response(rows_payload(3), "tool", {"summary": True}))["result"]["summary"]
+    assert summary["rows"] == 3 and "id" in summary["numeric"]
+
+
+@pytest.mark.parametrize("arguments", [
+    {"fields": "name"},
+    {"fields": ["name", 1]},
+    {"limit": "열"},
+    {"limit": True},
+    {"cursor": 3},
+    {"summary": "yes"},
+])
+def test_shaper_rejects_invalid_options(arguments):
+    with pytest.raises(InvalidResponseOptionError):
+        ResponseShaper.from_arguments("tool", arguments)
+
+
+def test_shaper_accepts_digit_limit():
+    assert ResponseShaper.from_arguments("tool", {"limit": "10"}).limit == 10
+
+
+def test_format_response_over_budget_is_valid_json():
+    payload = {"text": "가" * 5000, "items": list(range(1000))}
+    result = json.loads(format_response(payload, "tool", max_bytes=2000, max_tokens=2000))
+    assert result["truncated"] is True
+
+
+def test_tool_response_is_projected_and_paged(make_server):
+    make_server({"psProdList.json": PRODUCTS})
+    arguments = {"year": "2023", "quarter": "4", "fields": ["product"], "limit": 3}
+    first = json.loads(call_tool("get_pension_savings_product_performance", arguments))
+    assert first["list"] == [{"product": "펀드0"}, {"product": "펀드1"}, {"product": "펀드2"}]
+
+    rest = json.loads(call_tool("get_pension_savings_product_performance",
+                                dict(arguments, cursor=first["next_cursor"])))
+    assert rest["list"] == [{"product": "펀드3"}, {"product": "펀드4"}]
+    assert "next_cursor" not in rest
+
+
+def test_tool_rejects_invalid_options_before_fetching(make_server):
+    server = make_server({"psProdList.json": PRODUCTS})
+    text = call_tool("get_pension_savings_product_performance", {"year": "2023", "limit": "열"})
+    assert text.startswith("오류 발생")
+    assert server.fake.calls == []
+
+
+def test_recommendation_does_not_embed_raw_products(make_server):
+    make_server({"psProdList.json": PRODUCTS})
+    result = json.loads(call_tool("generate_pension_recommendation",
+                                  {"user_age": 40, "monthly_income": 300, "risk_preference": "moderate"}))
+    assert "product_data" not in result
+    products = result["recommended_products"]
+    assert products["total"] == 5
+    assert products["products"][0]["product"] == "펀드4"  # 수수료 낮은 순
+    assert all(set(row) <= set(fss_pension_server.RECOMMENDATION_FIELDS) for row in products["products"])
+    assert result["tax_benefits"]["max_annual_deduction"] == 5400000  # 연 소득 3,600만원의 15%
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+MCP 서버 데이터 조회 테스트 (스냅샷 재사용, FSS 장애·오프라인 모드 대체)
+"""
+
+import asyncio
+
+PARAMS = {"year": "2023", "quarter": "4"}
+V1 = {"code": "000", "list": [{"product": "v1"}]}
+V2 = {"code": "000", "list": [{"product": "v2"}]}
+
+
+def test_fresh_snapshot_is_reused_without_api_call(make_server):
+    server = make_server({"psProdList.json": [V1, V2]})
+    first = asyncio.run(server._load_dataset("psProdList.json", PARAMS))
+    second = asyncio.run(server._load_dataset("psProdList.json", PARAMS))
+    forced = asyncio.run(server._load_dataset("psProdList.json", PARAMS, force=True))
+
+    assert first == second == V1
+    assert forced == V2
+    assert len(server.fake.calls) == 2
+
+
+def test_api_failure_falls_back_to_snapshot(make_server):
+    server = make_server({"psProdList.json": [V1, {"error": "timeout"}]})
+    asyncio.run(server._load_dataset("psProdList.json", PARAMS))
+    assert asyncio.run(server._load_dataset("psProdList.json", PARAMS, force=True)) == V1
+
+
+def test_offline_mode_serves_snapshots_only(make_server):
+    asyncio.run(make_server({"psProdList.json": V1})._load_dataset("psProdList.json", PARAMS))
+
+    offline = make_server({"psProdList.json": V2}, offline=True)
+    assert asyncio.run(offline._load_dataset("psProdList.json", PARAMS, force=True)) == V1
+    missing = asyncio.run(offline._load_dataset("psProdList.json", {"year": "2022", "quarter": "4"}))
+    assert "error" in missing
+    assert offline.fake.calls == []
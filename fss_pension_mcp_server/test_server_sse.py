@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+SSE 전송 테스트 (uvicorn 종료 과정에서 열린 세션을 닫고 정리 함수 실행)
+"""
+
+import asyncio
+import socket
+
+import httpx
+
+import fss_pension_server
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_shutdown_closes_open_sessions(make_server):
+    make_server({})
+    sessions = fss_pension_server.SseSessions()
+    shutdown_calls = []
+
+    async def on_shutdown():
+        shutdown_calls.append(sessions.active)
+
+    async def run():
+        port = free_port()
+        server = fss_pension_server.create_sse_server(sessions, "127.0.0.1", port, on_shutdown)
+        serving = asyncio.ensure_future(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=5) as client:
+            async with client.stream("GET", "/sse") as response:
+                lines = response.aiter_lines()
+                while not (await lines.__anext__()).startswith("data:"):
+                    pass  # 요청 전달 주소(endpoint 이벤트)를 받으면 세션 연결 완료
+                health = (await client.get("/health")).json()
+
+                server.should_exit = True
+                await asyncio.wait_for(serving, timeout=5)
+                remaining = [line async for line in lines]
+        return health, remaining
+
+    health, remaining = asyncio.run(run())
+    assert health["sessions"] == 1
+    assert sessions.active == 0
+    assert shutdown_calls == [0]  # 세션을 모두 닫은 뒤 정리 함수 실행
+    assert not any(line.startswith("data:") for line in remaining)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+은퇴 시나리오 그리드 도구 테스트 (생략한 축 기본값, 시나리오 수 초과 오류)
+"""
+
+import asyncio
+
+import fss_pension_server
+from fss_pension_common import retirement_projection
+
+PRODUCTS = {"code": "000", "list": [
+    {"company": "A사", "product": f"펀드{i}", "productType": "연금저축펀드", "sells": "Y", "guarantees": "N",
+     "avgEarnRate3": rate}
+    for i, rate in enumerate([3.0, 5.0, 7.0])
+]}
+
+
+def test_sweep_tool_fills_default_axes(make_server):
+    make_server({"psProdList.json": PRODUCTS})
+    result = asyncio.run(fss_pension_server.sweep_retirement_scenarios(45, monthly_living_costs=[200, 300]))
+    assert result["axes"]["monthly_living_cost"] == [200.0, 300.0]
+    assert result["axes"]["retirement_age"] == fss_pension_server.DEFAULT_SWEEP_GRID["retirement_ages"]
+    assert result["return_distribution"]["products"] == 3
+
+
+def test_sweep_tool_reports_oversized_grid(make_server, monkeypatch):
+    make_server({"psProdList.json": PRODUCTS})
+    monkeypatch.setattr(retirement_projection, "MAX_SWEEP_CELLS", 4)
+    result = asyncio.run(fss_pension_server.sweep_retirement_scenarios(45, monthly_living_costs=[200, 300]))
+    assert "최대 4개" in result["error"]
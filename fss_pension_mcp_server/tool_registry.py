@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+MCP 도구 레지스트리
+
+도구 이름마다 처리 함수와 입력 스키마를 선언적으로 등록합니다.
+Tool 목록과 인자 변환기(스키마 기반 타입 검증, 도구 인자 이름 → 처리 함수 매개변수 이름 변환)는
+등록 시 한 번만 만들어 두므로, 도구 목록 조회는 저장된 목록을 그대로 반환하고
+도구 호출은 이름 조회 한 번과 미리 만든 변환기 실행으로 처리됩니다.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from mcp.types import Tool
+
+Handler = Callable[..., Awaitable[Any]]
+Validator = Callable[[Any], Any]
+
+
+class UnknownToolError(LookupError):
+    """등록되지 않은 도구 이름"""
+
+
+class ToolArgumentError(ValueError):
+    """스키마에 맞지 않는 도구 인자"""
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _to_string(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if _is_number(value):
+        # FSS 파라미터는 문자열 (2023 → '2023')
+        return str(int(value)) if float(value).is_integer() else str(value)
+    raise TypeError("문자열이어야 합니다")
+
+
+def _to_integer(value: Any) -> int:
+    if _is_number(value) and float(value).is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise TypeError("정수여야 합니다")
+
+
+def _to_number(value: Any) -> float:
+    if _is_number(value):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            pass
+    raise TypeError("숫자여야 합니다")
+
+
+def _to_boolean(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    raise TypeError("true 또는 false여야 합니다")
+
+
+def _to_object(value: Any) -> Dict[str, Any]:
+    if isinstance(value, dict):
+        return value
+    raise TypeError("객체여야 합니다")
+
+
+_CONVERTERS: Dict[str, Validator] = {
+    "string": _to_string,
+    "integer": _to_integer,
+    "number": _to_number,
+    "boolean": _to_boolean,
+    "object": _to_object,
+}
+
+
+def compile_validator(schema: Mapping[str, Any], values: Optional[Mapping[str, Any]] = None) -> Validator:
+    """속성 스키마 → 값 변환 함수 (type, items, enum 검사; values가 있으면 값 치환 후 반환)
+
+    변환 함수는 맞지 않는 값에 TypeError 또는 ValueError를 발생시킵니다.
+    """
+    kind = schema.get("type")
+    if kind == "array":
+        item = compile_validator(schema.get("items") or {})
+
+        def convert(value: Any) -> Any:
+            if not isinstance(value, (list, tuple)):
+                raise TypeError("배열이어야 합니다")
+            return [item(element) for element in value]
+    else:
+        convert = _CONVERTERS.get(kind, lambda value: value)
+
+    allowed = frozenset(schema["enum"]) if "enum" in schema else None
+    if allowed is None and values is None:
+        return convert
+
+    def validate(value: Any) -> Any:
+        value = convert(value)
+        if allowed is not None and value not in allowed:
+            raise ValueError(f"{', '.join(map(str, schema['enum']))} 중 하나여야 합니다")
+        return values.get(value, value) if values else value
+
+    return validate
+
+
+class ToolSpec:
+    """등록된 도구 (Tool 정의, 처리 함수, 미리 만든 인자 변환기)"""
+
+    def __init__(self, name: str, description: str, handler: Handler,
+                 properties: Optional[Dict[str, Dict[str, Any]]] = None, required: Sequence[str] = (),
+                 aliases: Optional[Mapping[str, str]] = None,
+                 values: Optional[Mapping[str, Mapping[str, Any]]] = None,
+                 common_properties: Optional[Dict[str, Dict[str, Any]]] = None):
+        properties = properties or {}
+        aliases = aliases or {}
+        values = values or {}
+        self.name = name
+        self.handler = handler
+        self.required = tuple(required)
+        # (도구 인자 이름, 처리 함수 매개변수 이름, 변환 함수)
+        self.params: Tuple[Tuple[str, str, Validator], ...] = tuple(
+            (arg, aliases.get(arg, arg), compile_validator(schema, values.get(arg)))
+            for arg, schema in properties.items()
+        )
+        input_schema: Dict[str, Any] = {"type": "object", "properties": {**properties, **(common_properties or {})}}
+        if self.required:
+            input_schema["required"] = list(self.required)
+        self.tool = Tool(name=name, description=description, inputSchema=input_schema)
+
+    def adapt(self, arguments: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+        """도구 인자 → 처리 함수 키워드 인자 (값이 없는 인자와 공통 옵션·알 수 없는 인자는 제외)"""
+        if arguments is None:
+            arguments = {}
+        elif not isinstance(arguments, Mapping):
+            raise ToolArgumentError(f"{self.name}: 인자는 객체여야 합니다")
+        missing = [arg for arg in self.required if arguments.get(arg) in (None, "")]
+        if missing:
+            raise ToolArgumentError(f"{self.name}: 필수 인자 누락 ({', '.join(missing)})")
+        kwargs: Dict[str, Any] = {}
+        for arg, target, validate in self.params:
+            value = arguments.get(arg)
+            if value is None:
+                continue
+            try:
+                kwargs[target] = validate(value)
+            except (TypeError, ValueError) as e:
+                raise ToolArgumentError(f"{self.name}: 잘못된 인자 {arg}={value!r} ({e})")
+        return kwargs
+
+
+class ToolRegistry:
+    """도구 이름 → ToolSpec
+
+    common_properties는 모든 도구 스키마에 추가되지만 처리 함수에는 전달되지 않습니다
+    (응답 옵션처럼 호출 측에서 따로 처리하는 인자).
+    """
+
+    def __init__(self, common_properties: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.common_properties = common_properties or {}
+        self._specs: Dict[str, ToolSpec] = {}
+        self._tools: List[Tool] = []
+
+    def register(self, name: str, description: str, handler: Handler,
+                 properties: Optional[Dict[str, Dict[str, Any]]] = None, required: Sequence[str] = (),
+                 aliases: Optional[Mapping[str, str]] = None,
+                 values: Optional[Mapping[str, Mapping[str, Any]]] = None) -> ToolSpec:
+        """도구 등록
+
+        aliases: 도구 인자 이름 → 처리 함수 매개변수 이름 (예: search_year → year)
+        values: 도구 인자별 값 치환 (예: system_type의 'DC' → '2')
+        """
+        if name in self._specs:
+            raise ValueError(f"이미 등록된 도구: {name}")
+        spec = ToolSpec(name, description, handler, properties, required, aliases, values, self.common_properties)
+        self._specs[name] = spec
+        self._tools.append(spec.tool)
+        return spec
+
+    @property
+    def tools(self) -> List[Tool]:
+        """등록 순서대로의 Tool 목록 (등록 시 만든 객체 그대로)"""
+        return self._tools
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def get(self, name: str) -> ToolSpec:
+        spec = self._specs.get(name)
+        if spec is None:
+            raise UnknownToolError(f"알 수 없는 도구: {name}")
+        return spec
+
+    async def call(self, name: str, arguments: Optional[Mapping[str, Any]] = None) -> Any:
+        """도구 실행 (알 수 없는 도구면 UnknownToolError, 인자가 스키마에 맞지 않으면 ToolArgumentError)"""
+        spec = self.get(name)
+        return await spec.handler(**spec.adapt(arguments))
@@ -4,19 +4,26 @@ FSS 연금 정보 웹 애플리케이션
 FastAPI를 사용한 연금 데이터 대시보드
 """
 
+import asyncio
 import os
 import logging
 from contextlib import asynccontextmanager
 from typing import Dict, Any, List
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+from fss_pension_common.http_pool import close_http_clients
+from fss_pension_common.refresh import REFRESH_ENABLED, RefreshScheduler
+
 from core.fss_client import FSSPensionClient
+from core.pagination import MAX_PAGE_SIZE, SORT_FIELDS, InvalidCursorError, paginate, query_fingerprint
+from core.rankings import RANKING_CRITERIA
+from core.schemas import ScenarioSweepRequest, TaxBenefitBatchRequest
 
 # 로깅 설정
 logging.basicConfig(
@@ -40,12 +47,26 @@ async def lifespan(app: FastAPI):
     fss_client = FSSPensionClient(FSS_SERVICE_KEY)
     logger.info("FSS 연금 클라이언트 초기화 완료")
     
+    # 기본 분기 변화·맞춤형 수수료 행렬 사전 계산 (사전 갱신 스케줄러와 관계없이 실행,
+    # 이후 원본 데이터가 바뀌면 클라이언트가 자동으로 다시 계산)
+    precompute_task = asyncio.create_task(fss_client.precompute_quarter_diffs())
+    fss_client.schedule_custom_fee_matrix()
+    
+    # FSS 데이터 사전 갱신 스케줄러 시작 (갱신 후 수수료 행렬도 다시 생성)
+    refresh_scheduler = RefreshScheduler(fss_client, on_refresh=fss_client.build_custom_fee_matrix)
+    if REFRESH_ENABLED:
+        refresh_scheduler.start()
+    
     yield
     
-    # 종료 시 클라이언트 정리
+    # 종료 시 사전 계산·스케줄러 및 클라이언트 정리
+    precompute_task.cancel()
+    await asyncio.gather(precompute_task, return_exceptions=True)
+    await refresh_scheduler.stop()
     if fss_client:
         await fss_client.close()
         logger.info("FSS 연금 클라이언트 종료")
+    await close_http_clients()
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -95,7 +116,7 @@ async def get_market_summary() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/low-fee-products")
-async def get_low_fee_products(limit: int = 10) -> Dict[str, Any]:
+async def get_low_fee_products(limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE)) -> Dict[str, Any]:
     """수수료율 최저가 상품 목록"""
     try:
         if not fss_client:
@@ -111,14 +132,37 @@ async def get_low_fee_products(limit: int = 10) -> Dict[str, Any]:
         logger.error(f"저비용 상품 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/top-products")
+async def get_top_products(criterion: str = "low_fee",
+                           limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE)) -> Dict[str, Any]:
+    """기준별 상위 상품 목록 (low_fee, earn3, earn5, net_return)"""
+    if criterion not in RANKING_CRITERIA:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 순위 기준: {criterion}")
+    try:
+        if not fss_client:
+            raise HTTPException(status_code=500, detail="FSS 클라이언트가 초기화되지 않음")
+        
+        products = await fss_client.analyze_top_products(criterion, limit=limit)
+        return {
+            "success": True,
+            "data": products,
+            "total": len(products),
+            "criterion": criterion
+        }
+    except Exception as e:
+        logger.error(f"상위 상품 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/company-ranking")
-async def get_company_ranking(area_code: str = None) -> Dict[str, Any]:
+async def get_company_ranking(area_code: str = None, criterion: str = "low_fee") -> Dict[str, Any]:
     """회사별 성과 순위"""
+    if criterion not in RANKING_CRITERIA:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 순위 기준: {criterion}")
     try:
         if not fss_client:
             raise HTTPException(status_code=500, detail="FSS 클라이언트가 초기화되지 않음")
         
-        companies = await fss_client.analyze_company_ranking(area_code=area_code)
+        companies = await fss_client.analyze_company_ranking(area_code=area_code, criterion=criterion)
         return {
             "success": True,
             "data": companies,
@@ -168,49 +212,123 @@ async def get_custom_fee_comparison(
         logger.error(f"맞춤형 수수료 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/quarter-diff")
+async def get_quarter_diff(year: str = "2023", quarter: str = Query("4", pattern="^[1-4]$")) -> Dict[str, Any]:
+    """직전 분기 대비 변화 (신규/판매중지 상품, 수수료율·수익률 변화, 권역별 회사 순위 변동)"""
+    try:
+        if not fss_client:
+            raise HTTPException(status_code=500, detail="FSS 클라이언트가 초기화되지 않음")
+        
+        diff = await fss_client.get_quarter_diff(year, quarter)
+        return {
+            "success": True,
+            "data": diff
+        }
+    except HTTPException:
+        raise
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"분기 변화 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/retirement-scenario/sweep")
+async def retirement_scenario_sweep(sweep_request: ScenarioSweepRequest) -> Dict[str, Any]:
+    """은퇴 시나리오 그리드 일괄 계산 (월 생활비 × 추가 저축 × 은퇴 나이 × 기대수명 결과 행렬)"""
+    try:
+        if not fss_client:
+            raise HTTPException(status_code=500, detail="FSS 클라이언트가 초기화되지 않음")
+        
+        user_profile = sweep_request.user_profile
+        grid = sweep_request.grid
+        result = await fss_client.sweep_retirement_scenarios(
+            age=user_profile.age or 40,
+            current_balance=user_profile.current_pension_amount or 0,
+            monthly_living_costs=grid.monthly_living_costs,
+            monthly_savings=grid.additional_savings,
+            retirement_ages=grid.retirement_ages,
+            life_expectancies=grid.life_expectancies,
+            product_types=grid.product_types,
+            risk_preference=user_profile.risk_preference
+        )
+        return {
+            "success": True,
+            "data": result
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"은퇴 시나리오 그리드 계산 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/tax-benefits/batch")
+async def tax_benefits_batch(batch_request: TaxBenefitBatchRequest) -> Dict[str, Any]:
+    """고객 배열의 세액공제 일괄 계산 (입력·결과 모두 필드별 배열, 금액 단위 만원)"""
+    try:
+        result = await asyncio.to_thread(batch_request.calculate)
+        return {
+            "success": True,
+            "total": len(batch_request.monthly_incomes),
+            "data": result
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"세액공제 일괄 계산 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/products/search")
 async def search_products(
     company: str = None,
     product_type: str = None,
     max_fee_rate: float = None,
-    min_earn_rate: float = None
+    min_earn_rate: float = None,
+    sort: str = None,
+    order: str = None,
+    page_size: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str = None
 ) -> Dict[str, Any]:
-    """상품 검색"""
+    """상품 검색 (sort: fee, earn, reserve, launchDate / order: asc, desc / 다음 페이지는 next_cursor 전달)"""
+    if sort is not None and sort not in SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 정렬 기준: {sort}")
+    if order is not None and order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 정렬 방향: {order}")
     try:
         if not fss_client:
             raise HTTPException(status_code=500, detail="FSS 클라이언트가 초기화되지 않음")
         
-        # 전체 상품 데이터 가져오기
-        products_data = await fss_client.get_pension_savings_products()
+        # 데이터 버전별 컨텍스트 (응답이 바뀌지 않으면 재사용)
+        context = await fss_client.get_dataset_context()
         
-        if products_data.get("code") != "000":
+        if context.products_data.get("code") != "000":
             raise HTTPException(status_code=500, detail="상품 데이터 조회 실패")
         
-        products = products_data.get("list", [])
-        
-        # 판매 중인 상품만 필터링
-        filtered_products = [p for p in products if p.get('sells') == 'Y']
-        
-        # 검색 필터 적용
-        if company:
-            filtered_products = [p for p in filtered_products 
-                               if company.lower() in p.get('company', '').lower()]
+        # 데이터 버전별 검색 인덱스로 판매 중인 상품 검색
+        table = context.product_table
+        matched = context.search_index.search(company, product_type, max_fee_rate, min_earn_rate)
         
-        if product_type:
-            filtered_products = [p for p in filtered_products 
-                               if product_type.lower() in p.get('productType', '').lower()]
-        
-        if max_fee_rate is not None:
-            filtered_products = [p for p in filtered_products 
-                               if p.get('avgFeeRate3', 999) <= max_fee_rate]
-        
-        if min_earn_rate is not None:
-            filtered_products = [p for p in filtered_products 
-                               if p.get('avgEarnRate3', -999) >= min_earn_rate]
+        # 캐시된 정렬 순서로 한 페이지만 잘라냄
+        try:
+            page = paginate(
+                table, matched, context.version,
+                sort=sort,
+                descending=None if order is None else order == "desc",
+                page_size=page_size,
+                cursor=cursor,
+                fingerprint=query_fingerprint(
+                    company=company, product_type=product_type,
+                    max_fee_rate=max_fee_rate, min_earn_rate=min_earn_rate
+                )
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         # 결과 포맷팅
         result = []
-        for product in filtered_products[:50]:  # 최대 50개 결과
+        for row in page["rows"]:
+            product = table.rows[row]
             result.append({
                 "company": product.get("company"),
                 "product": product.get("product"),
@@ -227,18 +345,49 @@ async def search_products(
             "success": True,
             "data": result,
             "total": len(result),
+            "total_matched": page["total"],
+            "next_cursor": page["next_cursor"],
             "filters": {
                 "company": company,
                 "product_type": product_type,
                 "max_fee_rate": max_fee_rate,
-                "min_earn_rate": min_earn_rate
+                "min_earn_rate": min_earn_rate,
+                "sort": sort,
+                "order": order
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"상품 검색 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/names/search")
+async def search_names(q: str, kind: str = "company", limit: int = 10) -> Dict[str, Any]:
+    """회사명/상품명 유사도 검색 (오타·띄어쓰기·일부 입력 허용)"""
+    if kind not in ("company", "product"):
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 검색 대상: {kind}")
+    try:
+        if not fss_client:
+            raise HTTPException(status_code=500, detail="FSS 클라이언트가 초기화되지 않음")
+
+        context = await fss_client.get_dataset_context()
+        index = context.company_name_index if kind == "company" else context.product_name_index
+        matches = index.search(q, limit=min(max(limit, 1), 50))
+
+        return {
+            "success": True,
+            "data": [{"name": name, "score": score} for name, score in matches],
+            "total": len(matches),
+            "query": q,
+            "kind": kind
+        }
+
+    except Exception as e:
+        logger.error(f"이름 검색 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 if __name__ == "__main__":
     # 개발 서버 실행
     import uvicorn
@@ -0,0 +1,55 @@
+"""
+웹 클라이언트 테스트 공용 fixture (가짜 FSS API와 임시 스냅샷 저장소를 쓰는 클라이언트)
+"""
+
+import asyncio
+
+import pytest
+
+from fss_pension_common.response_cache import ResponseCache
+from fss_pension_common.snapshot_store import SnapshotStore
+from core.fss_client import FSSPensionClient
+
+
+class FakeFSS:
+    """엔드포인트별 응답을 돌려주는 가짜 FSS API (호출 기록)
+
+    responses 값이 callable이면 params로 호출한 결과, list면 호출 순서대로의 응답입니다.
+    """
+
+    def __init__(self, responses, delay: float = 0.0):
+        self.responses = responses
+        self.delay = delay
+        self.calls = []
+
+    async def __call__(self, endpoint, params):
+        self.calls.append((endpoint, dict(params)))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        response = self.responses.get(endpoint, {"error": f"응답 없음: {endpoint}", "code": "999"})
+        if callable(response):
+            return response(params)
+        if isinstance(response, list):
+            count = sum(1 for called, _ in self.calls if called == endpoint)
+            return response[min(count, len(response)) - 1]
+        return response
+
+    def count(self, endpoint):
+        """endpoint 호출 횟수"""
+        return sum(1 for called, _ in self.calls if called == endpoint)
+
+
+@pytest.fixture
+def make_fss_client(tmp_path):
+    """make_fss_client(responses, offline=False, delay=0) → 가짜 FSS API를 쓰는 웹 클라이언트"""
+
+    def make(responses, offline=False, delay=0.0):
+        client = FSSPensionClient(
+            "TEST_KEY", cache=ResponseCache(), snapshot_store=SnapshotStore(str(tmp_path / "snapshots.db")),
+            offline=offline
+        )
+        client.fake = FakeFSS(responses, delay)
+        client._fetch_api_response = client.fake
+        return client
+
+    return make
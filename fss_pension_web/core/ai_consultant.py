@@ -3,13 +3,16 @@
 AI 연금 상담사 - OpenAI GPT를 활용한 연금 전문 상담 서비스
 """
 
+import asyncio
 import os
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
 
-from openai import AsyncOpenAI
+from fss_pension_common.http_pool import get_openai_client
+from fss_pension_common.retirement_projection import project_retirement, return_distribution
+
 from .fss_client import FSSPensionClient
 
 logger = logging.getLogger(__name__)
@@ -18,7 +21,7 @@ class PensionAIConsultant:
     """AI 연금 상담사"""
     
     def __init__(self, openai_api_key: str, fss_service_key: str):
-        self.openai_client = AsyncOpenAI(api_key=openai_api_key)
+        self.openai_client = get_openai_client(openai_api_key)
         self.fss_client = FSSPensionClient(fss_service_key)
         self.conversation_history = {}  # 사용자별 대화 히스토리
         
@@ -58,10 +61,11 @@ class PensionAIConsultant:
     async def get_market_context(self) -> str:
         """현재 연금 시장 컨텍스트 생성"""
         try:
-            # 최신 시장 데이터 조회
-            market_summary = await self.fss_client.get_market_summary()
-            low_fee_products = await self.fss_client.analyze_low_fee_products(limit=5)
-            company_ranking = await self.fss_client.analyze_company_ranking()
+            # 최신 시장 데이터 조회 (데이터셋은 한 번만 조회하고 모든 분석이 공유)
+            context = await self.fss_client.get_dataset_context()
+            market_summary = await self.fss_client.get_market_summary(context=context)
+            low_fee_products = await self.fss_client.analyze_low_fee_products(limit=5, context=context)
+            company_ranking = await self.fss_client.analyze_company_ranking(context=context)
             
             context = f"""
             ## 현재 연금 시장 현황 (2023년 4분기 기준)
@@ -215,8 +219,9 @@ class PensionAIConsultant:
         """개인 맞춤형 연금 추천 생성"""
         try:
             # FSS 데이터 기반 분석
-            low_fee_products = await self.fss_client.analyze_low_fee_products(limit=10)
-            market_summary = await self.fss_client.get_market_summary()
+            context = await self.fss_client.get_dataset_context()
+            low_fee_products = await self.fss_client.analyze_low_fee_products(limit=10, context=context)
+            market_summary = await self.fss_client.get_market_summary(context=context)
             
             # AI 추천 요청
             recommendation_prompt = f"""
@@ -266,11 +271,47 @@ class PensionAIConsultant:
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def project_retirement_scenario(self, user_profile: Dict[str, Any], scenario: Dict[str, Any]) -> Dict[str, Any]:
+        """은퇴 시나리오 수치 계산 (FSS 수익률 분포 기반 몬테카를로 시뮬레이션, 이벤트 루프 밖에서 실행)"""
+        context = await self.fss_client.get_dataset_context()
+        distribution = return_distribution(
+            context.product_table,
+            product_types=scenario.get('product_types'),
+            risk_preference=user_profile.get('risk_preference')
+        )
+        projection = await asyncio.to_thread(
+            project_retirement,
+            age=user_profile.get('age') or 40,
+            retirement_age=user_profile.get('target_retirement_age') or 65,
+            life_expectancy=scenario.get('life_expectancy') or 85,
+            current_balance=user_profile.get('current_pension_amount') or 0,
+            monthly_savings=scenario.get('additional_savings') or 0,
+            monthly_living_cost=scenario.get('monthly_living_cost') or 300,
+            mean_return=distribution['mean'],
+            volatility=distribution['volatility']
+        )
+        projection['return_distribution'] = distribution
+        return projection
+    
     async def analyze_retirement_scenario(self, user_profile: Dict[str, Any], scenario: Dict[str, Any]) -> Dict[str, Any]:
-        """은퇴 시나리오 분석"""
+        """은퇴 시나리오 분석 (수치는 시뮬레이션으로 계산하고 AI는 해설만 담당)"""
+        try:
+            projection = await self.project_retirement_scenario(user_profile, scenario)
+        except Exception as e:
+            logger.error(f"은퇴 시나리오 계산 실패: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        balance = projection['balance_at_retirement']
+        depletion = projection['depletion_age']
+        additional = projection['additional_monthly_savings']
         try:
             analysis_prompt = f"""
-            다음 고객의 은퇴 시나리오를 분석해주세요:
+            다음 고객의 은퇴 시나리오 시뮬레이션 결과를 해설해주세요.
+            아래 수치는 이미 계산된 값이므로 다시 계산하거나 바꾸지 말고 그대로 인용하세요.
             
             **기본 정보:**
             - 현재 나이: {user_profile.get('age')}세
@@ -283,13 +324,20 @@ class PensionAIConsultant:
             - 연금 외 추가 저축: {scenario.get('additional_savings', 0)}만원/월
             - 예상 수명: {scenario.get('life_expectancy', 85)}세
             
-            **분석 요청:**
+            **시뮬레이션 결과 ({projection['assumptions']['paths']}개 수익률 경로, 현재 가치 기준):**
+            - 기대수명까지 자금 유지 확률: {projection['success_rate'] * 100:.1f}%
+            - 은퇴 시점 예상 적립금: 하위 10% {balance['p10']}만원 / 중간값 {balance['p50']}만원 / 상위 10% {balance['p90']}만원
+            - 필요 자금({projection['target_success_rate'] * 100:.0f}% 신뢰수준): {projection['required_capital']}만원
+            - 부족 금액(중간값 기준): {projection['shortfall']}만원
+            - 목표 달성을 위한 추가 월 저축액: {f"{additional}만원" if additional is not None else "해당 없음 (이미 은퇴 나이)"}
+            - 자금 고갈 시 예상 나이(중간값): {f"{depletion['p50']}세" if depletion else "고갈 경로 없음"}
+            - 가정: 연 실질 기대수익률 {(projection['assumptions']['mean_return'] - projection['assumptions']['inflation']) * 100:.2f}%, 변동성 {projection['assumptions']['volatility'] * 100:.2f}% (FSS 상품 {projection['return_distribution']['products']}개 수익률 기준)
+            
+            **해설 요청:**
             1. 현재 계획으로 목표 달성 가능성
-            2. 부족한 금액과 추가 저축 필요액
+            2. 부족 금액과 추가 저축 필요액의 의미
             3. 구체적인 실행 방안
             4. 위험 요소 및 대안책
-            
-            수치적 계산과 함께 실현 가능한 조언을 제공해주세요.
             """
             
             response = await self.openai_client.chat.completions.create(
@@ -300,24 +348,22 @@ class PensionAIConsultant:
                     )},
                     {"role": "user", "content": analysis_prompt}
                 ],
-                max_tokens=2000,
-                temperature=0.3  # 더 정확한 계산을 위해 낮은 temperature
+                max_tokens=1200,
+                temperature=0.3
             )
-            
-            return {
-                "success": True,
-                "analysis": response.choices[0].message.content,
-                "scenario": scenario,
-                "timestamp": datetime.now().isoformat()
-            }
-            
+            analysis = response.choices[0].message.content
         except Exception as e:
-            logger.error(f"은퇴 시나리오 분석 실패: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
+            # 해설 생성에 실패해도 계산 결과는 반환
+            logger.error(f"은퇴 시나리오 해설 생성 실패: {e}")
+            analysis = None
+        
+        return {
+            "success": True,
+            "analysis": analysis,
+            "projection": projection,
+            "scenario": scenario,
+            "timestamp": datetime.now().isoformat()
+        }
     
     def clear_conversation_history(self, user_id: str):
         """대화 히스토리 초기화"""
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+퇴직연금 맞춤형 수수료 사전 계산 행렬
+
+rpCorpCustomFeeList.json의 제도유형(sysType) × 가입기간(term) × 적립금(reserve) 그리드를
+동시 실행 수를 제한하여 미리 조회하고, 회사별 수수료 필드를 하나의 밀집 배열
+(제도유형 × 가입기간 × 적립금 × 회사 × 필드)에 저장합니다.
+수수료 비교 요청은 FSS를 기다리지 않고 배열 조회로 응답하며,
+그리드 사이의 적립금은 인접한 두 적립금 구간에서 수수료 필드(INTERPOLATED_FIELDS)만 선형 보간합니다.
+순위·코드 등 그 밖의 필드는 보간하지 않고 인접 구간 응답의 값을 그대로 사용합니다.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fss_pension_common.name_index import normalize_name
+
+logger = logging.getLogger(__name__)
+
+CUSTOM_FEE_ENDPOINT = "rpCorpCustomFeeList.json"
+
+
+def _grid(name: str, default: str) -> Tuple[str, ...]:
+    return tuple(value.strip() for value in os.getenv(name, default).split(",") if value.strip())
+
+
+# 조회 그리드: 제도유형 (1: DB, 2: DC, 3: IRP), 가입기간 (년), 적립금 (백만원, 오름차순)
+CUSTOM_FEE_SYS_TYPES = _grid("FSS_CUSTOM_FEE_SYS_TYPES", "1,2,3")
+CUSTOM_FEE_TERMS = _grid("FSS_CUSTOM_FEE_TERMS", "1,3,5,10")
+CUSTOM_FEE_RESERVES = _grid("FSS_CUSTOM_FEE_RESERVES", "10,30,50,100,300,500,1000")
+# 그리드 조회 동시 실행 수
+CUSTOM_FEE_CONCURRENCY = int(os.getenv("FSS_CUSTOM_FEE_CONCURRENCY", "4"))
+# 행렬 생성이 실패(정상 응답 구간 없음)한 뒤 다시 시도하기까지의 최소 간격 (초)
+CUSTOM_FEE_RETRY_INTERVAL = int(os.getenv("FSS_CUSTOM_FEE_RETRY_INTERVAL", "300"))
+
+# 적립금 구간 사이에서 선형 보간하는 필드 (수수료율·수수료 금액)
+INTERPOLATED_FIELDS = _grid(
+    "FSS_CUSTOM_FEE_INTERPOLATED_FIELDS",
+    "totalFee,totalFeeRate,operFee,operFeeRate,assetFee,assetFeeRate,fundFee,fundFeeRate"
+)
+
+# 회사 식별 필드
+ENTITY_FIELDS = ("area", "company")
+
+FetchFunc = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+Row = Dict[str, Any]
+
+
+def grid_requests(sys_types: Sequence[str] = CUSTOM_FEE_SYS_TYPES, terms: Sequence[str] = CUSTOM_FEE_TERMS,
+                  reserves: Sequence[str] = CUSTOM_FEE_RESERVES) -> List[Dict[str, str]]:
+    """그리드 전체 조회 파라미터 (제도유형 → 가입기간 → 적립금 순)"""
+    return [
+        {"sysType": sys_type, "term": term, "reserve": reserve}
+        for sys_type in sys_types for term in terms for reserve in reserves
+    ]
+
+
+def _entity_key(row: Row) -> Tuple[str, ...]:
+    return tuple(normalize_name(str(row.get(field) or "")) for field in ENTITY_FIELDS)
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def _rows(data: Any) -> Optional[List[Row]]:
+    """정상 응답의 list 항목 (오류 응답이면 None)"""
+    if not isinstance(data, dict) or data.get("code") != "000":
+        return None
+    return data.get("list") or []
+
+
+class CustomFeeMatrix:
+    """맞춤형 수수료 그리드 밀집 배열
+
+    values: (제도유형, 가입기간, 적립금, 회사, 보간 필드) 수치 (값이 없으면 NaN)
+    available: (제도유형, 가입기간, 적립금) 정상 응답 여부
+    rows: 구간별 {회사 번호: 원본 행} (보간 결과 행의 바탕)
+    """
+
+    def __init__(self, sys_types: Sequence[str], terms: Sequence[str], reserves: Sequence[str],
+                 responses: Dict[Tuple[str, str, str], Dict[str, Any]],
+                 interpolated_fields: Sequence[str] = INTERPOLATED_FIELDS):
+        self.sys_types = tuple(sys_types)
+        self.terms = tuple(terms)
+        self.reserve_labels = tuple(reserves)
+        self.reserves = np.array([float(value) for value in reserves], dtype=np.float64)
+        if np.any(np.diff(self.reserves) <= 0):
+            raise ValueError("적립금 그리드는 오름차순이어야 합니다")
+        self.built_at = time.time()
+
+        shape = (len(self.sys_types), len(self.terms), len(self.reserves))
+        self.available = np.zeros(shape, dtype=bool)
+        self.payloads: Dict[Tuple[int, int, int], Dict[str, Any]] = {}
+        self.rows: Dict[Tuple[int, int, int], Dict[int, Row]] = {}
+        entities: Dict[Tuple[str, ...], int] = {}
+        fields: Dict[str, None] = {}
+        allowed = frozenset(interpolated_fields) - frozenset(ENTITY_FIELDS)
+
+        for (sys_type, term, reserve), data in responses.items():
+            rows = _rows(data)
+            if rows is None:
+                continue
+            cell = (self.sys_types.index(sys_type), self.terms.index(term), self.reserve_labels.index(reserve))
+            self.available[cell] = True
+            self.payloads[cell] = data
+            by_entity: Dict[int, Row] = {}
+            for row in rows:
+                entity = entities.setdefault(_entity_key(row), len(entities))
+                if entity in by_entity:
+                    continue
+                by_entity[entity] = row
+                for name, value in row.items():
+                    if name in allowed and _number(value) is not None:
+                        fields.setdefault(name)
+            self.rows[cell] = by_entity
+
+        self.entities = list(entities)
+        self.fields = tuple(fields)
+        self.values = np.full(shape + (len(self.entities), len(self.fields)), np.nan)
+        for cell, by_entity in self.rows.items():
+            for entity, row in by_entity.items():
+                for f, name in enumerate(self.fields):
+                    number = _number(row.get(name))
+                    if number is not None:
+                        self.values[cell + (entity, f)] = number
+
+    @property
+    def cells(self) -> int:
+        return int(self.available.size)
+
+    def stats(self) -> Dict[str, Any]:
+        """행렬 상태"""
+        return {
+            "cells": self.cells,
+            "available": int(self.available.sum()),
+            "companies": len(self.entities),
+            "fields": list(self.fields),
+            "grid": {
+                "sysType": list(self.sys_types),
+                "term": list(self.terms),
+                "reserve": list(self.reserve_labels),
+            },
+            "built_at": self.built_at,
+        }
+
+    def lookup(self, sys_type: str, term: str, reserve: str) -> Optional[Dict[str, Any]]:
+        """그리드 조회 (FSS 응답과 같은 형식, 그리드로 답할 수 없으면 None)
+
+        적립금이 그리드 값이면 저장된 응답을 그대로 반환하고, 두 그리드 값 사이면
+        회사별 보간 필드를 선형 보간합니다 (두 구간 값이 같은 필드와 보간 대상이 아닌 필드는 아래 구간(그 회사가 없으면 위 구간) 값 유지).
+        제도유형·가입기간이 그리드에 없거나, 적립금이 그리드 범위 밖이거나, 필요한 구간 응답이 없으면 None입니다.
+        """
+        sys_type, term = str(sys_type).strip(), str(term).strip()
+        amount = _number(reserve)
+        if sys_type not in self.sys_types or term not in self.terms or amount is None:
+            return None
+        if not self.reserves[0] <= amount <= self.reserves[-1]:
+            return None
+        s, t = self.sys_types.index(sys_type), self.terms.index(term)
+
+        upper = int(np.searchsorted(self.reserves, amount))
+        if self.reserves[upper] == amount:
+            return self.payloads.get((s, t, upper))
+        lower = upper - 1
+        if not (self.available[s, t, lower] and self.available[s, t, upper]):
+            return None
+
+        low, high = self.values[s, t, lower], self.values[s, t, upper]  # 회사 × 필드
+        weight = (amount - self.reserves[lower]) / (self.reserves[upper] - self.reserves[lower])
+        interpolated = low + (high - low) * weight
+        changed = ~np.isclose(low, high, equal_nan=True)
+        lower_rows, upper_rows = self.rows[(s, t, lower)], self.rows[(s, t, upper)]
+
+        rows = []
+        for entity in list(lower_rows) + [entity for entity in upper_rows if entity not in lower_rows]:
+            row = dict(lower_rows.get(entity) or upper_rows[entity])
+            for f in np.flatnonzero(changed[entity]):
+                name, value = self.fields[f], interpolated[entity, f]
+                if np.isnan(value):
+                    row[name] = None
+                else:
+                    # FSS 응답과 같은 표기 (문자열이면 문자열)
+                    value = round(float(value), 4)
+                    row[name] = str(value) if isinstance(row.get(name), str) else value
+            rows.append(row)
+
+        return {
+            "code": "000",
+            "message": "정상",
+            "count": len(rows),
+            "list": rows,
+            "interpolated": {
+                "reserve": amount,
+                "between": [self.reserve_labels[lower], self.reserve_labels[upper]],
+                "weight": round(float(weight), 4),
+            },
+        }
+
+
+async def build_custom_fee_matrix(fetch: FetchFunc,
+                                  sys_types: Sequence[str] = CUSTOM_FEE_SYS_TYPES,
+                                  terms: Sequence[str] = CUSTOM_FEE_TERMS,
+                                  reserves: Sequence[str] = CUSTOM_FEE_RESERVES,
+                                  concurrency: int = CUSTOM_FEE_CONCURRENCY) -> CustomFeeMatrix:
+    """그리드 전체를 동시 실행 수를 제한하여 조회한 뒤 행렬 생성
+
+    fetch(endpoint, params)는 FSS 응답 dict를 반환해야 합니다. 실패한 구간은 비어 있는 칸으로 남습니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(params: Dict[str, str]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return await fetch(CUSTOM_FEE_ENDPOINT, params)
+            except Exception as e:
+                logger.warning(f"맞춤형 수수료 그리드 조회 실패 ({params}): {e}")
+                return {"error": str(e), "code": "999", "message": "API 호출 실패"}
+
+    requests = grid_requests(sys_types, terms, reserves)
+    results = await asyncio.gather(*(run(params) for params in requests))
+    responses = {
+        (params["sysType"], params["term"], params["reserve"]): data
+        for params, data in zip(requests, results)
+    }
+    matrix = await asyncio.to_thread(CustomFeeMatrix, sys_types, terms, reserves, responses)
+    logger.info(f"맞춤형 수수료 행렬 생성 완료: {int(matrix.available.sum())}/{matrix.cells}개 구간, "
+                f"회사 {len(matrix.entities)}개")
+    return matrix
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+FSS 데이터셋 컨텍스트
+
+한 데이터 버전(연도/분기)의 상품·회사·통계 응답을 묶어 한 번만 파싱하고,
+분석 함수들이 공유하는 파생 뷰를 제공합니다.
+"""
+
+import json
+import zlib
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, List, Tuple
+
+from fss_pension_common.name_index import NameIndex, normalize_name
+from fss_pension_common.quarter_diff import company_rank_moves, pair_rows, product_diff
+
+from .product_table import CompanyTable, ProductTable
+from .rankings import TableRankings, product_rankings
+from .search_index import ProductSearchIndex
+
+
+def _rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """정상 응답의 list 항목 (오류 응답이면 빈 리스트)"""
+    if not isinstance(data, dict) or data.get("code") != "000":
+        return []
+    return data.get("list") or []
+
+
+@dataclass(eq=False)
+class DatasetContext:
+    """데이터 버전별 FSS 데이터셋 묶음
+
+    원본 응답은 캐시와 공유되므로 수정하지 않으며, 파생 뷰는 처음 접근할 때 한 번만 계산됩니다.
+    """
+    year: str
+    quarter: str
+    products_data: Dict[str, Any]
+    companies_data: Dict[str, Any]
+    stats_data: Dict[str, Any]
+    _area_rankings: Dict[str, Tuple[Dict[str, Any], TableRankings]] = field(default_factory=dict, repr=False)
+    _diffs: Dict[str, Dict[str, Any]] = field(default_factory=dict, repr=False)
+
+    def is_same_version(self, products_data: Dict[str, Any], companies_data: Dict[str, Any],
+                        stats_data: Dict[str, Any]) -> bool:
+        """같은 응답 객체로 만들어진 컨텍스트인지 확인"""
+        return (self.products_data is products_data
+                and self.companies_data is companies_data
+                and self.stats_data is stats_data)
+
+    @cached_property
+    def version(self) -> str:
+        """상품 데이터 버전 식별자 (내용 기반이므로 프로세스가 달라도 같은 데이터면 같은 값)"""
+        raw = json.dumps(self.products, ensure_ascii=False, sort_keys=True, default=str)
+        return f"{self.year}Q{self.quarter}-{zlib.crc32(raw.encode('utf-8')):08x}"
+
+    @cached_property
+    def products(self) -> List[Dict[str, Any]]:
+        """전체 상품"""
+        return _rows(self.products_data)
+
+    @cached_property
+    def selling_products(self) -> List[Dict[str, Any]]:
+        """판매 중인 상품"""
+        return [self.products[i] for i in self.product_table.selling]
+
+    @cached_property
+    def companies(self) -> List[Dict[str, Any]]:
+        """전체 회사"""
+        return _rows(self.companies_data)
+
+    @cached_property
+    def statistics(self) -> List[Dict[str, Any]]:
+        """연금 통계"""
+        return _rows(self.stats_data)
+
+    @cached_property
+    def product_table(self) -> ProductTable:
+        """전체 상품 컬럼형 테이블"""
+        return ProductTable(self.products)
+
+    @cached_property
+    def company_table(self) -> CompanyTable:
+        """전체 회사 컬럼형 테이블"""
+        return CompanyTable(self.companies)
+
+    @cached_property
+    def company_name_index(self) -> NameIndex:
+        """회사명 유사도 검색 인덱스 (상품·회사 목록의 회사명)"""
+        return NameIndex(list(self.product_table["company"]) + list(self.company_table["company"]))
+
+    @cached_property
+    def product_name_index(self) -> NameIndex:
+        """상품명 유사도 검색 인덱스"""
+        return NameIndex(self.product_table["product"])
+
+    @cached_property
+    def search_index(self) -> ProductSearchIndex:
+        """상품 검색 인덱스"""
+        return ProductSearchIndex(self.product_table, self.company_name_index)
+
+    @cached_property
+    def product_rankings(self) -> TableRankings:
+        """판매 중인 상품 순위"""
+        return product_rankings(self.product_table)
+
+    @cached_property
+    def company_rankings(self) -> TableRankings:
+        """전체 회사 순위"""
+        return TableRankings(self.company_table)
+
+    def area_company_rankings(self, area_code: str, companies_data: Dict[str, Any]) -> TableRankings:
+        """권역별 회사 순위 (같은 응답 객체면 이전 순위 재사용)"""
+        cached = self._area_rankings.get(area_code)
+        if cached is None or cached[0] is not companies_data:
+            cached = (companies_data, TableRankings(CompanyTable(_rows(companies_data))))
+            self._area_rankings[area_code] = cached
+        return cached[1]
+
+    def quarter_diff(self, previous: "DatasetContext") -> Dict[str, Any]:
+        """previous 데이터 버전 대비 변화 (데이터 버전 조합별로 한 번만 계산)
+
+        상품은 (회사명, 상품명), 회사는 (권역, 회사명)의 정규화 이름으로 짝지어 비교합니다.
+        """
+        cached = self._diffs.get(previous.version)
+        if cached is None:
+            products = pair_rows(
+                previous.products, self.products,
+                lambda row: (normalize_name(row.get("company") or ""), normalize_name(row.get("product") or ""))
+            )
+            companies = pair_rows(
+                previous.companies, self.companies,
+                lambda row: (row.get("area") or "", normalize_name(row.get("company") or ""))
+            )
+            cached = {
+                "period": f"{self.year}년 {self.quarter}분기",
+                "compared_with": f"{previous.year}년 {previous.quarter}분기",
+                "products": product_diff(products),
+                "company_ranks": company_rank_moves(companies)
+            }
+            # 이전 데이터 버전과의 비교 결과만 유지
+            self._diffs = {previous.version: cached}
+        return cached
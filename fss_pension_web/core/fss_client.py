@@ -5,26 +5,86 @@
 
 import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlencode
 
 import httpx
+import numpy as np
 import pandas as pd
 
+from fss_pension_common.http_pool import get_http_client
+from fss_pension_common.quarter_diff import next_quarter, previous_quarter
+from fss_pension_common.refresh import REFRESH_RECENT_WINDOW
+from fss_pension_common.response_cache import REMOVED, UPDATED, CacheEntry, ResponseCache, get_shared_cache, is_cacheable, make_cache_key
+from fss_pension_common.retirement_projection import MAX_SWEEP_CELLS, return_distribution, sweep_retirement
+from fss_pension_common.snapshot_store import OFFLINE_MODE, SnapshotStore, get_shared_snapshot_store
+from fss_pension_common.transport import ResilientTransport
+
+from .custom_fee_matrix import (CUSTOM_FEE_ENDPOINT, CUSTOM_FEE_RETRY_INTERVAL, CustomFeeMatrix,
+                                build_custom_fee_matrix)
+from .dataset import DatasetContext
+
 logger = logging.getLogger(__name__)
 
+# 스냅샷 저장소 기본 경로 (FSS_SNAPSHOT_PATH로 변경)
+DEFAULT_SNAPSHOT_PATH = str(Path(__file__).resolve().parent.parent / "data" / "fss_snapshots.db")
+
+# 사전 갱신 기본 대상 (웹 서비스가 사용하는 데이터셋)
+DEFAULT_REFRESH_REQUESTS = [
+    ("psProdList.json", {"year": "2023", "quarter": "4"}),
+    ("psCorpList.json", {"year": "2023", "quarter": "4"}),
+    ("pensionStat.json", {}),
+    ("rpCorpCustomFeeList.json", {"sysType": "2", "term": "5", "reserve": "50"}),
+]
+
+# 서버 시작 시 미리 계산하는 분기 변화 (기본 조회 기간)
+DEFAULT_DIFF_PERIODS = [("2023", "4")]
+
+# 분기 변화 계산에 쓰이는 데이터셋 (응답이 바뀌면 해당 분기 변화를 다시 계산)
+DIFF_SOURCE_ENDPOINTS = ("psProdList.json", "psCorpList.json")
+
 class FSSPensionClient:
     """금융감독원 연금 정보 API 클라이언트"""
     
-    def __init__(self, service_key: str):
+    def __init__(self, service_key: str, cache: Optional[ResponseCache] = None,
+                 snapshot_store: Optional[SnapshotStore] = None, offline: bool = OFFLINE_MODE,
+                 http_client: Optional[httpx.AsyncClient] = None):
         self.service_key = service_key
         self.base_url = "https://www.fss.or.kr/openapi/api"
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = http_client or get_http_client("fss")
+        self.transport = ResilientTransport(self.client)
+        self.cache = cache or get_shared_cache()
+        self.snapshot_store = snapshot_store or get_shared_snapshot_store(DEFAULT_SNAPSHOT_PATH)
+        self.offline = offline
+        self._contexts: Dict[tuple, DatasetContext] = {}  # (연도, 분기)별 최신 데이터셋 컨텍스트
+        self.custom_fee_matrix: Optional[CustomFeeMatrix] = None  # 맞춤형 수수료 사전 계산 행렬
+        self._diff_periods: set = set()  # 분기 변화를 계산해 둔 (연도, 분기)
+        self._diff_tasks: Dict[tuple, asyncio.Task] = {}  # 데이터 갱신에 따른 분기 변화 재계산 작업
+        self._matrix_task: Optional[asyncio.Task] = None  # 맞춤형 수수료 행렬 백그라운드 생성 작업
+        self._matrix_dirty = False  # 생성 중에 그리드 응답이 바뀌었는지 (끝난 뒤 한 번 더 생성)
+        self._matrix_failed_at = float("-inf")  # 마지막 행렬 생성 실패 시각 (monotonic)
+        self.cache.add_listener(self._on_dataset_update)
         
     async def close(self):
-        """클라이언트 연결 종료"""
-        await self.client.aclose()
+        """캐시 리스너와 진행 중인 백그라운드 작업(캐시 갱신·분기 변화 재계산·수수료 행렬 생성)을 정리하고
+        데이터셋 컨텍스트·수수료 행렬 해제
+        
+        공유 연결 풀은 프로세스 종료 시 close_http_clients()로 정리합니다.
+        """
+        self.cache.remove_listener(self._on_dataset_update)
+        tasks = [task for task in [*self._diff_tasks.values(), self._matrix_task] if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._diff_tasks.clear()
+        self._matrix_task = None
+        self._diff_periods.clear()
+        await self.cache.close()
+        self._contexts.clear()
+        self.custom_fee_matrix = None
     
     def _build_api_url(self, endpoint: str, params: Dict[str, Any]) -> str:
         """API URL 생성"""
@@ -36,13 +96,46 @@ class FSSPensionClient:
         return f"{url}?{query_string}"
     
     async def _make_api_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """API 요청 실행"""
+        """API 요청 실행 (응답 캐시 경유)"""
+        return await self.cache.get_or_fetch(
+            endpoint, params, lambda: self._load_dataset(endpoint, params)
+        )
+    
+    async def _load_dataset(self, endpoint: str, params: Dict[str, Any], force: bool = False) -> Dict[str, Any]:
+        """스냅샷 저장소 → FSS API 순으로 데이터 조회
+        
+        - 오프라인 모드: 스냅샷만 사용
+        - 스냅샷이 엔드포인트 TTL 이내: 네트워크 호출 없이 스냅샷 사용 (force=True면 API 호출)
+        - API 호출 실패: 저장된 스냅샷으로 대체
+        """
+        snapshot = None
+        if self.snapshot_store:
+            snapshot = await self.snapshot_store.aload(endpoint, params)
+        
+        if self.offline:
+            if snapshot:
+                return snapshot.payload
+            return {"error": "오프라인 모드: 저장된 스냅샷 없음", "code": "999", "message": "API 호출 실패"}
+        
+        if not force and snapshot and snapshot.age < self.cache.ttl_for(endpoint):
+            return snapshot.payload
+        
+        data = await self._fetch_api_response(endpoint, params)
+        if is_cacheable(data):
+            if self.snapshot_store:
+                await self.snapshot_store.asave(endpoint, params, data)
+        elif snapshot:
+            logger.warning(f"API 호출 실패, 저장된 스냅샷 사용: {endpoint} ({snapshot.year}/{snapshot.quarter})")
+            return snapshot.payload
+        return data
+    
+    async def _fetch_api_response(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """FSS API 직접 호출"""
         try:
             url = self._build_api_url(endpoint, params)
             logger.info(f"API 요청: {url}")
             
-            response = await self.client.get(url)
-            response.raise_for_status()
+            response = await self.transport.get(url, endpoint)
             
             data = response.json()
             logger.info(f"API 응답: {data.get('message', 'Unknown')}, 데이터 수: {data.get('count', 0)}")
@@ -52,6 +145,21 @@ class FSSPensionClient:
             logger.error(f"API 요청 실패: {e}")
             return {"error": str(e), "code": "999", "message": "API 호출 실패"}
     
+    def refresh_requests(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """사전 갱신 대상 목록 (기본 대상 + 최근 REFRESH_RECENT_WINDOW 안에 조회된 캐시 요청)"""
+        requests = {}
+        for endpoint, params in DEFAULT_REFRESH_REQUESTS + self.cache.cached_requests(REFRESH_RECENT_WINDOW):
+            requests.setdefault(make_cache_key(endpoint, params), (endpoint, params))
+        return list(requests.values())
+    
+    async def refresh_dataset(self, endpoint: str, params: Dict[str, Any], force: bool = True) -> bool:
+        """데이터셋 갱신 (force=False면 캐시/스냅샷을 재사용하여 적재만 수행)"""
+        if not force:
+            return is_cacheable(await self._make_api_request(endpoint, params))
+        return await self.cache.refresh(
+            endpoint, params, lambda: self._load_dataset(endpoint, params, force=True)
+        )
+    
     async def get_pension_savings_companies(self, year: str = "2023", quarter: str = "4", area_code: str = None) -> Dict[str, Any]:
         """연금저축 회사별 수익률·수수료율 조회"""
         params = {"year": year, "quarter": quarter}
@@ -67,37 +175,198 @@ class FSSPensionClient:
         return await self._make_api_request("psProdList.json", params)
     
     async def get_retirement_pension_custom_fee(self, sys_type: str = "2", term: str = "5", reserve: str = "50") -> Dict[str, Any]:
-        """퇴직연금 맞춤형 수수료 비교"""
+        """퇴직연금 맞춤형 수수료 비교
+        
+        사전 계산 행렬로 답할 수 있으면 배열 조회(그리드 사이 적립금은 보간)로 응답하고,
+        행렬이 아직 없거나 그리드 밖의 조건이면 API를 조회합니다.
+        행렬이 없거나 엔드포인트 TTL보다 오래되었으면 백그라운드에서 (다시) 생성합니다.
+        """
+        matrix = self.custom_fee_matrix
+        if matrix is None or time.time() - matrix.built_at > self.cache.ttl_for(CUSTOM_FEE_ENDPOINT):
+            self.schedule_custom_fee_matrix()
+        if matrix is not None:
+            fees = matrix.lookup(sys_type, term, reserve)
+            if fees is not None:
+                return fees
         params = {"sysType": sys_type, "term": term, "reserve": reserve}
-        return await self._make_api_request("rpCorpCustomFeeList.json", params)
+        return await self._make_api_request(CUSTOM_FEE_ENDPOINT, params)
+    
+    async def build_custom_fee_matrix(self) -> Optional[CustomFeeMatrix]:
+        """맞춤형 수수료 그리드 전체 조회 후 행렬 교체 (캐시·스냅샷 경유)
+        
+        정상 응답 구간이 하나도 없으면 기존 행렬을 유지하고 실패 시각을 기록합니다.
+        """
+        matrix = await build_custom_fee_matrix(self._make_api_request)
+        if not matrix.available.any():
+            self._matrix_failed_at = time.monotonic()
+            logger.warning("맞춤형 수수료 행렬 생성 실패: 정상 응답 구간 없음")
+            return self.custom_fee_matrix
+        self.custom_fee_matrix = matrix
+        return matrix
+    
+    def schedule_custom_fee_matrix(self) -> Optional[asyncio.Task]:
+        """맞춤형 수수료 행렬을 백그라운드에서 생성 (사전 갱신 스케줄러와 관계없이 사용)
+        
+        서버 시작 시와 행렬이 필요할 때 호출합니다. 이미 생성 중이면 그 작업을 반환하고,
+        최근 CUSTOM_FEE_RETRY_INTERVAL 안에 실패했거나 실행 중인 이벤트 루프가 없으면 None입니다.
+        """
+        if self._matrix_task is not None and not self._matrix_task.done():
+            return self._matrix_task
+        if time.monotonic() - self._matrix_failed_at < CUSTOM_FEE_RETRY_INTERVAL:
+            return None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        self._matrix_task = loop.create_task(self._rebuild_custom_fee_matrix())
+        return self._matrix_task
+    
+    async def _rebuild_custom_fee_matrix(self):
+        """행렬 생성 (생성 중 그리드 응답이 바뀌었으면 한 번 더 생성)"""
+        while True:
+            self._matrix_dirty = False
+            try:
+                await self.build_custom_fee_matrix()
+            except Exception as e:
+                self._matrix_failed_at = time.monotonic()
+                logger.warning(f"맞춤형 수수료 행렬 생성 실패: {e}")
+                return
+            if not self._matrix_dirty:
+                return
     
     async def get_pension_statistics(self) -> Dict[str, Any]:
         """연금 통계 조회"""
         return await self._make_api_request("pensionStat.json", {})
     
-    async def analyze_low_fee_products(self, limit: int = 10) -> List[Dict[str, Any]]:
+    async def get_dataset_context(self, year: str = "2023", quarter: str = "4") -> DatasetContext:
+        """상품·회사·통계 데이터셋 컨텍스트 조회
+        
+        세 데이터셋을 동시에 조회하고, 응답이 바뀌지 않았다면(같은 데이터 버전)
+        이전에 만든 컨텍스트와 파생 뷰를 그대로 재사용합니다.
+        """
+        products_data, companies_data, stats_data = await asyncio.gather(
+            self.get_pension_savings_products(year, quarter),
+            self.get_pension_savings_companies(year, quarter),
+            self.get_pension_statistics()
+        )
+        
+        key = (year, quarter)
+        context = self._contexts.get(key)
+        if context is None or not context.is_same_version(products_data, companies_data, stats_data):
+            context = DatasetContext(year, quarter, products_data, companies_data, stats_data)
+            self._contexts[key] = context
+        return context
+    
+    async def get_quarter_diff(self, year: str = "2023", quarter: str = "4") -> Dict[str, Any]:
+        """직전 분기 대비 변화 (신규/판매중지 상품, 수수료율·수익률 변화, 회사 순위 변동)
+        
+        두 분기의 데이터 버전이 바뀌지 않았다면 이전에 계산한 결과를 재사용합니다.
+        """
+        previous, current = await asyncio.gather(
+            self.get_dataset_context(*previous_quarter(year, quarter)),
+            self.get_dataset_context(year, quarter)
+        )
+        if not previous.products or not current.products:
+            raise LookupError(f"{year}년 {quarter}분기 또는 직전 분기 상품 데이터가 없습니다")
+        diff = await asyncio.to_thread(current.quarter_diff, previous)
+        self._diff_periods.add((year, quarter))
+        return diff
+    
+    async def precompute_quarter_diffs(self, periods: List[Tuple[str, str]] = DEFAULT_DIFF_PERIODS):
+        """분기 변화 미리 계산 (서버 시작 시 실행해 첫 요청이 계산 비용을 부담하지 않도록 함)
+        
+        한 번 계산한 분기는 이후 원본 데이터가 바뀔 때마다 _on_dataset_update에서 다시 계산합니다.
+        """
+        for year, quarter in periods:
+            try:
+                await self.get_quarter_diff(year, quarter)
+            except Exception as e:
+                logger.warning(f"분기 변화 사전 계산 실패 ({year}년 {quarter}분기): {e}")
+    
+    def _on_dataset_update(self, entry: CacheEntry, event: str):
+        """캐시 리스너: 원본 데이터가 바뀌면 파생 데이터를 백그라운드에서 다시 계산
+        
+        - 상품·회사 데이터: 그 분기와 다음 분기의 변화 (이미 계산해 둔 분기만 대상이므로 업스트림 추가 조회가 연쇄적으로 일어나지 않음)
+        - 맞춤형 수수료 그리드 응답: 이미 만든 수수료 행렬 (행렬 생성 중 처음 적재되는 응답은 제외)
+        
+        캐시에서 제거된 항목(REMOVED)은 원본 데이터가 바뀐 것이 아니므로 무시합니다.
+        """
+        if event == REMOVED:
+            return
+        if entry.endpoint == CUSTOM_FEE_ENDPOINT:
+            if event == UPDATED and self.custom_fee_matrix is not None:
+                if self._matrix_task is not None and not self._matrix_task.done():
+                    self._matrix_dirty = True
+                else:
+                    self.schedule_custom_fee_matrix()
+            return
+        if entry.endpoint not in DIFF_SOURCE_ENDPOINTS or not entry.params:
+            return
+        if set(entry.params) != {"year", "quarter"}:
+            return  # 권역별 조회 등은 분기 변화 계산에 쓰이지 않음
+        period = (str(entry.params["year"]), str(entry.params["quarter"]))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for target in (period, next_quarter(*period)):
+            if target not in self._diff_periods:
+                continue
+            task = self._diff_tasks.get(target)
+            if task is not None and not task.done():
+                continue
+            self._diff_tasks[target] = loop.create_task(self.precompute_quarter_diffs([target]))
+    
+    async def sweep_retirement_scenarios(self, age: int, current_balance: float,
+                                         monthly_living_costs: List[float], monthly_savings: List[float],
+                                         retirement_ages: List[int], life_expectancies: List[int],
+                                         product_types: Optional[List[str]] = None,
+                                         risk_preference: Optional[str] = None) -> Dict[str, Any]:
+        """은퇴 시나리오 그리드 일괄 계산 (FSS 상품 수익률 분포 기반 몬테카를로)
+        
+        시나리오 수가 0이거나 MAX_SWEEP_CELLS를 넘으면 데이터 조회 전에 ValueError를 발생시킵니다.
+        """
+        cells = len(monthly_living_costs) * len(monthly_savings) * len(retirement_ages) * len(life_expectancies)
+        if not cells or cells > MAX_SWEEP_CELLS:
+            raise ValueError(f"시나리오 수는 1~{MAX_SWEEP_CELLS}개여야 합니다 (요청: {cells}개)")
+        context = await self.get_dataset_context()
+        distribution = return_distribution(
+            context.product_table,
+            product_types=product_types,
+            risk_preference=risk_preference
+        )
+        result = await asyncio.to_thread(
+            sweep_retirement,
+            age=age,
+            current_balance=current_balance,
+            monthly_living_costs=monthly_living_costs,
+            monthly_savings=monthly_savings,
+            retirement_ages=retirement_ages,
+            life_expectancies=life_expectancies,
+            mean_return=distribution['mean'],
+            volatility=distribution['volatility']
+        )
+        result['return_distribution'] = distribution
+        return result
+    
+    async def analyze_low_fee_products(self, limit: int = 10, context: Optional[DatasetContext] = None) -> List[Dict[str, Any]]:
         """수수료율 최저가 상품 분석"""
+        return await self.analyze_top_products("low_fee", limit, context)
+    
+    async def analyze_top_products(self, criterion: str = "low_fee", limit: int = 10,
+                                   context: Optional[DatasetContext] = None) -> List[Dict[str, Any]]:
+        """기준별 상위 상품 분석 (low_fee, earn3, earn5, net_return)"""
         try:
-            # 모든 상품 데이터 조회
-            products_data = await self.get_pension_savings_products()
+            context = context or await self.get_dataset_context()
             
-            if products_data.get("code") != "000" or not products_data.get("list"):
-                return []
-            
-            products = products_data["list"]
-            
-            # 판매 중인 상품만 필터링
-            selling_products = [p for p in products if p.get('sells') == 'Y']
-            
-            # 수수료율 기준 정렬 (낮은 순)
-            sorted_products = sorted(
-                selling_products, 
-                key=lambda x: x.get('avgFeeRate3', 999)
-            )
+            # 판매 중인 상품의 데이터 버전별 순위 (값이 없는 상품은 마지막)
+            table = context.product_table
+            top = context.product_rankings.top(criterion, limit)
             
             # 상위 제품들 포맷팅
             result = []
-            for i, product in enumerate(sorted_products[:limit]):
+            for i, row in enumerate(top):
+                product = table.rows[row]
                 result.append({
                     "rank": i + 1,
                     "company": product.get("company", "N/A"),
@@ -105,6 +374,7 @@ class FSSPensionClient:
                     "productType": product.get("productType", "N/A"),
                     "avgFeeRate3": product.get("avgFeeRate3", 0),
                     "avgEarnRate3": product.get("avgEarnRate3", 0),
+                    "avgEarnRate5": product.get("avgEarnRate5", 0),
                     "guarantees": product.get("guarantees") == "Y",
                     "balance": product.get("balance", 0),
                     "reserve": product.get("reserve", 0)
@@ -113,27 +383,30 @@ class FSSPensionClient:
             return result
             
         except Exception as e:
-            logger.error(f"수수료율 분석 실패: {e}")
+            logger.error(f"상품 순위 분석 실패 ({criterion}): {e}")
             return []
     
-    async def analyze_company_ranking(self, area_code: str = None) -> List[Dict[str, Any]]:
-        """회사별 성과 순위 분석"""
+    async def analyze_company_ranking(self, area_code: str = None, context: Optional[DatasetContext] = None,
+                                      criterion: str = "low_fee") -> List[Dict[str, Any]]:
+        """회사별 성과 순위 분석 (기본: 수수료율 낮은 순)"""
         try:
-            companies_data = await self.get_pension_savings_companies(area_code=area_code)
-            
-            if companies_data.get("code") != "000" or not companies_data.get("list"):
-                return []
-            
-            companies = companies_data["list"]
-            
-            # 수수료율 기준 정렬 (낮은 순)
-            sorted_companies = sorted(
-                companies,
-                key=lambda x: x.get('avgFeeRate3', 999)
-            )
+            context = context or await self.get_dataset_context()
+            if area_code:
+                # 권역별 조회는 컨텍스트에 포함되지 않으므로 별도 조회
+                companies_data = await self.get_pension_savings_companies(area_code=area_code)
+                if companies_data.get("code") != "000" or not companies_data.get("list"):
+                    return []
+                rankings = context.area_company_rankings(area_code, companies_data)
+            else:
+                rankings = context.company_rankings
+                if not len(rankings.table):
+                    return []
             
+            # 데이터 버전·권역별로 계산해 둔 순위 사용 (값이 없는 회사는 마지막)
+            table = rankings.table
             result = []
-            for i, company in enumerate(sorted_companies):
+            for i, row in enumerate(rankings.top(criterion)):
+                company = table.rows[row]
                 result.append({
                     "rank": i + 1,
                     "area": company.get("area", "N/A"),
@@ -151,15 +424,10 @@ class FSSPensionClient:
             logger.error(f"회사별 순위 분석 실패: {e}")
             return []
     
-    async def get_market_summary(self) -> Dict[str, Any]:
+    async def get_market_summary(self, context: Optional[DatasetContext] = None) -> Dict[str, Any]:
         """시장 요약 정보"""
         try:
-            # 통계 데이터 조회
-            stats_data = await self.get_pension_statistics()
-            
-            # 상품 데이터로부터 기본 통계 생성
-            products_data = await self.get_pension_savings_products()
-            companies_data = await self.get_pension_savings_companies()
+            context = context or await self.get_dataset_context()
             
             summary = {
                 "totalProducts": 0,
@@ -171,28 +439,30 @@ class FSSPensionClient:
                 "statistics": []
             }
             
-            if products_data.get("code") == "000" and products_data.get("list"):
-                products = [p for p in products_data["list"] if p.get('sells') == 'Y']
-                summary["totalProducts"] = len(products)
+            table = context.product_table
+            sells = table["sells"]
+            summary["totalProducts"] = int(sells.sum())
+            
+            if summary["totalProducts"]:
+                # 값이 없거나 0인 항목은 평균에서 제외
+                fee_rates = table["avgFeeRate3"][sells]
+                fee_rates = fee_rates[np.nan_to_num(fee_rates) != 0]
+                earn_rates = table["avgEarnRate3"][sells]
+                earn_rates = earn_rates[np.nan_to_num(earn_rates) != 0]
                 
-                if products:
-                    fee_rates = [p.get('avgFeeRate3', 0) for p in products if p.get('avgFeeRate3')]
-                    earn_rates = [p.get('avgEarnRate3', 0) for p in products if p.get('avgEarnRate3')]
-                    
-                    if fee_rates:
-                        summary["averageFeeRate"] = round(sum(fee_rates) / len(fee_rates), 2)
-                        summary["lowestFeeRate"] = min(fee_rates)
-                    
-                    if earn_rates:
-                        summary["averageEarnRate"] = round(sum(earn_rates) / len(earn_rates), 2)
-                        summary["highestEarnRate"] = max(earn_rates)
+                if fee_rates.size:
+                    summary["averageFeeRate"] = round(float(fee_rates.mean()), 2)
+                    summary["lowestFeeRate"] = float(fee_rates.min())
+                
+                if earn_rates.size:
+                    summary["averageEarnRate"] = round(float(earn_rates.mean()), 2)
+                    summary["highestEarnRate"] = float(earn_rates.max())
             
-            if companies_data.get("code") == "000" and companies_data.get("list"):
-                summary["totalCompanies"] = len(companies_data["list"])
+            summary["totalCompanies"] = len(context.company_table)
             
-            if stats_data.get("code") == "000" and stats_data.get("list"):
+            if context.statistics:
                 # 최근 3년 통계 데이터만 포함
-                recent_stats = [s for s in stats_data["list"] if int(s.get("year", "0")) >= 2021]
+                recent_stats = [s for s in context.statistics if int(s.get("year", "0")) >= 2021]
                 summary["statistics"] = recent_stats[-6:]  # 최근 6개 데이터포인트
             
             return summary
@@ -207,4 +477,4 @@ class FSSPensionClient:
                 "lowestFeeRate": 0,
                 "highestEarnRate": 0,
                 "statistics": []
-            }
\ No newline at end of file
+            }
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+상품 목록 커서 페이지네이션
+
+데이터 버전별로 캐시된 상품 테이블의 정렬 순서를 사용하여 페이지를 잘라 반환합니다.
+커서에는 데이터 버전, 정렬 기준, 검색 조건 지문, 다음 위치가 담겨 있어
+같은 데이터 버전 안에서는 페이지 사이에 누락이나 중복이 없습니다.
+"""
+
+import base64
+import json
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .product_table import ColumnarTable
+
+# 정렬 기준: 이름 → (정렬 필드, 기본 내림차순 여부)
+SORT_FIELDS: Dict[str, Tuple[str, bool]] = {
+    "fee": ("avgFeeRate3", False),
+    "earn": ("avgEarnRate3", True),
+    "reserve": ("reserve", True),
+    "launchDate": ("launchDate", True),
+}
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    """해석할 수 없거나 현재 조회 조건/데이터 버전과 맞지 않는 커서"""
+
+
+def query_fingerprint(**filters: Any) -> str:
+    """검색 조건 지문 (커서가 다른 검색 조건에 재사용되는 것을 방지)"""
+    raw = json.dumps(filters, sort_keys=True, ensure_ascii=False, default=str)
+    return format(zlib.crc32(raw.encode("utf-8")), "08x")
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError(f"잘못된 커서: {e}")
+    if not isinstance(state, dict) or not isinstance(state.get("p"), int) or state["p"] < 0:
+        raise InvalidCursorError("잘못된 커서")
+    return state
+
+
+def paginate(table: ColumnarTable, rows: np.ndarray, version: str,
+             sort: Optional[str] = None, descending: Optional[bool] = None,
+             page_size: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+             fingerprint: str = "") -> Dict[str, Any]:
+    """rows(행 인덱스)를 정렬하여 한 페이지 반환
+
+    sort가 None이면 원래 행 순서를 유지합니다. 값이 없는 행은 정렬 방향과 관계없이 마지막입니다.
+    반환: {"rows": 페이지 행 인덱스, "next_cursor": 다음 페이지 커서 또는 None, "total": 전체 건수}
+    """
+    if sort is not None and sort not in SORT_FIELDS:
+        raise ValueError(f"지원하지 않는 정렬 기준: {sort}")
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    if sort is None:
+        descending = False
+        ordered = np.sort(rows)
+    else:
+        field, default_descending = SORT_FIELDS[sort]
+        descending = default_descending if descending is None else descending
+        # 전체 정렬 순서는 데이터 버전별로 캐시되어 있으므로 선택된 행만 걸러냄
+        selected = np.zeros(len(table), dtype=bool)
+        selected[rows] = True
+        order = table.sorted_rows(field, descending)
+        ordered = order[selected[order]]
+
+    start = 0
+    if cursor:
+        state = decode_cursor(cursor)
+        if state.get("v") != version:
+            raise InvalidCursorError("데이터가 갱신되어 커서가 만료되었습니다. 처음부터 다시 조회하세요")
+        if state.get("s") != sort or state.get("d") != descending or state.get("q") != fingerprint:
+            raise InvalidCursorError("커서와 조회 조건이 일치하지 않습니다")
+        start = state["p"]
+
+    end = start + page_size
+    next_cursor = None
+    if end < len(ordered):
+        next_cursor = encode_cursor({"v": version, "s": sort, "d": descending, "q": fingerprint, "p": end})
+
+    return {"rows": ordered[start:end], "next_cursor": next_cursor, "total": int(len(ordered))}
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+FSS 상품/회사 목록의 컬럼형 테이블
+
+psProdList / psCorpList 응답을 한 번만 NumPy 배열(수수료율, 수익률, 적립금, 판매여부,
+상품유형 코드 등)로 변환하여 분석 함수들이 행 단위 dict 순회 대신 벡터 연산을 사용하도록 합니다.
+원본 행 dict는 응답 포맷팅용으로 참조만 유지합니다.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarTable:
+    """행 목록을 필드별 NumPy 배열로 보관하는 테이블"""
+
+    NUMERIC_FIELDS: Tuple[str, ...] = ()  # float64 (누락/비숫자는 NaN)
+    TEXT_FIELDS: Tuple[str, ...] = ()     # object (누락은 빈 문자열)
+    FLAG_FIELDS: Tuple[str, ...] = ()     # bool ('Y'면 True)
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+        self.columns: Dict[str, np.ndarray] = {}
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+
+        frame = pd.DataFrame.from_records(
+            rows, columns=list(self.NUMERIC_FIELDS + self.TEXT_FIELDS + self.FLAG_FIELDS)
+        )
+        for field in self.NUMERIC_FIELDS:
+            self.columns[field] = pd.to_numeric(frame[field], errors="coerce").to_numpy(dtype=np.float64)
+        for field in self.TEXT_FIELDS:
+            self.columns[field] = frame[field].fillna("").astype(str).to_numpy(dtype=object)
+        for field in self.FLAG_FIELDS:
+            self.columns[field] = (frame[field] == "Y").to_numpy(dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    def sort_keys(self, field: str, descending: bool = False) -> np.ndarray:
+        """정렬용 값 (NaN/빈 문자열은 정렬 방향과 관계없이 마지막)"""
+        values = self.columns[field]
+        if values.dtype == object:
+            # 문자열 컬럼은 사전순 순위로 변환
+            codes, _ = pd.factorize(values, sort=True)
+            values = np.where(values == "", np.nan, codes.astype(np.float64))
+        if descending:
+            return np.where(np.isnan(values), np.inf, -values)
+        return np.where(np.isnan(values), np.inf, values)
+
+    def sorted_rows(self, field: str, descending: bool = False) -> np.ndarray:
+        """field 기준 전체 행의 안정 정렬 순서 (기준별로 한 번만 계산)"""
+        key = (field, descending)
+        order = self._orders.get(key)
+        if order is None:
+            order = self._orders[key] = np.argsort(self.sort_keys(field, descending), kind="stable")
+        return order
+
+    def argsort(self, field: str, indices: np.ndarray = None, descending: bool = False) -> np.ndarray:
+        """field 기준 안정 정렬된 행 인덱스 (indices 지정 시 해당 행만)"""
+        keys = self.sort_keys(field, descending)
+        if indices is None:
+            return np.argsort(keys, kind="stable")
+        return indices[np.argsort(keys[indices], kind="stable")]
+
+
+class ProductTable(ColumnarTable):
+    """연금저축 상품 테이블 (psProdList)"""
+
+    NUMERIC_FIELDS = ("avgFeeRate3", "avgFeeRate5", "avgEarnRate3", "avgEarnRate5", "reserve", "balance")
+    TEXT_FIELDS = ("company", "product", "productType", "launchDate")
+    FLAG_FIELDS = ("sells", "guarantees")
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        super().__init__(rows)
+        codes, categories = pd.factorize(self.columns["productType"])
+        self.product_type_codes = codes.astype(np.int32)
+        self.product_types = list(categories)
+
+        codes, categories = pd.factorize(self.columns["company"])
+        self.company_codes = codes.astype(np.int32)
+        self.companies = list(categories)
+
+    @property
+    def selling(self) -> np.ndarray:
+        """판매 중인 상품 인덱스"""
+        return np.flatnonzero(self.columns["sells"])
+
+
+class CompanyTable(ColumnarTable):
+    """연금저축 회사 테이블 (psCorpList)"""
+
+    NUMERIC_FIELDS = ("avgFeeRate3", "avgFeeRate5", "avgEarnRate3", "avgEarnRate5", "reserve")
+    TEXT_FIELDS = ("area", "company")
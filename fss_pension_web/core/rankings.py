@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+데이터 버전별 순위 (최저 수수료, 3년/5년 최고 수익률, 수수료 차감 수익률)
+
+순위는 처음 요청될 때 한 번 계산되어 데이터셋 컨텍스트에 보관되며, 이후 요청은 슬라이싱만 합니다.
+전체 대비 작은 limit 요청은 전체 정렬 대신 상위 K개 선택(부분 정렬)으로 계산합니다.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .product_table import ColumnarTable, ProductTable
+
+# limit이 전체의 이 비율보다 작으면 상위 K개 선택 사용
+TOP_K_RATIO = 0.25
+
+# 순위 기준: 이름 → (정렬 필드, 내림차순 여부). 필드가 None이면 수수료 차감 수익률
+RANKING_CRITERIA: Dict[str, Tuple[Optional[str], bool]] = {
+    "low_fee": ("avgFeeRate3", False),
+    "earn3": ("avgEarnRate3", True),
+    "earn5": ("avgEarnRate5", True),
+    "net_return": (None, True),
+}
+
+
+def top_k(keys: np.ndarray, k: int) -> np.ndarray:
+    """keys가 작은 순으로 상위 k개 인덱스 (동률은 원래 순서, 안정 정렬과 같은 결과)"""
+    n = len(keys)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(keys, kind="stable")
+
+    threshold = keys[np.argpartition(keys, k - 1)[k - 1]]
+    below = np.flatnonzero(keys < threshold)
+    ties = np.flatnonzero(keys == threshold)[:k - len(below)]
+    selected = np.concatenate([below, ties])
+    return selected[np.argsort(keys[selected], kind="stable")]
+
+
+class Ranking:
+    """한 기준의 순위 (필요한 만큼만 계산한 상위 순서를 보관)"""
+
+    def __init__(self, keys: np.ndarray, rows: np.ndarray):
+        self._keys = keys[rows]
+        self._rows = rows
+        self._order: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def top(self, limit: Optional[int] = None) -> np.ndarray:
+        """상위 limit개 행 인덱스 (None이면 전체)"""
+        size = len(self._rows)
+        limit = size if limit is None else max(0, min(limit, size))
+        if self._order is None or len(self._order) < limit:
+            if limit < size * TOP_K_RATIO:
+                order = top_k(self._keys, limit)
+            else:
+                order = np.argsort(self._keys, kind="stable")
+            self._order = self._rows[order]
+        return self._order[:limit]
+
+
+class TableRankings:
+    """테이블의 기준별 순위 모음 (기준별로 처음 요청될 때 생성)"""
+
+    def __init__(self, table: ColumnarTable, rows: Optional[np.ndarray] = None):
+        self.table = table
+        self.rows = np.arange(len(table)) if rows is None else rows
+        self._rankings: Dict[str, Ranking] = {}
+
+    def _keys(self, criterion: str) -> np.ndarray:
+        field, descending = RANKING_CRITERIA[criterion]
+        if field is not None:
+            return self.table.sort_keys(field, descending)
+        net = self.table["avgEarnRate3"] - self.table["avgFeeRate3"]
+        return np.where(np.isnan(net), np.inf, -net)
+
+    def get(self, criterion: str) -> Ranking:
+        ranking = self._rankings.get(criterion)
+        if ranking is None:
+            ranking = self._rankings[criterion] = Ranking(self._keys(criterion), self.rows)
+        return ranking
+
+    def top(self, criterion: str, limit: Optional[int] = None) -> np.ndarray:
+        """기준별 상위 limit개 행 인덱스 (NaN 값은 마지막)"""
+        return self.get(criterion).top(limit)
+
+
+def product_rankings(table: ProductTable) -> TableRankings:
+    """판매 중인 상품 순위"""
+    return TableRankings(table, table.selling)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+웹 API 요청 모델
+
+app.py와 simple_app.py가 같은 엔드포인트를 제공할 때 함께 사용하는 Pydantic 모델입니다.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from fss_pension_common.tax_benefits import calculate_tax_benefits, to_columns
+
+# 세액공제 일괄 계산 최대 고객 수
+MAX_TAX_BATCH = int(os.getenv("FSS_TAX_BATCH_MAX", "100000"))
+
+
+class UserProfile(BaseModel):
+    age: Optional[int] = None
+    monthly_income: Optional[int] = None
+    risk_preference: Optional[str] = None
+    target_retirement_age: Optional[int] = None
+    current_pension_amount: Optional[int] = None
+
+
+class ScenarioGrid(BaseModel):
+    monthly_living_costs: List[int] = [200, 250, 300, 350]
+    additional_savings: List[int] = [0, 50, 100]
+    retirement_ages: List[int] = [60, 65]
+    life_expectancies: List[int] = [85, 90, 95]
+    product_types: Optional[List[str]] = None
+
+
+class ScenarioSweepRequest(BaseModel):
+    user_profile: UserProfile
+    grid: ScenarioGrid = ScenarioGrid()
+
+
+class TaxBenefitBatchRequest(BaseModel):
+    monthly_incomes: List[float]                                  # 월 소득 (만원)
+    pension_savings_contributions: Optional[List[float]] = None   # 현재 연금저축 연 납입액 (만원)
+    irp_contributions: Optional[List[float]] = None               # 현재 IRP 연 납입액 (만원)
+
+    def calculate(self) -> Dict[str, List[float]]:
+        """고객 수·배열 길이 검사 후 세액공제 일괄 계산 (필드별 배열, 맞지 않는 요청이면 ValueError)"""
+        size = len(self.monthly_incomes)
+        if not size or size > MAX_TAX_BATCH:
+            raise ValueError(f"고객 수는 1~{MAX_TAX_BATCH}명이어야 합니다 (요청: {size}명)")
+        for name in ("pension_savings_contributions", "irp_contributions"):
+            values = getattr(self, name)
+            if values is not None and len(values) != size:
+                raise ValueError(f"{name}의 길이가 monthly_incomes와 다릅니다")
+        return to_columns(calculate_tax_benefits(
+            self.monthly_incomes,
+            self.pension_savings_contributions or 0,
+            self.irp_contributions or 0
+        ))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+상품 검색 인덱스
+
+데이터 버전별로 한 번 만들어 두고 모든 검색 요청이 공유합니다.
+- 회사명/상품유형: 고유값 → 상품 비트맵 역색인 (부분 문자열 검색 결과는 키워드별로 재사용)
+- 회사명이 부분 문자열로 일치하지 않으면 자모 n-gram 이름 인덱스로 가장 유사한 회사 검색
+- 수수료율/수익률: 정렬 배열에서 이진 탐색으로 범위 조회
+- 조건별 비트맵을 AND 연산으로 교집합
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from fss_pension_common.name_index import NameIndex
+
+from .product_table import ProductTable
+
+# 키워드별 비트맵 캐시 크기
+KEYWORD_CACHE_SIZE = 256
+
+
+def _bitmap(rows: np.ndarray, size: int) -> np.ndarray:
+    """행 인덱스 → 패킹된 비트맵"""
+    mask = np.zeros(size, dtype=bool)
+    mask[rows] = True
+    return np.packbits(mask)
+
+
+class InvertedIndex:
+    """범주형 컬럼의 고유값별 비트맵 역색인"""
+
+    def __init__(self, codes: np.ndarray, categories: List[str], size: int,
+                 names: Optional[NameIndex] = None):
+        self.size = size
+        self.names = names
+        self.postings: Dict[str, np.ndarray] = {}
+        for code, value in enumerate(categories):
+            key = value.lower()
+            bitmap = _bitmap(np.flatnonzero(codes == code), size)
+            if key in self.postings:
+                bitmap |= self.postings[key]
+            self.postings[key] = bitmap
+        self._empty = np.packbits(np.zeros(size, dtype=bool))
+        self._keyword_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def lookup(self, keyword: str) -> np.ndarray:
+        """keyword가 포함된 값을 가진 상품 비트맵 (대소문자 무시, 없으면 유사한 이름으로 검색)"""
+        keyword = keyword.lower()
+        bitmap = self._keyword_cache.get(keyword)
+        if bitmap is not None:
+            self._keyword_cache.move_to_end(keyword)
+            return bitmap
+
+        # 상품 단위가 아닌 고유값 단위로 부분 문자열 비교 후 비트맵 합집합
+        bitmap = self._empty
+        for value, posting in self.postings.items():
+            if keyword in value:
+                bitmap = bitmap | posting
+        if self.names is not None and not bitmap.any():
+            for name in self.names.resolve(keyword):
+                posting = self.postings.get(name.lower())
+                if posting is not None:
+                    bitmap = bitmap | posting
+        self._keyword_cache[keyword] = bitmap
+        if len(self._keyword_cache) > KEYWORD_CACHE_SIZE:
+            self._keyword_cache.popitem(last=False)
+        return bitmap
+
+
+class SortedIndex:
+    """수치 컬럼의 정렬 배열 (값이 없는 상품은 제외)"""
+
+    def __init__(self, values: np.ndarray):
+        self.size = len(values)
+        present = np.flatnonzero(~np.isnan(values))
+        order = np.argsort(values[present], kind="stable")
+        self.rows = present[order]
+        self.values = values[self.rows]
+
+    def at_most(self, limit: float) -> np.ndarray:
+        """값이 limit 이하인 상품 비트맵"""
+        end = np.searchsorted(self.values, limit, side="right")
+        return _bitmap(self.rows[:end], self.size)
+
+    def at_least(self, limit: float) -> np.ndarray:
+        """값이 limit 이상인 상품 비트맵"""
+        start = np.searchsorted(self.values, limit, side="left")
+        return _bitmap(self.rows[start:], self.size)
+
+
+class ProductSearchIndex:
+    """판매 중인 상품 검색 인덱스"""
+
+    def __init__(self, table: ProductTable, company_names: Optional[NameIndex] = None):
+        self.table = table
+        size = len(table)
+        self.size = size
+        self.selling = np.packbits(table["sells"])
+        self.company = InvertedIndex(table.company_codes, table.companies, size, company_names)
+        self.product_type = InvertedIndex(table.product_type_codes, table.product_types, size)
+        self.fee_rate = SortedIndex(table["avgFeeRate3"])
+        self.earn_rate = SortedIndex(table["avgEarnRate3"])
+
+    def search(self, company: str = None, product_type: str = None,
+               max_fee_rate: float = None, min_earn_rate: float = None) -> np.ndarray:
+        """조건에 맞는 판매 중 상품의 행 인덱스 (원래 순서 유지)"""
+        bitmap = self.selling
+        if company:
+            bitmap = bitmap & self.company.lookup(company)
+        if product_type:
+            bitmap = bitmap & self.product_type.lookup(product_type)
+        if max_fee_rate is not None:
+            bitmap = bitmap & self.fee_rate.at_most(max_fee_rate)
+        if min_earn_rate is not None:
+            bitmap = bitmap & self.earn_rate.at_least(min_earn_rate)
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.size))
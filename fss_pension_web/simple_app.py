@@ -3,11 +3,13 @@
 간단한 웹 애플리케이션 (Railway 배포용)
 """
 
+import asyncio
 import os
 import sys
 import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 
 # 현재 디렉토리를 Python path에 추가
 sys.path.insert(0, str(Path(__file__).parent))
@@ -16,11 +18,34 @@ from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from fss_pension_common.http_pool import close_http_clients, get_openai_client
+from fss_pension_common.refresh import REFRESH_ENABLED, RefreshScheduler
 from core.fss_client import FSSPensionClient
 from core.ai_consultant import PensionAIConsultant
+from core.pagination import MAX_PAGE_SIZE
+from core.schemas import ScenarioSweepRequest, TaxBenefitBatchRequest, UserProfile
 
-app = FastAPI(title="FSS 연금 대시보드", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 생명주기 관리 - FSS 데이터 사전 갱신"""
+    refresh_scheduler = None
+    if REFRESH_ENABLED and FSS_SERVICE_KEY:
+        # AI 상담사의 FSS 클라이언트도 같은 캐시를 공유하므로 하나만 갱신하면 됨
+        refresh_scheduler = RefreshScheduler(get_fss_client())
+        refresh_scheduler.start()
+    
+    yield
+    
+    if refresh_scheduler:
+        await refresh_scheduler.stop()
+    if fss_client:
+        await fss_client.close()
+    if ai_consultant:
+        await ai_consultant.close()
+    await close_http_clients()
+
+app = FastAPI(title="FSS 연금 대시보드", version="1.0.0", lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -75,13 +100,6 @@ class ChatMessage(BaseModel):
     message: str
     user_id: Optional[str] = None
 
-class UserProfile(BaseModel):
-    age: Optional[int] = None
-    monthly_income: Optional[int] = None
-    risk_preference: Optional[str] = None
-    target_retirement_age: Optional[int] = None
-    current_pension_amount: Optional[int] = None
-
 class ChatWithProfile(BaseModel):
     message: str
     user_id: Optional[str] = None
@@ -94,11 +112,13 @@ class RetirementScenario(BaseModel):
     monthly_living_cost: Optional[int] = 300
     additional_savings: Optional[int] = 0
     life_expectancy: Optional[int] = 85
+    product_types: Optional[List[str]] = None  # 수익률 분포에 사용할 상품 유형 (없으면 위험성향 기준)
 
 class ScenarioAnalysisRequest(BaseModel):
     user_profile: UserProfile
     scenario: RetirementScenario
 
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """메인 페이지 - AI 연금 진단 및 상담"""
@@ -123,7 +143,7 @@ async def market_summary():
         return {"success": False, "error": str(e)}
 
 @app.get("/api/low-fee-products")
-async def low_fee_products(limit: int = 10):
+async def low_fee_products(limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE)):
     try:
         client = get_fss_client()
         products = await client.analyze_low_fee_products(limit=limit)
@@ -208,6 +228,41 @@ async def retirement_scenario_analysis(scenario_request: ScenarioAnalysisRequest
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/retirement-scenario/sweep")
+async def retirement_scenario_sweep(sweep_request: ScenarioSweepRequest):
+    """은퇴 시나리오 그리드 일괄 계산 (월 생활비 × 추가 저축 × 은퇴 나이 × 기대수명, AI 호출 없이 결과 행렬 반환)"""
+    user_profile = sweep_request.user_profile.dict()
+    grid = sweep_request.grid
+    try:
+        result = await get_fss_client().sweep_retirement_scenarios(
+            age=user_profile.get('age') or 40,
+            current_balance=user_profile.get('current_pension_amount') or 0,
+            monthly_living_costs=grid.monthly_living_costs,
+            monthly_savings=grid.additional_savings,
+            retirement_ages=grid.retirement_ages,
+            life_expectancies=grid.life_expectancies,
+            product_types=grid.product_types,
+            risk_preference=user_profile.get('risk_preference')
+        )
+        return {"success": True, "data": result}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/tax-benefits/batch")
+async def tax_benefits_batch(batch_request: TaxBenefitBatchRequest):
+    """고객 배열의 세액공제 일괄 계산 (입력·결과 모두 필드별 배열, 금액 단위 만원)"""
+    try:
+        result = await asyncio.to_thread(batch_request.calculate)
+        return {"success": True, "total": len(batch_request.monthly_incomes), "data": result}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.delete("/api/chat-history/{user_id}")
 async def clear_chat_history(user_id: str):
     """채팅 히스토리 삭제"""
@@ -241,8 +296,7 @@ async def ai_status():
     # OpenAI API 연결 테스트
     if OPENAI_API_KEY:
         try:
-            from openai import AsyncOpenAI
-            client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+            client = get_openai_client(OPENAI_API_KEY)
             # 간단한 API 호출로 연결 테스트 (fallback 포함)
             try:
                 test_response = await client.chat.completions.create(
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+데이터셋 컨텍스트 공유 테스트 (같은 데이터 버전이면 컨텍스트·파생 뷰 재사용)
+"""
+
+import asyncio
+
+PARAMS = {"year": "2023", "quarter": "4"}
+
+
+def products(*fees):
+    return {"code": "000", "list": [
+        {"company": f"회사{i}", "product": f"상품{i}", "productType": "연금저축펀드", "sells": "Y",
+         "guarantees": "N", "avgEarnRate3": 3.0 + i, "avgFeeRate3": fee}
+        for i, fee in enumerate(fees)
+    ]}
+
+
+COMPANIES = {"code": "000", "list": [
+    {"area": "1", "company": "회사0", "avgFeeRate3": 0.5, "avgEarnRate3": 3.0},
+    {"area": "1", "company": "회사1", "avgFeeRate3": 0.3, "avgEarnRate3": 4.0},
+]}
+STATS = {"code": "000", "list": [{"year": "2023", "quarter": "4", "reserve": 100}]}
+
+
+def responses(*product_responses):
+    return {
+        "psProdList.json": list(product_responses),
+        "psCorpList.json": COMPANIES,
+        "pensionStat.json": STATS,
+    }
+
+
+def test_same_version_reuses_context_and_views(make_fss_client):
+    client = make_fss_client(responses(products(0.5, 0.2, 0.9)))
+
+    async def run():
+        first = await client.get_dataset_context()
+        table = first.product_table
+        second = await client.get_dataset_context()
+        return first, table, second
+
+    first, table, second = asyncio.run(run())
+    assert second is first
+    assert second.product_table is table
+    assert [client.fake.count(e) for e in ("psProdList.json", "psCorpList.json", "pensionStat.json")] == [1, 1, 1]
+
+
+def test_changed_dataset_builds_new_context(make_fss_client):
+    client = make_fss_client(responses(products(0.5, 0.2), products(0.1, 0.2)))
+
+    async def run():
+        first = await client.get_dataset_context()
+        await client.refresh_dataset("psProdList.json", PARAMS)
+        second = await client.get_dataset_context()
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert second is not first
+    assert second.version != first.version
+    assert second.companies_data is first.companies_data
+    assert [row["avgFeeRate3"] for row in second.products] == [0.1, 0.2]
+
+
+def test_analyses_share_one_context_without_fetching(make_fss_client):
+    client = make_fss_client(responses(products(0.5, 0.2, 0.9)))
+
+    async def run():
+        context = await client.get_dataset_context()
+        calls = len(client.fake.calls)
+        results = await asyncio.gather(
+            client.get_market_summary(context=context),
+            client.analyze_low_fee_products(limit=2, context=context),
+            client.analyze_company_ranking(context=context),
+        )
+        return calls, results
+
+    calls, (summary, low_fee, companies) = asyncio.run(run())
+    assert calls == len(client.fake.calls) == 3
+    assert summary["totalProducts"] == 3
+    assert summary["lowestFeeRate"] == 0.2
+    assert [p["product"] for p in low_fee] == ["상품1", "상품0"]
+    assert [c["company"] for c in companies] == ["회사1", "회사0"]
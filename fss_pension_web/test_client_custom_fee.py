@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+맞춤형 수수료 행렬 테스트 (그리드 조회, 적립금 보간, 동시 실행 제한, FSS 조회 없이 응답)
+"""
+
+import asyncio
+
+from core.custom_fee_matrix import CUSTOM_FEE_ENDPOINT, CustomFeeMatrix, build_custom_fee_matrix
+
+SYS_TYPES, TERMS, RESERVES = ("1", "2"), ("5",), ("10", "50", "100")
+
+
+def fee_response(params):
+    """적립금에 비례하는 수수료 응답 (B사는 100 구간에만 있음)"""
+    reserve = float(params["reserve"])
+    rows = [
+        {"area": "은행", "company": "A은행", "rank": "1", "totalFee": str(reserve * 0.01), "totalFeeRate": 0.5},
+    ]
+    if reserve == 100:
+        rows.append({"area": "보험", "company": "B생명", "rank": "2", "totalFee": "3.0", "totalFeeRate": 0.7})
+    return {"code": "000", "list": rows}
+
+
+def make_matrix(missing=()):
+    responses = {}
+    for sys_type in SYS_TYPES:
+        for term in TERMS:
+            for reserve in RESERVES:
+                key = (sys_type, term, reserve)
+                params = {"sysType": sys_type, "term": term, "reserve": reserve}
+                responses[key] = {"code": "999"} if key in missing else fee_response(params)
+    return CustomFeeMatrix(SYS_TYPES, TERMS, RESERVES, responses, interpolated_fields=("totalFee", "totalFeeRate"))
+
+
+def test_grid_point_returns_stored_response():
+    matrix = make_matrix()
+    assert matrix.lookup("2", "5", "50") == fee_response({"reserve": "50"})
+    assert matrix.stats()["available"] == matrix.cells == 6
+
+
+def test_between_grid_points_interpolates_fee_fields_only():
+    fees = make_matrix().lookup("1", "5", "30")
+    assert fees["interpolated"] == {"reserve": 30.0, "between": ["10", "50"], "weight": 0.5}
+    row = fees["list"][0]
+    assert row["totalFee"] == "0.3"  # 0.1과 0.5 사이, 문자열 표기 유지
+    assert row["totalFeeRate"] == 0.5  # 두 구간 값이 같으면 그대로
+    assert row["rank"] == "1"
+
+
+def test_company_in_one_neighbour_only_keeps_its_row():
+    fees = make_matrix().lookup("1", "5", "75")
+    by_company = {row["company"]: row for row in fees["list"]}
+    assert by_company["A은행"]["totalFee"] == "0.75"
+    assert by_company["B생명"]["totalFee"] is None  # 아래 구간 값이 없으면 보간하지 않음
+    assert by_company["B생명"]["rank"] == "2"
+
+
+def test_lookup_outside_grid_or_missing_cell_is_none():
+    matrix = make_matrix(missing={("1", "5", "10")})
+    assert matrix.lookup("1", "5", "5") is None
+    assert matrix.lookup("1", "5", "200") is None
+    assert matrix.lookup("3", "5", "50") is None
+    assert matrix.lookup("2", "10", "50") is None
+    assert matrix.lookup("1", "5", "많이") is None
+    assert matrix.lookup("1", "5", "30") is None  # 아래 구간 응답 없음
+    assert matrix.lookup("2", "5", "30") is not None
+
+
+def test_build_limits_concurrency_and_keeps_failed_cells_empty():
+    running = peak = 0
+
+    async def fetch(endpoint, params):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.005)
+        running -= 1
+        if params["reserve"] == "100" and params["sysType"] == "2":
+            raise RuntimeError("연결 실패")
+        return fee_response(params)
+
+    matrix = asyncio.run(build_custom_fee_matrix(fetch, SYS_TYPES, TERMS, RESERVES, concurrency=2))
+    assert peak == 2
+    assert int(matrix.available.sum()) == 5
+    assert matrix.lookup("2", "5", "75") is None
+
+
+def test_client_answers_from_matrix_without_fetching(make_fss_client):
+    client = make_fss_client({CUSTOM_FEE_ENDPOINT: fee_response})
+
+    async def run():
+        await client.build_custom_fee_matrix()
+        built = client.fake.count(CUSTOM_FEE_ENDPOINT)
+        interpolated = await client.get_retirement_pension_custom_fee("2", "5", "30")
+        after_lookup = client.fake.count(CUSTOM_FEE_ENDPOINT)
+        fallback = await client.get_retirement_pension_custom_fee("2", "5", "5000")
+        return built, interpolated, after_lookup, fallback
+
+    built, interpolated, after_lookup, fallback = asyncio.run(run())
+    assert after_lookup == built == client.custom_fee_matrix.cells
+    assert interpolated["list"][0]["totalFee"] == "0.3"
+    assert fallback["list"][0]["totalFee"] == "50.0"  # 그리드 밖은 API 조회
+    assert client.fake.calls[-1] == (CUSTOM_FEE_ENDPOINT, {"sysType": "2", "term": "5", "reserve": "5000"})
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+커서 페이지네이션 테스트 (페이지 왕복, 잘못된·만료된 커서 거부)
+"""
+
+import numpy as np
+import pytest
+
+from core.pagination import InvalidCursorError, encode_cursor, paginate
+from core.product_table import ProductTable
+
+FEES = [0.5, 0.2, None, 0.2, 0.9, 0.1, 0.7]
+TABLE = ProductTable([{"product": str(i), "sells": "Y", "avgFeeRate3": fee} for i, fee in enumerate(FEES)])
+ROWS = np.arange(len(FEES))
+
+
+def all_pages(**kwargs):
+    pages, cursor = [], None
+    while True:
+        page = paginate(TABLE, ROWS, "v1", cursor=cursor, **kwargs)
+        pages.append(page["rows"].tolist())
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages, page["total"]
+
+
+def test_cursor_round_trip_covers_every_row_once():
+    pages, total = all_pages(sort="fee", page_size=3, fingerprint="q")
+    assert pages == [[5, 1, 3], [0, 6, 4], [2]]  # 동률은 원래 순서, 값이 없으면 마지막
+    assert total == 7
+
+    pages, _ = all_pages(sort="fee", descending=True, page_size=4)
+    assert pages == [[4, 6, 0, 1], [3, 5, 2]]
+
+    pages, _ = all_pages(page_size=7)
+    assert pages == [list(range(7))]
+
+
+def test_sorted_subset_keeps_table_order():
+    page = paginate(TABLE, np.array([6, 0, 2, 1]), "v1", sort="fee", page_size=10)
+    assert page["rows"].tolist() == [1, 0, 6, 2]
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor", [
+    "!!!", "bm90LWpzb24", encode_cursor({"v": "v1"}), encode_cursor({"v": "v1", "p": -3}), encode_cursor([1, 2]),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        paginate(TABLE, ROWS, "v1", cursor=cursor)
+
+
+def test_cursor_from_other_version_or_query_is_rejected():
+    cursor = paginate(TABLE, ROWS, "v1", sort="fee", page_size=2, fingerprint="q")["next_cursor"]
+    with pytest.raises(InvalidCursorError, match="만료"):
+        paginate(TABLE, ROWS, "v2", sort="fee", page_size=2, cursor=cursor, fingerprint="q")
+    for kwargs in ({"sort": "earn"}, {"sort": "fee", "descending": True}, {"sort": "fee", "fingerprint": "other"}):
+        with pytest.raises(InvalidCursorError, match="일치하지"):
+            paginate(TABLE, ROWS, "v1", page_size=2, cursor=cursor, **{"fingerprint": "q", **kwargs})
+
+
+def test_unknown_sort_is_rejected():
+    with pytest.raises(ValueError):
+        paginate(TABLE, ROWS, "v1", sort="name")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+컬럼형 상품 테이블 테스트 (형 변환, 누락값 정렬, 코드화)
+"""
+
+import numpy as np
+
+from core.product_table import CompanyTable, ProductTable
+
+ROWS = [
+    {"company": "B사", "product": "가", "productType": "펀드", "sells": "Y", "avgFeeRate3": "0.5"},
+    {"company": "A사", "product": "나", "productType": "보험", "sells": "N", "avgFeeRate3": None},
+    {"company": "B사", "product": "다", "productType": "펀드", "sells": "Y", "avgFeeRate3": 0.2, "guarantees": "Y"},
+    {"company": "C사", "product": "", "productType": "보험", "sells": "Y", "avgFeeRate3": "-"},
+    {"company": "A사", "product": "라", "productType": "펀드", "sells": "Y", "avgFeeRate3": 0.5},
+]
+
+
+def test_columns_are_typed_with_missing_values():
+    table = ProductTable(ROWS)
+    fees = table["avgFeeRate3"]
+    assert fees.dtype == np.float64
+    assert fees[[0, 2, 4]].tolist() == [0.5, 0.2, 0.5]
+    assert np.isnan(fees[[1, 3]]).all()
+    assert table["avgEarnRate3"].shape == (5,) and np.isnan(table["avgEarnRate3"]).all()  # 응답에 없는 필드
+    assert table["product"].tolist() == ["가", "나", "다", "", "라"]
+    assert table["guarantees"].tolist() == [False, False, True, False, False]
+    assert table.selling.tolist() == [0, 2, 3, 4]
+
+
+def test_codes_follow_first_appearance():
+    table = ProductTable(ROWS)
+    assert table.product_types == ["펀드", "보험"]
+    assert table.product_type_codes.tolist() == [0, 1, 0, 1, 0]
+    assert table.companies == ["B사", "A사", "C사"]
+    assert table.company_codes.tolist() == [0, 1, 0, 2, 1]
+
+
+def test_sort_is_stable_with_missing_values_last():
+    table = ProductTable(ROWS)
+    assert table.argsort("avgFeeRate3").tolist() == [2, 0, 4, 1, 3]
+    assert table.argsort("avgFeeRate3", descending=True).tolist() == [0, 4, 2, 1, 3]
+    assert table.argsort("avgFeeRate3", indices=np.array([4, 3, 0])).tolist() == [4, 0, 3]
+    assert table.argsort("product").tolist() == [0, 1, 2, 4, 3]  # 빈 문자열은 마지막
+    assert table.sorted_rows("avgFeeRate3") is table.sorted_rows("avgFeeRate3")
+
+
+def test_empty_company_table():
+    table = CompanyTable([])
+    assert len(table) == 0
+    assert table["avgFeeRate3"].shape == (0,)
+    assert table.argsort("avgFeeRate3").tolist() == []
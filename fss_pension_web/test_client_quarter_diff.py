@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+분기 변화 사전 계산 테스트 (시작 시 계산, 원본 데이터 갱신 시 재계산)
+"""
+
+import asyncio
+
+Q3 = {"year": "2023", "quarter": "3"}
+Q4 = {"year": "2023", "quarter": "4"}
+
+
+def products(fee):
+    return {"code": "000", "list": [
+        {"company": "A사", "product": "펀드", "productType": "연금저축펀드", "sells": "Y", "avgFeeRate3": fee}
+    ]}
+
+
+def make_responses(q3_fees, q4_fees):
+    """분기별 상품 수수료율 (호출마다 목록 순서대로, 마지막 값은 반복)"""
+    fees = {"3": q3_fees, "4": q4_fees}
+    calls = {"3": 0, "4": 0}
+
+    def product_list(params):
+        quarter = params["quarter"]
+        calls[quarter] += 1
+        return products(fees[quarter][min(calls[quarter], len(fees[quarter])) - 1])
+
+    return {
+        "psProdList.json": product_list,
+        "psCorpList.json": {"code": "000", "list": []},
+        "pensionStat.json": {"code": "000", "list": []},
+    }
+
+
+def fee_changes(diff):
+    return [(item["before"], item["after"]) for item in diff["products"]["fee_changes"]]
+
+
+def test_precomputed_diff_is_recomputed_when_source_changes(make_fss_client):
+    client = make_fss_client(make_responses([0.5], [0.4, 0.3]))
+
+    async def run():
+        await client.precompute_quarter_diffs([("2023", "4")])
+        first = await client.get_quarter_diff("2023", "4")
+
+        await client.refresh_dataset("psProdList.json", Q4)
+        task = client._diff_tasks[("2023", "4")]
+        await task
+        second = await client.get_quarter_diff("2023", "4")
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert fee_changes(first) == [(0.5, 0.4)]
+    assert fee_changes(second) == [(0.5, 0.3)]
+
+
+def test_only_precomputed_periods_are_recomputed(make_fss_client):
+    client = make_fss_client(make_responses([0.5, 0.6, 0.7], [0.4]))
+
+    async def run():
+        await client.refresh_dataset("psProdList.json", Q4)  # 계산해 둔 분기가 없음
+        scheduled = dict(client._diff_tasks)
+        await client.precompute_quarter_diffs([("2023", "4")])
+        await client.refresh_dataset("psProdList.json", {**Q3, "areaCode": "1"})  # 권역별 조회는 무시
+        area_scheduled = dict(client._diff_tasks)
+        await client.refresh_dataset("psProdList.json", Q3)  # 직전 분기가 바뀌면 다음 분기 변화 재계산
+        await asyncio.gather(*client._diff_tasks.values())
+        next_scheduled = dict(client._diff_tasks)
+        diff = await client.get_quarter_diff("2023", "4")
+        await client.close()
+        return scheduled, area_scheduled, next_scheduled, diff
+
+    scheduled, area_scheduled, next_scheduled, diff = asyncio.run(run())
+    assert scheduled == {}
+    assert area_scheduled == {}
+    assert list(next_scheduled) == [("2023", "4")]
+    assert fee_changes(diff) == [(0.7, 0.4)]
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+순위 테스트 (상위 K개 선택이 안정 정렬과 같은 순서인지, 기준별 순위)
+"""
+
+import numpy as np
+import pytest
+
+from core.product_table import ProductTable
+from core.rankings import TableRankings, product_rankings, top_k
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_top_k_matches_stable_argsort_with_ties(seed):
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, 5, size=200).astype(np.float64)  # 동률이 많은 값
+    keys[rng.choice(200, 20, replace=False)] = np.inf  # 값이 없는 항목
+    expected = np.argsort(keys, kind="stable")
+    for k in (0, 1, 3, 17, 50, 199, 200, 250):
+        assert top_k(keys, k).tolist() == expected[:k].tolist()
+
+
+def test_ranking_partial_then_full_order():
+    fees = [0.5, 0.2, 0.5, None, 0.2, 0.9]
+    rows = [{"product": str(i), "sells": "Y", "avgFeeRate3": fee} for i, fee in enumerate(fees)]
+    ranking = TableRankings(ProductTable(rows)).get("low_fee")
+    assert ranking.top(1).tolist() == [1]
+    assert ranking.top(3).tolist() == [1, 4, 0]
+    assert ranking.top().tolist() == [1, 4, 0, 2, 5, 3]  # 값이 없는 상품은 마지막
+
+
+def test_product_rankings_by_criterion():
+    rows = [
+        {"product": "가", "sells": "Y", "avgFeeRate3": 0.5, "avgEarnRate3": 4.0, "avgEarnRate5": 3.0},
+        {"product": "나", "sells": "N", "avgFeeRate3": 0.1, "avgEarnRate3": 9.0, "avgEarnRate5": 9.0},
+        {"product": "다", "sells": "Y", "avgFeeRate3": 0.2, "avgEarnRate3": 3.5, "avgEarnRate5": 5.0},
+        {"product": "라", "sells": "Y", "avgFeeRate3": 1.0, "avgEarnRate3": 4.2},
+    ]
+    rankings = product_rankings(ProductTable(rows))
+    assert rankings.top("low_fee").tolist() == [2, 0, 3]  # 판매 중인 상품만
+    assert rankings.top("earn3").tolist() == [3, 0, 2]
+    assert rankings.top("earn5").tolist() == [2, 0, 3]
+    assert rankings.top("net_return").tolist() == [0, 2, 3]  # 3.5, 3.3, 3.2
+    assert rankings.get("low_fee") is rankings.get("low_fee")
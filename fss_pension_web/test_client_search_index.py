@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+상품 검색 인덱스 테스트 (비트맵 교집합, 범위 조회 경계, 유사 회사명 검색)
+"""
+
+import numpy as np
+
+from fss_pension_common.name_index import NameIndex
+from core.product_table import ProductTable
+from core.search_index import InvertedIndex, ProductSearchIndex, SortedIndex
+
+ROWS = [
+    {"company": "미래에셋증권", "productType": "연금저축펀드", "sells": "Y", "avgFeeRate3": 0.3, "avgEarnRate3": 5.0},
+    {"company": "미래에셋증권", "productType": "연금저축보험", "sells": "Y", "avgFeeRate3": 0.8, "avgEarnRate3": 2.0},
+    {"company": "삼성생명", "productType": "연금저축보험", "sells": "Y", "avgFeeRate3": 0.5, "avgEarnRate3": 3.0},
+    {"company": "삼성생명", "productType": "연금저축펀드", "sells": "N", "avgFeeRate3": 0.1, "avgEarnRate3": 9.0},
+    {"company": "KB국민은행", "productType": "연금저축신탁", "sells": "Y", "avgFeeRate3": None, "avgEarnRate3": 4.0},
+]
+
+
+def unpack(bitmap, size):
+    return np.flatnonzero(np.unpackbits(bitmap, count=size)).tolist()
+
+
+def make_index():
+    table = ProductTable(ROWS)
+    return ProductSearchIndex(table, NameIndex(table["company"]))
+
+
+def test_search_intersects_all_conditions():
+    index = make_index()
+    assert index.search().tolist() == [0, 1, 2, 4]  # 판매 중인 상품만
+    assert index.search(company="미래에셋").tolist() == [0, 1]
+    assert index.search(company="미래에셋", product_type="펀드").tolist() == [0]
+    assert index.search(product_type="펀드").tolist() == [0]  # 판매 중지 상품 제외
+    assert index.search(product_type="보험", max_fee_rate=0.5, min_earn_rate=3.0).tolist() == [2]
+    assert index.search(company="kb").tolist() == [4]  # 대소문자 무시
+    assert index.search(company="없는회사").tolist() == []
+
+
+def test_sorted_index_bounds_are_inclusive_and_skip_missing():
+    values = np.array([0.5, np.nan, 0.3, 0.5, 0.9])
+    index = SortedIndex(values)
+    assert unpack(index.at_most(0.5), 5) == [0, 2, 3]
+    assert unpack(index.at_most(0.2), 5) == []
+    assert unpack(index.at_least(0.5), 5) == [0, 3, 4]
+    assert unpack(index.at_least(1.0), 5) == []
+    assert unpack(index.at_least(float("-inf")), 5) == [0, 2, 3, 4]  # 값이 없는 상품은 제외
+
+
+def test_company_lookup_falls_back_to_similar_names():
+    index = make_index()
+    assert index.search(company="미래애셋증권").tolist() == [0, 1]  # 오타 → 유사한 회사명
+
+
+def test_inverted_index_without_names_has_no_fallback():
+    table = ProductTable(ROWS)
+    index = InvertedIndex(table.company_codes, table.companies, len(table))
+    assert not index.lookup("미래애셋증권").any()
+    assert index.lookup("삼성") is index.lookup("삼성")  # 키워드별 결과 재사용
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+웹 클라이언트 데이터 조회 테스트 (스냅샷 재사용, FSS 장애·오프라인 모드 대체)
+"""
+
+import asyncio
+
+from fss_pension_common.response_cache import ResponseCache
+from fss_pension_common.snapshot_store import SnapshotStore
+from core.fss_client import FSSPensionClient
+
+PARAMS = {"year": "2023", "quarter": "4"}
+
+
+def ok(name):
+    return {"code": "000", "list": [{"product": name}]}
+
+
+def make_client(tmp_path, responses, offline=False):
+    """responses를 순서대로 돌려주는 가짜 FSS API를 쓰는 클라이언트"""
+    client = FSSPensionClient(
+        "TEST_KEY", cache=ResponseCache(), snapshot_store=SnapshotStore(str(tmp_path / "snapshots.db")), offline=offline
+    )
+    client.calls = []
+
+    async def fetch(endpoint, params):
+        client.calls.append((endpoint, dict(params)))
+        return responses[min(len(client.calls), len(responses)) - 1]
+
+    client._fetch_api_response = fetch
+    return client
+
+
+def test_fresh_snapshot_is_reused_without_api_call(tmp_path):
+    client = make_client(tmp_path, [ok("v1"), ok("v2")])
+    first = asyncio.run(client._load_dataset("psProdList.json", PARAMS))
+    second = asyncio.run(client._load_dataset("psProdList.json", PARAMS))
+    forced = asyncio.run(client._load_dataset("psProdList.json", PARAMS, force=True))
+
+    assert first == second == ok("v1")
+    assert forced == ok("v2")
+    assert len(client.calls) == 2
+
+
+def test_api_failure_falls_back_to_snapshot(tmp_path):
+    client = make_client(tmp_path, [ok("v1"), {"error": "timeout", "code": "999"}])
+    asyncio.run(client._load_dataset("psProdList.json", PARAMS))
+    assert asyncio.run(client._load_dataset("psProdList.json", PARAMS, force=True)) == ok("v1")
+
+
+def test_offline_mode_serves_snapshots_only(tmp_path):
+    asyncio.run(make_client(tmp_path, [ok("v1")])._load_dataset("psProdList.json", PARAMS))
+
+    offline = make_client(tmp_path, [ok("v2")], offline=True)
+    assert asyncio.run(offline._load_dataset("psProdList.json", PARAMS, force=True)) == ok("v1")
+    missing = asyncio.run(offline._load_dataset("psProdList.json", {"year": "2022", "quarter": "4"}))
+    assert missing["code"] == "999"
+    assert offline.calls == []
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+은퇴 시나리오 그리드 엔드포인트 테스트 (결과 행렬, 시나리오 수 검사)
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as web_app
+
+PRODUCTS = {"code": "000", "list": [
+    {"company": "A사", "product": f"펀드{i}", "productType": "연금저축펀드", "sells": "Y", "guarantees": "N",
+     "avgEarnRate3": rate, "avgFeeRate3": 0.5}
+    for i, rate in enumerate([3.0, 5.0, 7.0])
+]}
+RESPONSES = {
+    "psProdList.json": PRODUCTS,
+    "psCorpList.json": {"code": "000", "list": []},
+    "pensionStat.json": {"code": "000", "list": []},
+}
+
+
+@pytest.fixture
+def api(make_fss_client, monkeypatch):
+    client = make_fss_client(RESPONSES)
+    monkeypatch.setattr(web_app, "fss_client", client)
+    return TestClient(web_app.app), client
+
+
+def test_sweep_endpoint_returns_grid(api):
+    http, _ = api
+    response = http.post("/api/retirement-scenario/sweep", json={
+        "user_profile": {"age": 45, "current_pension_amount": 1000},
+        "grid": {"monthly_living_costs": [200, 300], "additional_savings": [0, 50, 100],
+                 "retirement_ages": [60], "life_expectancies": [85, 90]},
+    })
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["axes"]["monthly_savings"] == [0.0, 50.0, 100.0]
+    assert len(data["success_rate"]) == 2 and len(data["success_rate"][0]) == 3
+    assert data["return_distribution"]["products"] == 3
+
+
+def test_sweep_endpoint_rejects_bad_grid_before_fetching(api, monkeypatch):
+    http, client = api
+    monkeypatch.setattr("core.fss_client.MAX_SWEEP_CELLS", 4)
+    for grid in ({"monthly_living_costs": []}, {"monthly_living_costs": [200, 300], "additional_savings": [0, 50, 100]}):
+        response = http.post("/api/retirement-scenario/sweep", json={"user_profile": {"age": 45}, "grid": grid})
+        assert response.status_code == 400
+        assert "시나리오 수" in response.json()["detail"]
+    assert client.fake.calls == []
@@ -7,20 +7,25 @@ setup(
     packages=find_packages(),
     python_requires=">=3.11",
     install_requires=[
-        "fastapi==0.104.1",
-        "uvicorn[standard]==0.24.0",
-        "jinja2==3.1.2",
-        "httpx==0.27.0",
+        # 공용 모듈(fss_pension_common) 의존성
+        "httpx[http2]==0.27.0",
         "pandas>=2.1.4",
         "numpy>=1.24.3",
-        "pydantic>=2.8.0",
-        "typing-extensions>=4.8.0",
-        "python-dateutil>=2.8.2",
-        "xmltodict>=0.13.0",
-        "openai==1.12.0",
-        "gunicorn==21.2.0",
-        "python-dotenv==1.0.0"
     ],
+    extras_require={
+        "web": [
+            "fastapi==0.104.1",
+            "uvicorn[standard]==0.24.0",
+            "jinja2==3.1.2",
+            "pydantic>=2.8.0",
+            "typing-extensions>=4.8.0",
+            "python-dateutil>=2.8.2",
+            "xmltodict>=0.13.0",
+            "openai==1.12.0",
+            "gunicorn==21.2.0",
+            "python-dotenv==1.0.0"
+        ],
+    },
     entry_points={
         'console_scripts': [
             'fss-web=fss_pension_web.simple_app:main',
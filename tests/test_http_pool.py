@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+공유 HTTP 연결 풀 테스트 (업스트림별 클라이언트 재사용, 종료 후 재생성)
+"""
+
+import asyncio
+
+from fss_pension_common import http_pool
+from fss_pension_common.http_pool import close_http_clients, get_http_client, get_openai_client
+
+
+def test_client_is_shared_per_upstream():
+    async def run():
+        fss = get_http_client("fss")
+        try:
+            assert get_http_client("fss") is fss
+            openai_http = get_http_client("openai")
+            assert openai_http is not fss
+            assert fss.timeout.read == http_pool.READ_TIMEOUTS["fss"]
+            assert openai_http.timeout.read == http_pool.READ_TIMEOUTS["openai"]
+            assert get_http_client("other").timeout.read == http_pool.DEFAULT_READ_TIMEOUT
+        finally:
+            await close_http_clients()
+
+    asyncio.run(run())
+
+
+def test_close_http_clients_closes_and_recreates():
+    async def run():
+        fss = get_http_client("fss")
+        await close_http_clients()
+        assert fss.is_closed
+        recreated = get_http_client("fss")
+        await close_http_clients()
+        return fss, recreated
+
+    fss, recreated = asyncio.run(run())
+    assert recreated is not fss
+
+
+def test_openai_client_uses_shared_pool():
+    async def run():
+        client = get_openai_client("sk-test")
+        try:
+            assert get_openai_client("sk-test") is client
+            assert get_openai_client("sk-other") is not client
+            assert client._client is get_http_client("openai")
+        finally:
+            await close_http_clients()
+        assert get_openai_client("sk-test") is not client  # 종료 후에는 새 클라이언트
+        await close_http_clients()
+
+    asyncio.run(run())
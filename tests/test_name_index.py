@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+이름 검색 인덱스 테스트 (정규화, 오타, 부분 입력, 짧은 이름)
+"""
+
+from fss_pension_common.name_index import NameIndex, decompose_hangul, normalize_name
+
+NAMES = ["미래에셋증권", "KB국민은행", "신한KB증권", "NH투자증권", "삼성생명보험"]
+
+
+def test_normalize_and_decompose():
+    assert normalize_name("(주) 미래에셋 증권") == "미래에셋증권"
+    assert normalize_name("ＫＢ국민은행㈜") == "kb국민은행"
+    assert decompose_hangul("각a") == "각a"
+
+
+def test_exact_typo_and_partial_matches():
+    index = NameIndex(NAMES)
+    assert index.search("미래에셋 증권(주)")[0] == ("미래에셋증권", 1.0)
+    assert index.resolve("미래애셋증권") == ["미래에셋증권"]
+    assert index.resolve("삼성생명") == ["삼성생명보험"]
+    assert index.search("없는이름") == []
+
+
+def test_short_query_matches_middle_of_name():
+    index = NameIndex(NAMES)
+    assert [name for name, _ in index.search("kb")] == ["KB국민은행", "신한KB증권"]
+    assert index.resolve("NH") == ["NH투자증권"]
+    assert [name for name, _ in index.search("가")] == []
+    assert [name for name, _ in NameIndex(["한가람", "가나"]).search("가")] == ["가나", "한가람"]
+
+
+def test_short_name_contained_in_longer_query():
+    index = NameIndex(["KB", "NH", "미래에셋"])
+    assert index.resolve("신한KB증권") == ["KB"]
+    assert index.resolve("(주)미래에셋증권") == ["미래에셋"]
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+분기 간 변화 계산 테스트 (분기 이동, 상품 변화, 회사 순위 변동)
+"""
+
+from fss_pension_common.quarter_diff import company_rank_moves, next_quarter, pair_rows, previous_quarter, product_diff
+
+
+def test_quarter_navigation():
+    assert previous_quarter("2024", "1") == ("2023", "4")
+    assert previous_quarter(2023, 3) == ("2023", "2")
+    assert next_quarter("2023", "4") == ("2024", "1")
+    assert next_quarter(2023, 1) == ("2023", "2")
+
+
+def product(company, name, fee=None, earn=None, sells="Y"):
+    return {"company": company, "product": name, "productType": "펀드", "sells": sells,
+            "avgFeeRate3": fee, "avgEarnRate3": earn}
+
+
+def test_product_diff_sorted_capped_and_counted():
+    before = [product("B사", "기존", fee=1.0, earn=3.0), product("A사", "중지", sells="N"),
+              product("A사", "판매중", fee=0.5, earn=2.0), product("C사", "같음", fee=0.3, earn=1.0)]
+    after = [product("B사", "기존", fee=0.8, earn=5.0), product("A사", "판매중", sells="N"),
+             product("C사", "같음", fee=0.3, earn=1.0),
+             product("Z사", "신규1"), product("A사", "신규2"), product("M사", "신규3")]
+    pairs = pair_rows(before, after, key=lambda row: (row["company"], row["product"]))
+    result = product_diff(pairs, top_n=2)
+
+    assert [item["company"] for item in result["new_products"]] == ["A사", "M사"]
+    assert result["counts"]["new_products"] == 3
+    assert [item["product"] for item in result["discontinued_products"]] == ["판매중"]
+    assert result["fee_changes"] == [
+        {"company": "B사", "product": "기존", "productType": "펀드", "before": 1.0, "after": 0.8, "change": -0.2}
+    ]
+    assert result["counts"]["fee_changes"] == {"increased": 0, "decreased": 1}
+    assert result["counts"]["return_changes"] == {"increased": 1, "decreased": 0}
+
+
+def test_product_diff_ignores_input_order():
+    rows = [product(f"{i}사", "신규") for i in range(5)]
+    first = product_diff(pair_rows([], rows, key=lambda row: row["company"]), top_n=3)
+    second = product_diff(pair_rows([], rows[::-1], key=lambda row: row["company"]), top_n=3)
+    assert first == second
+
+
+def test_company_rank_moves():
+    def company(name, fee, area="생명"):
+        return {"company": name, "area": area, "avgFeeRate3": fee, "avgEarnRate3": None}
+
+    before = [company("A", 0.1), company("B", 0.2), company("C", 0.3), company("D", 0.4)]
+    after = [company("A", 0.3), company("B", 0.2), company("C", 0.1), company("E", 0.5), company("F", 0.6)]
+    pairs = pair_rows(before, after, key=lambda row: row["company"])
+    result = company_rank_moves(pairs, top_n=1)["low_fee"]
+
+    assert [(item["company"], item["move"]) for item in result["moves"]] == [("C", 2)]
+    assert (result["up"], result["down"]) == (1, 1)
+    assert result["entered"] == ["E"] and result["entered_count"] == 2
+    assert result["left"] == ["D"] and result["left_count"] == 1
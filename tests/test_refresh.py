@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+사전 갱신 스케줄러 테스트 (분기 공시 기간, 갱신 주기, 동시 갱신 제한)
+"""
+
+import asyncio
+from datetime import date
+
+from fss_pension_common.refresh import RefreshScheduler, in_release_window, last_quarter_end
+
+
+class FakeClient:
+    """갱신 호출을 기록하는 클라이언트 (fail에 있는 엔드포인트는 실패)"""
+
+    def __init__(self, requests, fail=()):
+        self.requests = requests
+        self.fail = set(fail)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def refresh_requests(self):
+        return self.requests
+
+    async def refresh_dataset(self, endpoint, params, force=True):
+        self.calls.append((endpoint, force))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if endpoint in self.fail:
+            raise RuntimeError("실패")
+        return True
+
+
+def test_last_quarter_end():
+    assert last_quarter_end(date(2024, 2, 10)) == date(2023, 12, 31)
+    assert last_quarter_end(date(2024, 5, 1)) == date(2024, 3, 31)
+    assert last_quarter_end(date(2024, 9, 30)) == date(2024, 6, 30)
+    assert last_quarter_end(date(2024, 12, 31)) == date(2024, 9, 30)
+
+
+def test_release_window_shortens_delay():
+    assert in_release_window(date(2024, 5, 15))  # 1분기 종료 후 45일
+    assert not in_release_window(date(2024, 4, 10))
+    assert not in_release_window(date(2024, 6, 20))
+
+    scheduler = RefreshScheduler(FakeClient([]), interval=3600, release_interval=600)
+    assert scheduler.next_delay(date(2024, 5, 15)) == 600
+    assert scheduler.next_delay(date(2024, 4, 10)) == 3600
+
+
+def test_refresh_all_limits_concurrency_and_counts_failures():
+    client = FakeClient([(f"{i}.json", {}) for i in range(5)], fail={"3.json"})
+    refreshed = []
+
+    async def on_refresh():
+        refreshed.append(len(client.calls))
+
+    scheduler = RefreshScheduler(client, concurrency=2, on_refresh=on_refresh)
+    result = asyncio.run(scheduler.refresh_all(force=False))
+
+    assert result == {"total": 5, "succeeded": 4, "failed": 1, "force": False}
+    assert client.max_in_flight == 2
+    assert all(force is False for _, force in client.calls)
+    assert refreshed == [5]  # 모든 갱신이 끝난 뒤 한 번 실행
+
+
+def test_on_refresh_failure_does_not_fail_refresh():
+    async def on_refresh():
+        raise RuntimeError("사전 계산 실패")
+
+    scheduler = RefreshScheduler(FakeClient([("a.json", {})]), on_refresh=on_refresh)
+    assert asyncio.run(scheduler.refresh_all())["succeeded"] == 1
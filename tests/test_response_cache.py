@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+응답 캐시 테스트 (TTL, stale-while-revalidate, LRU, 변경 이벤트, 동시 요청 합치기)
+"""
+
+import asyncio
+
+import pytest
+
+from fss_pension_common.response_cache import ADDED, REMOVED, UPDATED, ResponseCache, SingleFlight, make_cache_key
+
+
+def ok(rows):
+    return {"code": "000", "result": {"list": rows}}
+
+
+class FakeFetch:
+    """호출 횟수를 세는 fetch (응답 목록을 순서대로 반환)"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.responses[min(self.calls, len(self.responses)) - 1]
+
+
+def test_cache_key_normalizes_params():
+    assert make_cache_key("a.json", {"year": 2023, "quarter": "4"}) == make_cache_key("a.json", {"quarter": 4, "year": "2023"})
+
+
+def test_cache_fresh_hit_and_miss():
+    async def run():
+        cache = ResponseCache(default_ttl=60, stale_ttl=0)
+        fetch = FakeFetch(ok([{"v": 1}]))
+        first = await cache.get_or_fetch("a.json", {"year": "2023"}, fetch)
+        second = await cache.get_or_fetch("a.json", {"year": "2023"}, fetch)
+        return cache, fetch, first, second
+
+    cache, fetch, first, second = asyncio.run(run())
+    assert fetch.calls == 1
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_endpoint_ttl():
+    cache = ResponseCache(default_ttl=60, endpoint_ttls={"a.json": 5})
+    assert cache.ttl_for("a.json") == 5
+    assert cache.ttl_for("b.json") == 60
+
+
+def test_cache_stale_while_revalidate():
+    async def run():
+        cache = ResponseCache(default_ttl=0, stale_ttl=60)
+        fetch = FakeFetch(ok([{"v": 1}]), ok([{"v": 2}]))
+        await cache.get_or_fetch("a.json", {}, fetch)
+        stale = await cache.get_or_fetch("a.json", {}, fetch)
+        await asyncio.sleep(0)  # 백그라운드 갱신 실행
+        await asyncio.sleep(0)
+        refreshed = cache.get(make_cache_key("a.json", {})).value
+        await cache.close()
+        return cache, fetch, stale, refreshed
+
+    cache, fetch, stale, refreshed = asyncio.run(run())
+    assert stale["result"]["list"] == [{"v": 1}]  # 유예 기간에는 기존 응답을 바로 반환
+    assert refreshed["result"]["list"] == [{"v": 2}]
+    assert fetch.calls == 2
+    assert cache.stale_hits == 1
+
+
+def test_cache_failed_refresh_keeps_stale_entry():
+    async def run():
+        cache = ResponseCache(default_ttl=0, stale_ttl=60)
+        fetch = FakeFetch(ok([{"v": 1}]), {"error": "실패"})
+        await cache.get_or_fetch("a.json", {}, fetch)
+        await cache.get_or_fetch("a.json", {}, fetch)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        await cache.close()
+        return cache.get(make_cache_key("a.json", {})).value
+
+    assert asyncio.run(run())["result"]["list"] == [{"v": 1}]
+
+
+def test_cache_expired_entry_is_refetched():
+    async def run():
+        cache = ResponseCache(default_ttl=0, stale_ttl=0)
+        fetch = FakeFetch(ok([{"v": 1}]), ok([{"v": 2}]))
+        await cache.get_or_fetch("a.json", {}, fetch)
+        return await cache.get_or_fetch("a.json", {}, fetch), fetch
+
+    data, fetch = asyncio.run(run())
+    assert data["result"]["list"] == [{"v": 2}]
+    assert fetch.calls == 2
+
+
+def test_cache_does_not_store_errors():
+    async def run():
+        cache = ResponseCache()
+        fetch = FakeFetch({"error": "실패"}, ok([{"v": 1}]))
+        await cache.get_or_fetch("a.json", {}, fetch)
+        return await cache.get_or_fetch("a.json", {}, fetch), fetch
+
+    data, fetch = asyncio.run(run())
+    assert data["result"]["list"] == [{"v": 1}]
+    assert fetch.calls == 2
+
+
+def test_cache_lru_keeps_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", "a.json", ok([]))
+    cache.set("b", "a.json", ok([]))
+    cache.get("a")
+    cache.set("c", "a.json", ok([]))
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+
+
+def test_cache_lru_eviction_and_listener_events():
+    cache = ResponseCache(max_entries=2)
+    events = []
+    cache.add_listener(lambda entry, event: events.append((entry.params["i"], event)))
+    for i in range(3):
+        cache.set(make_cache_key("a.json", {"i": i}), "a.json", ok([{"v": i}]), {"i": i})
+    cache.set(make_cache_key("a.json", {"i": 2}), "a.json", ok([{"v": 2}]), {"i": 2})  # 같은 내용
+    cache.set(make_cache_key("a.json", {"i": 2}), "a.json", ok([{"v": 9}]), {"i": 2})
+
+    assert cache.get(make_cache_key("a.json", {"i": 0})) is None
+    assert events == [(0, ADDED), (1, ADDED), (2, ADDED), (0, REMOVED), (2, UPDATED)]
+
+    events.clear()
+    cache.invalidate("a.json")
+    assert sorted(events) == [(1, REMOVED), (2, REMOVED)]
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_coalesces_concurrent_fetches():
+    async def run():
+        cache = ResponseCache()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ok([{"v": 1}])
+
+        results = await asyncio.gather(*(cache.get_or_fetch("a.json", {}, fetch) for _ in range(5)))
+        return cache, calls, results
+
+    cache, calls, results = asyncio.run(run())
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_single_flight_shares_errors_and_forgets_finished_keys():
+    async def run():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fail():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("실패")
+
+        results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+        assert len(flight) == 0
+        with pytest.raises(RuntimeError):
+            await flight.do("k", fail)  # 끝난 실행은 재사용하지 않음
+        return calls, results
+
+    calls, results = asyncio.run(run())
+    assert calls == 2
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_single_flight_survives_cancelled_caller():
+    async def run():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return ok([])
+
+        first = asyncio.ensure_future(flight.do("k", fetch))
+        second = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == ok([])
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+은퇴 자금 시뮬레이션 테스트 (수익률 분포, 결정적 경로, 고갈 나이, 시나리오 그리드)
+"""
+
+import numpy as np
+import pytest
+
+from fss_pension_common import retirement_projection
+from fss_pension_common.retirement_projection import (
+    MIN_VOLATILITY, product_columns, project_retirement, return_distribution, sweep_retirement
+)
+
+PRODUCTS = [
+    {"productType": "연금저축펀드", "sells": "Y", "guarantees": "N", "avgEarnRate3": 6.0},
+    {"productType": "연금저축펀드", "sells": "Y", "guarantees": "N", "avgEarnRate3": 4.0},
+    {"productType": "연금저축펀드", "sells": "N", "guarantees": "N", "avgEarnRate3": 50.0},
+    {"productType": "연금저축보험", "sells": "Y", "guarantees": "Y", "avgEarnRate3": 2.0},
+    {"productType": "연금저축보험", "sells": "Y", "guarantees": "Y", "avgEarnRate3": None},
+]
+
+
+def test_return_distribution_filters_selling_products():
+    table = product_columns(PRODUCTS)
+    funds = return_distribution(table, product_types=["연금저축펀드"])
+    assert (funds["mean"], funds["products"]) == (pytest.approx(0.05), 2)
+    assert funds["volatility"] == pytest.approx(0.01)
+
+    conservative = return_distribution(table, risk_preference="conservative")
+    assert (conservative["mean"], conservative["products"]) == (pytest.approx(0.02), 1)
+    assert conservative["volatility"] == MIN_VOLATILITY  # 상품이 하나면 최소 변동성
+    assert return_distribution(table)["products"] == 3
+
+    with pytest.raises(ValueError):
+        return_distribution(table, product_types=["연금저축신탁"])
+
+
+def deterministic(**kwargs):
+    """변동성 0, 실질 수익률 0 (명목 수익률 = 물가상승률)인 시뮬레이션"""
+    params = dict(age=60, retirement_age=60, life_expectancy=70, current_balance=1200,
+                  monthly_savings=0, monthly_living_cost=10, mean_return=0.02, volatility=0.0,
+                  paths=10, inflation=0.02)
+    params.update(kwargs)
+    return project_retirement(**params)
+
+
+def test_projection_without_volatility_is_exact():
+    enough = deterministic()
+    assert enough["success_rate"] == 1.0
+    assert enough["required_capital"] == 1200.0
+    assert enough["depletion_age"] is None
+    assert enough["additional_monthly_savings"] is None  # 적립 기간 없음
+
+    short = deterministic(monthly_living_cost=11)
+    assert short["success_rate"] == 0.0
+    assert short["depletion_age"] == {"p10": 70.0, "p50": 70.0, "p90": 70.0}  # 10년째 인출 시 고갈
+    assert short["shortfall"] == 120.0
+
+
+def test_projection_accumulation_and_additional_savings():
+    result = deterministic(age=50, current_balance=0, monthly_savings=5, monthly_living_cost=10)
+    assert result["balance_at_retirement"]["p50"] == 600.0  # 10년 × 60
+    assert result["additional_monthly_savings"] == 5.0  # 필요 1200 → 월 10
+    assert result["years"] == {"accumulation": 10, "payout": 10}
+
+
+def test_projection_is_reproducible_with_seed():
+    params = dict(age=40, retirement_age=60, life_expectancy=90, current_balance=3000, monthly_savings=50,
+                  monthly_living_cost=200, mean_return=0.05, volatility=0.1, paths=500)
+    first = project_retirement(**params, seed=1)
+    assert project_retirement(**params, seed=1) == first
+    assert project_retirement(**params, seed=2) != first
+    assert 0 <= first["success_rate"] <= 1
+    assert np.diff(list(first["balance_at_retirement"].values())).min() >= 0
+
+
+def test_sweep_cells_match_single_projection():
+    common = dict(mean_return=0.05, volatility=0.1, paths=300, seed=7)
+    grid = sweep_retirement(age=45, current_balance=2000, monthly_living_costs=[150, 250], monthly_savings=[0, 40],
+                            retirement_ages=[60, 65], life_expectancies=[85, 95], **common)
+    assert grid["dims"] == ["monthly_living_cost", "monthly_savings", "retirement_age", "life_expectancy"]
+    assert np.array(grid["success_rate"]).shape == (2, 2, 2, 2)
+
+    single = project_retirement(age=45, retirement_age=65, life_expectancy=95, current_balance=2000,
+                                monthly_savings=40, monthly_living_cost=250, **common)
+    assert grid["success_rate"][1][1][1][1] == single["success_rate"]
+    assert grid["required_capital"][1][1][1][1] == single["required_capital"]
+    assert grid["median_balance_at_retirement"][1][1][1][1] == single["balance_at_retirement"]["p50"]
+
+
+def test_sweep_rejects_empty_or_oversized_grid(monkeypatch):
+    params = dict(age=40, current_balance=0, monthly_savings=[0], retirement_ages=[60], life_expectancies=[90],
+                  mean_return=0.05, volatility=0.1, paths=10)
+    with pytest.raises(ValueError, match="비어"):
+        sweep_retirement(monthly_living_costs=[], **params)
+    monkeypatch.setattr(retirement_projection, "MAX_SWEEP_CELLS", 2)
+    with pytest.raises(ValueError, match="최대 2개"):
+        sweep_retirement(monthly_living_costs=[100, 200, 300], **params)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+스냅샷 저장소 테스트 (기간별 버전, 최신 데이터 별칭, 이전 형식 변환)
+"""
+
+import json
+import sqlite3
+import time
+import zlib
+from datetime import datetime
+
+from fss_pension_common.snapshot_store import SnapshotStore, resolve_period
+
+
+def dataset(name, year=None, quarter=None):
+    rows = [{"product": name}]
+    if year:
+        rows[0].update(year=year, quarter=quarter)
+    return {"code": "000", "list": rows}
+
+
+def test_save_and_load_by_period(tmp_path):
+    store = SnapshotStore(str(tmp_path / "s.db"))
+    assert store.save("a.json", {"year": "2023", "quarter": "4"}, dataset("q4")) == ("2023", "4")
+
+    snapshot = store.load("a.json", {"quarter": 4, "year": 2023})
+    assert snapshot.payload == dataset("q4")
+    assert (snapshot.year, snapshot.quarter) == ("2023", "4")
+    assert snapshot.age < 60
+    assert store.load("a.json", {"year": "2023", "quarter": "3"}) is None
+
+
+def test_new_quarter_does_not_replace_older_quarter(tmp_path):
+    store = SnapshotStore(str(tmp_path / "s.db"))
+    store.save("a.json", {}, dataset("q3", "2024", "3"))
+    store.save("a.json", {}, dataset("q4", "2024", "4"))
+
+    assert store.load("a.json", {}).payload == dataset("q4", "2024", "4")
+    assert store.load("a.json", {"year": "2024", "quarter": "3"}).payload == dataset("q3", "2024", "3")
+    assert [(s["year"], s["quarter"]) for s in store.list_snapshots("a.json")] == [("2024", "3"), ("2024", "4")]
+
+
+def test_latest_alias_never_moves_back(tmp_path):
+    store = SnapshotStore(str(tmp_path / "s.db"))
+    store.save("a.json", {}, dataset("q4", "2024", "4"))
+    store.save("a.json", {}, dataset("q3", "2024", "3"))  # 늦게 받은 이전 분기 응답
+    assert store.load("a.json", {}).payload == dataset("q4", "2024", "4")
+
+
+def test_other_params_are_separate_datasets(tmp_path):
+    store = SnapshotStore(str(tmp_path / "s.db"))
+    store.save("a.json", {"year": "2023", "quarter": "4", "areaCode": "1"}, dataset("area1"))
+    store.save("a.json", {"year": "2023", "quarter": "4"}, dataset("all"))
+    assert store.load("a.json", {"year": "2023", "quarter": "4", "areaCode": "1"}).payload == dataset("area1")
+    assert store.load("a.json", {"year": "2023", "quarter": "4"}).payload == dataset("all")
+
+
+def test_resolve_period_without_period_in_request_or_payload():
+    fetched_at = datetime(2024, 2, 10).timestamp()
+    assert resolve_period({"year": 2023}, {}, fetched_at) == ("2023", "")
+    assert resolve_period({}, {"year": "2022", "quarter": "2"}, fetched_at) == ("2022", "2")
+    assert resolve_period({}, {"list": []}, fetched_at) == ("2023", "4")
+    assert resolve_period({}, {}, datetime(2024, 8, 1).timestamp()) == ("2024", "2")
+
+
+def test_legacy_snapshots_are_migrated(tmp_path):
+    path = str(tmp_path / "s.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE snapshots (endpoint TEXT NOT NULL, params_key TEXT NOT NULL, year TEXT NOT NULL DEFAULT '', "
+            "quarter TEXT NOT NULL DEFAULT '', payload BLOB NOT NULL, fetched_at REAL NOT NULL, "
+            "PRIMARY KEY (endpoint, params_key))"
+        )
+        for key, year, quarter, payload in [
+            ("a.json?quarter=4&year=2023", "2023", "4", dataset("q4")),
+            ("a.json?", "", "", dataset("latest", "2024", "1")),
+        ]:
+            blob = zlib.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+            conn.execute("INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?)", ("a.json", key, year, quarter, blob, time.time()))
+
+    store = SnapshotStore(path)
+    assert store.load("a.json", {"year": "2023", "quarter": "4"}).payload == dataset("q4")
+    assert store.load("a.json", {}).payload == dataset("latest", "2024", "1")
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'snapshots'").fetchone() is None
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+세액공제 일괄 계산 테스트 (소득 비율 한도, 최대 한도, 현재 납입액 반영)
+"""
+
+from fss_pension_common.tax_benefits import (
+    DEDUCTION_LIMIT, TAX_CREDIT_RATE, calculate_tax_benefits, to_columns, to_record
+)
+
+
+def test_limit_is_share_of_income_up_to_cap():
+    result = calculate_tax_benefits([200, 400, 1000])
+    assert result["annual_income"].tolist() == [2400, 4800, 12000]
+    assert result["deduction_limit"].tolist() == [360, 700, 700]  # 연 소득의 15%, 최대 700만원
+    assert result["recommended_monthly_contribution"].tolist() == [30, 700 / 12, 700 / 12]
+    assert result["expected_tax_credit"].tolist() == [54, 105, 105]
+
+
+def test_current_contributions_reduce_additional_available():
+    result = calculate_tax_benefits([200, 1000], pension_savings=[300, 400], irp=[100, 100])
+    first, second = to_record(result, 0), to_record(result, 1)
+
+    assert first["eligible_contribution"] == 360  # 납입액이 한도를 넘으면 한도까지만 공제
+    assert first["additional_available"] == 0
+    assert second["eligible_contribution"] == 500
+    assert second["additional_available"] == DEDUCTION_LIMIT - 500
+    assert second["current_tax_credit"] == 500 * TAX_CREDIT_RATE
+    assert second["additional_tax_credit"] == (DEDUCTION_LIMIT - 500) * TAX_CREDIT_RATE
+
+
+def test_matches_per_customer_calculation():
+    incomes = [150, 333, 480, 777]
+    batch = calculate_tax_benefits(incomes, pension_savings=50)
+    for i, income in enumerate(incomes):
+        assert to_record(batch, i) == to_record(calculate_tax_benefits(income, pension_savings=50))
+
+
+def test_to_columns_rounds_for_json():
+    columns = to_columns(calculate_tax_benefits([400]))
+    assert columns["recommended_monthly_contribution"] == [58.3]
+    assert columns["tax_credit_rate"] == [TAX_CREDIT_RATE]
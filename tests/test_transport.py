@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+FSS API 전송 계층 테스트 (서킷 브레이커, 재시도, 4xx 처리)
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from fss_pension_common.transport import CircuitBreaker, CircuitOpenError, ResilientTransport, TokenBucket
+
+URL = "https://fss.test/a.json"
+
+
+def make_transport(statuses, **kwargs):
+    """statuses 순서대로 응답하는 전송 (None이면 연결 오류)"""
+    calls = []
+
+    def handler(request):
+        status = statuses[min(len(calls), len(statuses) - 1)]
+        calls.append(status)
+        if status is None:
+            raise httpx.ConnectError("연결 실패", request=request)
+        return httpx.Response(status, json={"code": "000"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    transport = ResilientTransport(
+        client, rate_limiter=TokenBucket(rate=1000, capacity=1000), breakers={}, backoff_base=0, **kwargs
+    )
+    return transport, calls
+
+
+def test_circuit_breaker_transitions():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    breaker.opened_at = time.monotonic() - 61
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # 시험 요청은 하나만
+
+    breaker.record_failure()  # 시험 요청 실패 → 다시 열림
+    assert breaker.state == "open"
+
+    breaker.opened_at = time.monotonic() - 61
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_circuit_breaker_release_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    breaker.release_trial()
+    assert breaker.allow()
+
+
+def test_transport_retries_retryable_errors():
+    transport, calls = make_transport([503, None, 200], max_retries=2)
+    response = asyncio.run(transport.get(URL, "a.json"))
+    assert response.status_code == 200
+    assert calls == [503, None, 200]
+    assert transport.status() == {"a.json": {"state": "closed", "failures": 0}}
+
+
+def test_transport_client_error_is_not_retried_or_counted():
+    transport, calls = make_transport([404], max_retries=2)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(transport.get(URL, "a.json"))
+    assert calls == [404]
+    assert transport.breaker_for("a.json").failures == 0
+
+
+def test_transport_opens_circuit_after_repeated_failures():
+    transport, calls = make_transport([500], max_retries=1)
+    transport.breakers["a.json"] = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await transport.get(URL, "a.json")
+        with pytest.raises(CircuitOpenError):
+            await transport.get(URL, "a.json")
+
+    asyncio.run(run())
+    assert len(calls) == 4  # 서킷이 열린 뒤에는 요청하지 않음
+    assert transport.status()["a.json"]["state"] == "open"